@@ -0,0 +1 @@
+"""Benchmarks for python_build_utils; run each module with ``python -m benchmarks.<name>``."""
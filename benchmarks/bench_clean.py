@@ -0,0 +1,83 @@
+"""Compare finding the files clean-pyd-modules removes with one walk against one walk per extension.
+
+A synthetic source tree is generated in a temporary directory; nothing is deleted, only
+the traversal and classification are timed::
+
+    python -m benchmarks.bench_clean
+    python -m benchmarks.bench_clean --files 200000 --regex "core/"
+"""
+
+import re
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+
+from python_build_utils.clean_pyd_modules import CLEAN_EXTENSIONS, find_build_artifacts
+
+
+# Share of each suffix in the synthetic tree; most files in a src tree are not build output.
+_SUFFIXES = (".py", ".py", ".py", ".pyi", ".txt", ".c", ".pyd", ".so", ".h", ".json")
+
+Strategy = Callable[[Path, str | None], int]
+
+
+def _three_walks(src_path: Path, regex: str | None) -> int:
+    """Find the files the way clean-pyd-modules used to: a full rglob per extension."""
+    count = 0
+    for extension in CLEAN_EXTENSIONS:
+        for file_path in src_path.rglob(f"*{extension}"):
+            relative_path = file_path.relative_to(src_path).as_posix()
+            if regex and not re.search(regex, relative_path, re.IGNORECASE):
+                continue
+            count += 1
+    return count
+
+
+def _single_walk(src_path: Path, regex: str | None) -> int:
+    """Find the files with the single classifying walk."""
+    matches, _ = find_build_artifacts(src_path, CLEAN_EXTENSIONS, regex)
+    return sum(len(paths) for paths in matches.values())
+
+
+def _synthetic_tree(root: Path, files: int, files_per_dir: int) -> None:
+    """Create ``files`` empty files spread over nested package directories."""
+    for i in range(files):
+        directory = root / f"pkg{i // (files_per_dir * 10)}" / f"mod{i // files_per_dir}"
+        if i % files_per_dir == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{i}{_SUFFIXES[i % len(_SUFFIXES)]}").touch()
+
+
+@click.command()
+@click.option("--files", default=100_000, show_default=True, help="Number of files in the synthetic tree.")
+@click.option("--files-per-dir", default=50, show_default=True, help="Files per leaf directory.")
+@click.option("--regex", default=None, help="Regex filter applied to the relative paths.")
+@click.option("--repeat", default=3, show_default=True, help="Runs per strategy; the fastest is reported.")
+def main(files: int, files_per_dir: int, regex: str | None, repeat: int) -> None:
+    """Print the time each strategy needs to find the build artifacts."""
+    strategies: list[tuple[str, Strategy]] = [
+        ("rglob per extension (3 walks)", _three_walks),
+        ("single classifying walk", _single_walk),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src_path = Path(tmp)
+        click.echo(f"Creating {files} files...")
+        _synthetic_tree(src_path, files, files_per_dir)
+
+        click.echo(f"{'Strategy':<32}{'Seconds':>9}{'Matches':>10}")
+        click.echo("-" * 51)
+        for label, strategy in strategies:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                matches = strategy(src_path, regex)
+                timings.append(time.perf_counter() - start)
+            click.echo(f"{label:<32}{min(timings):>9.3f}{matches:>10}")
+
+
+if __name__ == "__main__":
+    main()
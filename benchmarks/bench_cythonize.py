@@ -0,0 +1,104 @@
+"""Measure how a cythonized build scales with the number of parallel jobs.
+
+A synthetic package of plain Python modules is generated in a temporary directory and
+built the way `cythonized_setup` builds it, once per job count: Cython translation with
+``cythonize(nthreads=N)``, then C compilation with a parallel ``build_ext``. Cython and a
+C compiler must be installed::
+
+    python -m benchmarks.bench_cythonize
+    python -m benchmarks.bench_cythonize --modules 200 --jobs 1 --jobs 4 --jobs 16
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import click
+from setuptools import Distribution
+
+
+def _synthetic_package(root: Path, modules: int, functions: int) -> list[str]:
+    """Write ``modules`` Python modules with ``functions`` small functions each."""
+    package = root / "src" / "bench_pkg"
+    package.mkdir(parents=True)
+    body = "\n\n".join(
+        f"def function_{i}(values: list[int]) -> int:\n"
+        f"    total = 0\n"
+        f"    for value in values:\n"
+        f"        total += value * {i} % 7\n"
+        f"    return total"
+        for i in range(functions)
+    )
+    files = []
+    for i in range(modules):
+        path = package / f"module_{i}.py"
+        path.write_text(body + "\n")
+        files.append(str(path.relative_to(root)))
+    return files
+
+
+def _build(root: Path, files: list[str], jobs: int) -> tuple[float, float]:
+    """Cythonize and compile the package with ``jobs`` jobs; return both phase durations."""
+    from Cython.Build import cythonize  # noqa: PLC0415
+
+    build_dir = root / f"build-{jobs}"
+    start = time.perf_counter()
+    ext_modules = cythonize(
+        files,
+        compiler_directives={"language_level": "3"},
+        nthreads=jobs,
+        force=True,
+        quiet=True,
+        build_dir=str(build_dir / "c"),
+    )
+    translated = time.perf_counter()
+
+    distribution = Distribution({"name": "bench_pkg", "ext_modules": ext_modules})
+    command = distribution.get_command_obj("build_ext")
+    command.parallel = jobs
+    command.build_lib = str(build_dir / "lib")
+    command.build_temp = str(build_dir / "temp")
+    command.ensure_finalized()
+    command.run()
+    return translated - start, time.perf_counter() - translated
+
+
+@click.command()
+@click.option("--modules", default=64, show_default=True, help="Number of modules in the synthetic package.")
+@click.option("--functions", default=20, show_default=True, help="Functions per module.")
+@click.option(
+    "--jobs",
+    "job_counts",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="Job count to measure; can be given multiple times. Defaults to 1, 2, 4, ... up to the CPU count.",
+)
+def main(modules: int, functions: int, job_counts: tuple[int, ...]) -> None:
+    """Print the duration of both build phases for every job count."""
+    cpus = os.cpu_count() or 1
+    counts = list(job_counts) or sorted({*(2**i for i in range(cpus.bit_length()) if 2**i <= cpus), cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        files = _synthetic_package(root, modules, functions)
+        cwd = Path.cwd()
+        os.chdir(root)
+        try:
+            click.echo(f"{modules} modules, {cpus} CPU(s)")
+            click.echo(f"{'Jobs':>5}{'Cythonize s':>13}{'Compile s':>11}{'Total s':>9}{'Speed-up':>10}")
+            click.echo("-" * 48)
+            baseline = None
+            for jobs in counts:
+                cython_seconds, compile_seconds = _build(root, files, jobs)
+                total = cython_seconds + compile_seconds
+                baseline = baseline or total
+                click.echo(
+                    f"{jobs:>5}{cython_seconds:>13.2f}{compile_seconds:>11.2f}{total:>9.2f}{baseline / total:>9.1f}x"
+                )
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare the throughput of the ways RECORD hashes can be computed.
+
+Without arguments synthetic binaries are generated; pass real ``.pyd``/``.so`` files
+to benchmark those instead::
+
+    python -m benchmarks.bench_hashing
+    python -m benchmarks.bench_hashing build/*.so --jobs 8
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+
+from python_build_utils.hashing import hash_file, hash_files
+
+
+def _read_loop(chunk_size: int) -> Callable[[list[Path]], None]:
+    """Return a strategy that hashes with a plain ``read(chunk_size)`` loop."""
+
+    def run(files: list[Path]) -> None:
+        for file in files:
+            sha256 = hashlib.sha256()
+            with file.open("rb") as f:
+                for chunk in iter(lambda f=f: f.read(chunk_size), b""):
+                    sha256.update(chunk)
+            file.stat()
+
+    return run
+
+
+def _file_digest(files: list[Path]) -> None:
+    """Hash with ``hashlib.file_digest`` (Python 3.11+)."""
+    for file in files:
+        with file.open("rb") as f:
+            hashlib.file_digest(f, "sha256")
+
+
+def _hash_file(files: list[Path]) -> None:
+    """Hash with the memoryview-based helper, one file after the other."""
+    for file in files:
+        hash_file(file)
+
+
+def _hash_files(jobs: int | None) -> Callable[[list[Path]], None]:
+    """Return a strategy that hashes all files concurrently in ``jobs`` threads."""
+
+    def run(files: list[Path]) -> None:
+        hash_files(files, jobs=jobs)
+
+    return run
+
+
+def _synthetic_files(directory: Path, count: int, size_mb: int) -> list[Path]:
+    """Write ``count`` files of random data."""
+    files = []
+    for i in range(count):
+        path = directory / f"synthetic{i}.so"
+        with path.open("wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1024 * 1024))
+        files.append(path)
+    return files
+
+
+@click.command()
+@click.argument("files", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--count", default=4, show_default=True, help="Number of synthetic binaries.")
+@click.option("--size-mb", default=128, show_default=True, help="Size of each synthetic binary.")
+@click.option("--jobs", "-j", default=None, type=int, help="Threads for hash_files. Defaults to the CPU count.")
+@click.option("--repeat", default=3, show_default=True, help="Runs per strategy; the fastest is reported.")
+def main(files: tuple[Path, ...], count: int, size_mb: int, jobs: int | None, repeat: int) -> None:
+    """Print the hashing throughput of each strategy in MB/s."""
+    strategies: list[tuple[str, Callable[[list[Path]], None]]] = [
+        ("read 4 KiB + stat", _read_loop(4096)),
+        ("read 1 MiB + stat", _read_loop(1024 * 1024)),
+    ]
+    if hasattr(hashlib, "file_digest"):
+        strategies.append(("hashlib.file_digest", _file_digest))
+    strategies += [
+        ("hash_file", _hash_file),
+        (f"hash_files (jobs={jobs or os.cpu_count()})", _hash_files(jobs)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = list(files) or _synthetic_files(Path(tmp), count, size_mb)
+        total = sum(file.stat().st_size for file in inputs)
+
+        click.echo(f"Input: {len(inputs)} file(s), {total / 1e6:.1f} MB (page cache warm after the first run)")
+        click.echo(f"{'Strategy':<28}{'Seconds':>9}{'MB/s':>10}")
+        click.echo("-" * 47)
+        for label, strategy in strategies:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                strategy(inputs)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            click.echo(f"{label:<28}{best:>9.3f}{total / 1e6 / best:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
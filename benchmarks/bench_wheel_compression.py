@@ -0,0 +1,76 @@
+"""Compare build time and wheel size of the pyd2wheel compression methods.
+
+Without arguments a synthetic native-like binary is generated; pass real ``.pyd``/``.so``
+files to benchmark those instead::
+
+    python -m benchmarks.bench_wheel_compression
+    python -m benchmarks.bench_wheel_compression build/*.pyd --repeat 5
+"""
+
+import io
+import random
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import click
+
+from python_build_utils.wheel_writer import CompressionPolicy, WheelWriter
+
+
+POLICIES: list[tuple[str, CompressionPolicy]] = [
+    ("stored", CompressionPolicy(zipfile.ZIP_STORED)),
+    ("deflate -1", CompressionPolicy(zipfile.ZIP_DEFLATED, 1)),
+    ("deflate (6)", CompressionPolicy(zipfile.ZIP_DEFLATED)),
+    ("deflate -9", CompressionPolicy(zipfile.ZIP_DEFLATED, 9)),
+    ("bzip2 (9)", CompressionPolicy(zipfile.ZIP_BZIP2)),
+    ("lzma", CompressionPolicy(zipfile.ZIP_LZMA)),
+]
+
+
+def _synthetic_binary(path: Path, size_mb: int) -> Path:
+    """Write a file that mixes incompressible data with repetitive, code-like sections."""
+    rng = random.Random(0)  # noqa: S311
+    block = bytes(rng.getrandbits(8) for _ in range(4096))
+    with path.open("wb") as f:
+        for i in range(size_mb * 256):
+            f.write(rng.randbytes(4096) if i % 3 == 0 else block)
+    return path
+
+
+def _build(files: list[Path], policy: CompressionPolicy) -> int:
+    """Build an in-memory wheel and return its size in bytes."""
+    buffer = io.BytesIO()
+    with WheelWriter(buffer, "bench-1.0.dist-info", policy) as writer:
+        for file in files:
+            writer.write_file(file.name, file)
+        writer.write_dist_info("METADATA", "Metadata-Version: 2.1\nName: bench\nVersion: 1.0\n")
+    return buffer.getbuffer().nbytes
+
+
+@click.command()
+@click.argument("files", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--size-mb", default=64, show_default=True, help="Size of the synthetic binary.")
+@click.option("--repeat", default=3, show_default=True, help="Builds per method; the fastest is reported.")
+def main(files: tuple[Path, ...], size_mb: int, repeat: int) -> None:
+    """Print build time, throughput and size for each compression method."""
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = list(files) or [_synthetic_binary(Path(tmp) / "synthetic.pyd", size_mb)]
+        total = sum(file.stat().st_size for file in inputs)
+
+        click.echo(f"Input: {len(inputs)} file(s), {total / 1e6:.1f} MB")
+        click.echo(f"{'Method':<14}{'Seconds':>9}{'MB/s':>9}{'Size MB':>10}{'Ratio':>8}")
+        click.echo("-" * 50)
+        for label, policy in POLICIES:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                size = _build(inputs, policy)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            click.echo(f"{label:<14}{best:>9.3f}{total / 1e6 / best:>9.1f}{size / 1e6:>10.2f}{size / total:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
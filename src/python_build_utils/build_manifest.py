@@ -0,0 +1,118 @@
+"""Manifest of the Cython sources a build was made from, for incremental cleaning.
+
+`cythonized_setup` records the size, modification time and sha256 of every
+``.py``/``.pyx``/``.pxd`` source it compiles. ``clean-pyd-modules --stale-only`` then
+only removes the compiled artifacts whose source changed since that build. A source
+whose size and modification time match the manifest is not read again. The manifest is
+written once the build has succeeded, so an interrupted build leaves the previous one.
+"""
+
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from .hashing import hash_file, hash_files
+from .wheel_writer import atomic_write
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 1
+
+# Sources an extension module can be compiled from, in the order they are looked up.
+SOURCE_EXTENSIONS = (".pyx", ".py", ".pxd")
+
+
+class SourceRecord(NamedTuple):
+    """State of a source file at build time."""
+
+    digest: str
+    size: int
+    mtime_ns: int
+
+
+def write_manifest(src_root: Path, sources: Iterable[Path]) -> Path:
+    """Record the state of the sources in the manifest of ``src_root``.
+
+    Args:
+    ----
+        src_root: The source root, such as ``src``; the manifest is written into it and
+            the sources are recorded relative to it.
+        sources: The source files of the build.
+
+    Returns:
+    -------
+        Path: The path of the manifest.
+
+    """
+    files = sorted(Path(source) for source in sources)
+    records = {}
+    for source, file_digest in zip(files, hash_files(files), strict=True):
+        stat = source.stat()
+        relative = source.resolve().relative_to(src_root.resolve()).as_posix()
+        records[relative] = SourceRecord(file_digest.digest.hex(), stat.st_size, stat.st_mtime_ns)._asdict()
+
+    manifest_path = src_root / MANIFEST_NAME
+    with atomic_write(manifest_path) as f:
+        f.write(json.dumps({"version": MANIFEST_VERSION, "sources": records}, indent=1, sort_keys=True).encode("utf-8"))
+    logger.info("📝 Recorded %d source(s) in %s", len(records), manifest_path)
+    return manifest_path
+
+
+def find_manifest_root(path: Path) -> Path | None:
+    """Return the directory holding the manifest that covers ``path``, or None if there is none.
+
+    ``path`` and its parents are searched up to the project root, the first directory with a
+    ``pyproject.toml``, so that cleaning ``src/pkg`` finds the manifest in ``src``.
+    """
+    for directory in (path, *path.parents):
+        if (directory / MANIFEST_NAME).is_file():
+            return directory
+        if (directory / "pyproject.toml").is_file():
+            break
+    return None
+
+
+def read_manifest(src_root: Path) -> dict[str, SourceRecord] | None:
+    """Return the sources recorded in the manifest of ``src_root``, or None if there is no usable one."""
+    manifest_path = src_root / MANIFEST_NAME
+    try:
+        content = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if content.get("version") != MANIFEST_VERSION:
+            return None
+        return {name: SourceRecord(**record) for name, record in content["sources"].items()}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, KeyError) as e:
+        logger.warning("Ignoring unreadable build manifest %s: %s", manifest_path, e)
+        return None
+
+
+def is_stale(artifact: Path, src_root: Path, manifest: dict[str, SourceRecord]) -> bool:
+    """Return True if a compiled artifact may no longer match its sources.
+
+    The sources of ``pkg/mod.cpython-312-x86_64-linux-gnu.so``, ``pkg/mod.pyd`` or
+    ``pkg/mod.c`` are ``pkg/mod.pyx``, ``pkg/mod.py`` and ``pkg/mod.pxd``. The artifact
+    is stale when one of them is newer than it, is missing from the manifest, or has
+    content other than at build time. Artifacts without any source are not stale.
+    """
+    stem = artifact.name.split(".", 1)[0]
+    artifact_mtime_ns = artifact.stat().st_mtime_ns
+    for source in (artifact.with_name(stem + extension) for extension in SOURCE_EXTENSIONS):
+        try:
+            stat = source.stat()
+        except FileNotFoundError:
+            continue
+        if stat.st_mtime_ns > artifact_mtime_ns:
+            return True
+        record = manifest.get(source.relative_to(src_root).as_posix())
+        if record is None:
+            return True
+        if (record.size, record.mtime_ns) != (stat.st_size, stat.st_mtime_ns) and (
+            hash_file(source).digest.hex() != record.digest
+        ):
+            return True
+    return False
@@ -3,26 +3,51 @@
 This tool scans a specified source path and removes compiled artifacts:
 - Windows: `.pyd`
 - Linux/Unix: `.so`
-- Generated C sources: `.c`
+- Generated C sources: `.c`, only when they start with the Cython header or have a `.pyx`/`.py`
+  source next to them; hand-written C is kept
 
-An optional regex filter can be used to restrict which files are removed.
+An optional regex filter can be used to restrict which files are removed. With
+``--stale-only`` only artifacts whose sources changed since the last build, according to
+the build manifest written by `cythonized_setup`, are removed. With ``--git`` the
+candidates are the untracked, ignored files git lists instead of every file in the
+tree, so tracked files are never removed.
 """
 
 import logging
+import os
 import re
+import subprocess
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 
-from .constants import PYD_EXTENSION, SO_EXTENSION
+from .build_manifest import MANIFEST_NAME, find_manifest_root, is_stale, read_manifest
+from .cli_options import jobs_option
+from .constants import PYD_EXTENSION, SO_EXTENSION, STDOUT_PATH
+from .deletion import DELETE_JOBS_HELP, DeletionSummary, delete_files, dry_run_option, write_dry_run_manifest
+from .exceptions import GitListingError
 
 
 logger = logging.getLogger(__name__)
 
+C_EXTENSION = ".c"
+CLEAN_EXTENSIONS = (PYD_EXTENSION, SO_EXTENSION, C_EXTENSION)
+
+# A C file is only removed when Cython wrote it: its first line reads
+# "/* Generated by Cython 3.0.11 */", or it sits next to the source it was generated from.
+CYTHON_HEADER = b"Generated by Cython"
+CYTHON_HEADER_SIZE = 512
+CYTHON_SOURCE_EXTENSIONS = (".pyx", ".py")
+
 
 @click.command(
     name="clean-pyd-modules",
-    help="Clean all compiled modules (.pyd/.so) and generated C files (.c) in the given src path.",
+    help=(
+        "Clean all compiled modules (.pyd/.so) and Cython-generated C files (.c) in the given src path. "
+        "C files without the Cython header or a .pyx/.py source next to them are kept."
+    ),
 )
 @click.option(
     "--src-path",
@@ -35,12 +60,49 @@ logger = logging.getLogger(__name__)
     default=None,
     help="Optional regular expression to filter files by name (matched against relative paths).",
 )
-def clean_pyd_modules(src_path: str | None = None, regex: str | None = None) -> None:
+@click.option(
+    "--stale-only",
+    is_flag=True,
+    help=(
+        f"Only remove artifacts whose .py/.pyx/.pxd source is newer than them or changed since the last build, "
+        f"as recorded in {MANIFEST_NAME} in the src path or the nearest parent holding one."
+    ),
+)
+@click.option(
+    "--git",
+    "use_git",
+    is_flag=True,
+    help=(
+        "Take the candidates from 'git ls-files --others --ignored --exclude-standard' instead of walking the "
+        "tree: only untracked, ignored files are removed."
+    ),
+)
+@jobs_option(DELETE_JOBS_HELP)
+@dry_run_option
+def clean_pyd_modules(  # noqa: PLR0913
+    src_path: str | None = None,
+    regex: str | None = None,
+    *,
+    stale_only: bool = False,
+    use_git: bool = False,
+    jobs: int | None = None,
+    dry_run: str | None = None,
+) -> None:
     """Remove compiled modules (.pyd/.so) and generated C files (.c) in a given source path, optionally filtered by a regex."""
-    clean_cython_build_artifacts(src_path=src_path, regex=regex)
+    clean_cython_build_artifacts(
+        src_path=src_path, regex=regex, stale_only=stale_only, use_git=use_git, jobs=jobs, dry_run=dry_run
+    )
 
 
-def clean_cython_build_artifacts(src_path: str | None = None, regex: str | None = None) -> None:
+def clean_cython_build_artifacts(  # noqa: PLR0913
+    src_path: str | None = None,
+    regex: str | None = None,
+    *,
+    stale_only: bool = False,
+    use_git: bool = False,
+    jobs: int | None = None,
+    dry_run: str | None = None,
+) -> None:
     """Clean all compiled artifacts from the given source path."""
     resolved_src = _get_src_path(src_path)
 
@@ -48,10 +110,22 @@ def clean_cython_build_artifacts(src_path: str | None = None, regex: str | None
         logger.error("Could not locate source path: %s", src_path)
         return
 
-    # Remove platform-specific compiled modules and generated C sources
-    for extension in (f"*{PYD_EXTENSION}", f"*{SO_EXTENSION}", "*.c"):
-        logger.info("Cleaning %s files with regex='%s' in '%s'...", extension, regex, resolved_src)
-        clean_by_extensions(src_path=resolved_src, regex=regex, extension=extension)
+    # Remove platform-specific compiled modules and generated C sources in one walk
+    logger.info("Cleaning %s files with regex='%s' in '%s'...", ", ".join(CLEAN_EXTENSIONS), regex, resolved_src)
+    try:
+        summary = clean_build_artifacts(
+            src_path=resolved_src,
+            regex=regex,
+            extensions=CLEAN_EXTENSIONS,
+            stale_only=stale_only,
+            use_git=use_git,
+            jobs=jobs,
+            dry_run=dry_run,
+        )
+    except GitListingError as e:
+        logger.error("%s", e)  # noqa: TRY400
+        return
+    click.echo(summary.describe(dry_run=dry_run is not None), err=dry_run == STDOUT_PATH)
 
 
 def _get_src_path(src_path: str | None = None) -> Path | None:
@@ -65,28 +139,164 @@ def _get_src_path(src_path: str | None = None) -> Path | None:
     return Path("src").resolve()
 
 
-def clean_by_extensions(src_path: Path, regex: str | None, extension: str) -> None:
-    """Remove files with the specified extension from the source directory."""
-    file_candidates = list(src_path.rglob(extension))
+def find_build_artifacts(
+    src_path: Path, extensions: Iterable[str], regex: str | None = None, *, use_git: bool = False
+) -> tuple[dict[str, list[Path]], dict[str, int]]:
+    """Walk ``src_path`` once and classify its files by extension.
 
-    if not file_candidates:
-        logger.info("No %s files found in %s.", extension, src_path)
-        return
+    Every file name is checked against all extensions at once; only files with a target
+    extension are matched against the regex. With ``use_git`` the tree is not walked:
+    the candidates are the untracked, ignored files git lists, so tracked files are never
+    returned.
+
+    Args:
+    ----
+        src_path: Directory to scan recursively.
+        extensions: File extensions to collect, such as ``.pyd``.
+        regex: Optional case-insensitive filter matched against the path relative to
+            ``src_path``.
+        use_git: Take the candidates from ``git ls-files`` instead of walking the tree.
 
-    deleted_any = False
+    Returns:
+    -------
+        tuple[dict[str, list[Path]], dict[str, int]]: The files that pass the filter per
+            extension, and the number of files found per extension before filtering.
 
-    for file_path in file_candidates:
-        relative_path = file_path.relative_to(src_path).as_posix()
-        if regex and not re.search(regex, relative_path, re.IGNORECASE):
+    """
+    targets = {extension.lstrip("*"): extension for extension in extensions}
+    pattern = re.compile(regex, re.IGNORECASE) if regex else None
+    matches: dict[str, list[Path]] = {extension: [] for extension in targets}
+    found = dict.fromkeys(targets, 0)
+
+    candidates = _git_ignored_files(src_path) if use_git else _walk_files(src_path)
+    for dirpath, filename in candidates:
+        extension = os.path.splitext(filename)[1]  # noqa: PTH122
+        if extension not in targets:
+            continue
+        found[extension] += 1
+        file_path = Path(dirpath, filename)
+        if pattern and not pattern.search(file_path.relative_to(src_path).as_posix()):
             continue
+        matches[extension].append(file_path)
+    return matches, found
+
+
+def _walk_files(src_path: Path) -> Iterator[tuple[str, str]]:
+    """Yield the directory and name of every file below ``src_path``."""
+    for dirpath, _, filenames in os.walk(src_path):
+        for filename in filenames:
+            yield dirpath, filename
+
+
+def _git_ignored_files(src_path: Path) -> Iterator[tuple[str, str]]:
+    """Yield the directory and name of every untracked, ignored file below ``src_path``, as listed by git.
+
+    Raises GitListingError if git is not installed or ``src_path`` is not in a work tree.
+    """
+    command = ["git", "ls-files", "--others", "--ignored", "--exclude-standard", "-z"]
+    try:
+        result = subprocess.run(command, cwd=src_path, capture_output=True, check=True)  # nosec B603
+    except FileNotFoundError as e:
+        raise GitListingError(src_path, "git is not installed") from e
+    except subprocess.CalledProcessError as e:
+        raise GitListingError(src_path, os.fsdecode(e.stderr).strip()) from e
+
+    for relative in result.stdout.split(b"\0"):
+        if relative:
+            yield os.path.split(os.path.join(src_path, os.fsdecode(relative)))  # noqa: PTH118
+
+
+def clean_build_artifacts(  # noqa: PLR0913
+    src_path: Path,
+    regex: str | None,
+    extensions: Iterable[str],
+    *,
+    stale_only: bool = False,
+    use_git: bool = False,
+    jobs: int | None = None,
+    dry_run: str | None = None,
+) -> DeletionSummary:
+    """Remove the files with any of the extensions from the source directory in a single walk.
+
+    The files are deleted in a bounded thread pool. With ``dry_run`` set to a path, or to
+    ``-`` for standard output, a JSON manifest of the files is written instead.
+    """
+    matches, found = find_build_artifacts(src_path, extensions, regex, use_git=use_git)
+    if C_EXTENSION in matches:
+        matches[C_EXTENSION] = filter_cython_generated(matches[C_EXTENSION], jobs)
+    if stale_only:
+        matches = {extension: filter_stale(paths, src_path, jobs) for extension, paths in matches.items()}
+
+    for extension, file_paths in matches.items():
+        if not found[extension]:
+            logger.info("No *%s files found in %s.", extension, src_path)
+        elif not file_paths:
+            logger.info("No *%s files with '%s' filter found in %s", extension, regex, src_path)
+
+    file_paths = [path for paths in matches.values() for path in paths]
+    if dry_run is not None:
+        return write_dry_run_manifest(file_paths, dry_run)
+
+    summary = delete_files(file_paths, jobs)
+    for extension, paths in matches.items():
+        if paths:
+            logger.info("Removed %d *%s file(s) from %s", len(paths), extension, src_path)
+    return summary
+
+
+def filter_cython_generated(c_files: list[Path], jobs: int | None = None) -> list[Path]:
+    """Return the C files that Cython generated, checking them in worker threads.
+
+    Hand-written C files are logged and left out, so they are never deleted.
+    """
+    generated = _map_threaded(is_cython_generated, c_files, jobs)
+    for path, is_generated in zip(c_files, generated, strict=True):
+        if not is_generated:
+            logger.info("Keeping %s: not generated by Cython", path)
+    return [path for path, is_generated in zip(c_files, generated, strict=True) if is_generated]
+
+
+def filter_stale(artifacts: list[Path], src_path: Path, jobs: int | None = None) -> list[Path]:
+    """Return the artifacts whose sources changed since the build recorded in the manifest.
+
+    The manifest is looked up in ``src_path`` and its parents, see `find_manifest_root`.
+    Without a manifest every artifact with a source counts as stale.
+    """
+    manifest_root = find_manifest_root(src_path) or src_path
+    manifest = read_manifest(manifest_root)
+    if manifest is None:
+        logger.warning("No build manifest in %s; treating every compiled artifact as stale.", src_path)
+        manifest = {}
+
+    stale = _map_threaded(lambda artifact: is_stale(artifact, manifest_root, manifest), artifacts, jobs)
+    for path, is_artifact_stale in zip(artifacts, stale, strict=True):
+        if not is_artifact_stale:
+            logger.debug("Keeping %s: up to date", path)
+    return [path for path, is_artifact_stale in zip(artifacts, stale, strict=True) if is_artifact_stale]
+
+
+def is_cython_generated(c_file: Path) -> bool:
+    """Return True if a C file has a ``.pyx``/``.py`` source next to it or starts with the Cython header.
+
+    Only the first `CYTHON_HEADER_SIZE` bytes are read.
+    """
+    if any(c_file.with_suffix(suffix).is_file() for suffix in CYTHON_SOURCE_EXTENSIONS):
+        return True
+    try:
+        with c_file.open("rb") as f:
+            return CYTHON_HEADER in f.read(CYTHON_HEADER_SIZE)
+    except OSError:
+        return False
+
+
+def _map_threaded(func: Callable[[Path], bool], paths: list[Path], jobs: int | None) -> list[bool]:
+    """Apply a file check to every path, in worker threads when there is more than one."""
+    if len(paths) <= 1 or jobs == 1:
+        return [func(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(jobs or os.cpu_count() or 1, len(paths))) as executor:
+        return list(executor.map(func, paths))
 
-        logger.info("Removing %s", file_path)
-        try:
-            file_path.unlink()
-        except OSError as e:
-            logger.warning("Error removing %s: %s", file_path, e)
-        else:
-            deleted_any = True
 
-    if not deleted_any:
-        logger.info("No %s files with '%s' filter found in %s", extension, regex, src_path)
+def clean_by_extensions(src_path: Path, regex: str | None, extension: str, jobs: int | None = None) -> DeletionSummary:
+    """Remove files with the specified extension, such as ``*.pyd``, from the source directory."""
+    return clean_build_artifacts(src_path, regex, (extension,), jobs=jobs)
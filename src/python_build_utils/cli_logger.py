@@ -3,6 +3,7 @@
 import logging
 from logging import Logger
 
+from rich.console import Console
 from rich.logging import RichHandler
 
 from . import LOGGER_NAME
@@ -21,7 +22,9 @@ def initialize_logging() -> Logger:
     logger.propagate = True  # Allow logs to propagate to parent loggers
 
     if not any(isinstance(h, RichHandler) for h in logger.handlers):
+        # Log to stderr so commands can stream data, such as a wheel, on stdout.
         console_handler = RichHandler(
+            console=Console(stderr=True),
             show_time=True,
             show_path=True,
             rich_tracebacks=True,
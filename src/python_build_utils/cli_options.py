@@ -0,0 +1,63 @@
+"""Options and arguments shared by the commands."""
+
+import glob
+from collections.abc import Callable, Collection, Iterable
+from pathlib import Path
+from typing import Any, TypeVar
+
+import click
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def jobs_option(help_text: str) -> Callable[[F], F]:
+    """Return a decorator adding the --jobs/-j option, a positive worker count that defaults to None.
+
+    Args:
+    ----
+        help_text: What the workers do and how many there are by default.
+
+    Returns:
+    -------
+        Callable: The option decorator.
+
+    """
+
+    def decorator(func: F) -> F:
+        return click.option(
+            "--jobs",
+            "-j",
+            type=click.IntRange(min=1),
+            default=None,
+            help=help_text,
+        )(func)
+
+    return decorator
+
+
+def collect_files(sources: Iterable[str], suffixes: Collection[str]) -> list[Path]:
+    """Expand files, directories and glob patterns into a list of unique paths.
+
+    Args:
+    ----
+        sources: Files, directories and glob patterns as given on the command line.
+        suffixes: The suffixes of the files taken from a directory, such as ``{".whl"}``.
+            Files and glob patterns are taken as given.
+
+    Returns:
+    -------
+        list[Path]: The paths in the order of ``sources``, without duplicates.
+
+    """
+    files: list[Path] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix in suffixes))
+        elif glob.has_magic(source):
+            files.extend(sorted(Path(match) for match in glob.glob(source, recursive=True)))  # noqa: PTH207
+        else:
+            files.append(path)
+
+    return list(dict.fromkeys(files))
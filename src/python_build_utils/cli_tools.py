@@ -21,9 +21,13 @@ from .cli_logger import initialize_logging
 from .collect_dep_modules import collect_dependencies
 from .collect_pyd_modules import collect_pyd_modules
 from .constants import LOGLEVEL_DEBUG, LOGLEVEL_DEFAULT, LOGLEVEL_INFO, VERBOSITY_DEBUG, VERBOSITY_INFO
+from .dedupe_artifacts import dedupe_artifacts
+from .dir2wheel import dir2wheel
+from .prune_dist import prune_dist
 from .pyd2wheel import pyd2wheel
 from .remove_tarballs import remove_tarballs
 from .rename_wheel_files import rename_wheel_files
+from .verify_wheels import verify_wheels
 
 
 logger = initialize_logging()
@@ -67,11 +71,15 @@ def cli(verbose: int) -> None:
 
 # Register all subcommands
 cli.add_command(pyd2wheel)
+cli.add_command(dir2wheel)
 cli.add_command(collect_pyd_modules)
 cli.add_command(clean_pyd_modules)
 cli.add_command(collect_dependencies)
 cli.add_command(rename_wheel_files)
 cli.add_command(remove_tarballs)
+cli.add_command(prune_dist)
+cli.add_command(dedupe_artifacts)
+cli.add_command(verify_wheels)
 
 # Aka with a different name without duplication
 collect_compiled_modules = collect_pyd_modules
@@ -36,12 +36,14 @@ WHEEL_EXTENSION = ".whl"
 SDIST_EXTENSION = ".tar.gz"
 PYD_EXTENSION = ".pyd"
 SO_EXTENSION = ".so"
+STDOUT_PATH = "-"  # output path meaning "stream to standard output"
 PYTHON_SOURCE_EXTENSIONS = [".py", ".pyi"]
 COMPILED_EXTENSIONS = [".pyd", ".so", ".dll", ".dylib"]
 
 PYD_FILE_FORMATS: dict[str, str] = {
     "long": "{distribution}-{version}(-{build tag})?-{python tag}-{abi tag}-{platform tag}.pyd",
     "short": "{distribution}.{python tag}-{platform tag}.pyd",
+    "so": "{distribution}.cpython-{python version}-{architecture}-linux-gnu.so",
 }
 
 
@@ -62,6 +64,7 @@ __all__ = [
     "PYD_EXTENSION",
     "PYTHON_SOURCE_EXTENSIONS",
     "SDIST_EXTENSION",
+    "STDOUT_PATH",
     "VERBOSITY_DEBUG",
     "VERBOSITY_INFO",
     "WHEEL_EXTENSION",
@@ -0,0 +1,202 @@
+"""Select which modules `cythonized_setup` compiles and which stay pure Python.
+
+Compiling a module that only holds constants, or an empty ``__init__.py``, gains
+nothing at runtime but costs build time and a separate extension module. The rules
+come from the ``[tool.python-build-utils.cythonize]`` table of ``pyproject.toml``::
+
+    [tool.python-build-utils.cythonize]
+    include = ["**/*.py"]
+    exclude = ["tests/**", "**/conftest.py"]
+    min-lines = 5
+    skip-constant-modules = true
+
+and can be overridden with the environment variables ``CYTHON_BUILD_INCLUDE`` and
+``CYTHON_BUILD_EXCLUDE`` (comma-separated globs), ``CYTHON_BUILD_MIN_LINES`` and
+``CYTHON_BUILD_SKIP_CONSTANTS``. Globs are matched against the path relative to the
+package directory; ``**`` matches any number of directories and a glob without a ``/``
+matches the file name at any depth. Modules that are not selected are kept as ``.py``.
+"""
+
+import ast
+import logging
+import os
+import re
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+PYPROJECT_TABLE = ("tool", "python-build-utils", "cythonize")
+
+INCLUDE_ENV = "CYTHON_BUILD_INCLUDE"
+EXCLUDE_ENV = "CYTHON_BUILD_EXCLUDE"
+MIN_LINES_ENV = "CYTHON_BUILD_MIN_LINES"
+SKIP_CONSTANTS_ENV = "CYTHON_BUILD_SKIP_CONSTANTS"
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+# Top-level statements that leave a module without any code worth compiling.
+CONSTANT_STATEMENTS = (ast.Import, ast.ImportFrom, ast.Assign, ast.AnnAssign)
+
+
+class SelectionRules(NamedTuple):
+    """Which modules below the package directory are compiled."""
+
+    include: tuple[str, ...] = ("**/*.py",)
+    exclude: tuple[str, ...] = ()
+    min_lines: int = 0
+    skip_constant_modules: bool = False
+
+
+def load_selection_rules(pyproject: Path = Path("pyproject.toml")) -> SelectionRules:
+    """Return the selection rules from ``pyproject.toml``, overridden by the environment.
+
+    Invalid values are logged and ignored.
+    """
+    settings: dict[str, Any] = dict(_read_pyproject_table(pyproject))
+    for env, key in ((INCLUDE_ENV, "include"), (EXCLUDE_ENV, "exclude")):
+        value = os.environ.get(env, "").strip()
+        if value:
+            settings[key] = [glob.strip() for glob in value.split(",") if glob.strip()]
+    value = os.environ.get(MIN_LINES_ENV, "").strip()
+    if value.isdigit():
+        settings["min-lines"] = int(value)
+    elif value:
+        logger.warning("Ignoring %s=%r: expected a non-negative integer.", MIN_LINES_ENV, value)
+    value = os.environ.get(SKIP_CONSTANTS_ENV, "").strip()
+    if value:
+        settings["skip-constant-modules"] = value.lower() in TRUE_VALUES
+
+    defaults = SelectionRules()
+    changes: dict[str, Any] = {}
+    for key, value in settings.items():
+        field = key.replace("-", "_")
+        default = getattr(defaults, field, None)
+        if default is None:
+            logger.warning("Ignoring unknown cythonize setting '%s'.", key)
+        elif isinstance(default, tuple) and isinstance(value, list) and all(isinstance(v, str) for v in value):
+            changes[field] = tuple(value)
+        elif type(value) is type(default) and not (isinstance(value, int) and value < 0):
+            changes[field] = value
+        else:
+            logger.warning("Ignoring cythonize setting %s=%r: expected %s.", key, value, _describe_type(default))
+    return defaults._replace(**changes)
+
+
+def select_sources(sources: Iterable[Path], package_dir: Path, rules: SelectionRules) -> list[Path]:
+    """Return the sources that are compiled; the others are logged with the reason they are kept as Python.
+
+    Args:
+    ----
+        sources: The ``.py`` files of the package.
+        package_dir: The package directory the globs are relative to.
+        rules: The selection rules.
+
+    Returns:
+    -------
+        list[Path]: The selected sources, in the order given.
+
+    """
+    include = [_glob_regex(glob) for glob in rules.include]
+    exclude = [_glob_regex(glob) for glob in rules.exclude]
+    selected = []
+    for source in sources:
+        reason = _skip_reason(source, source.relative_to(package_dir).as_posix(), rules, include, exclude)
+        if reason is None:
+            selected.append(source)
+        else:
+            logger.debug("Keeping %s as Python: %s", source, reason)
+    return selected
+
+
+def _skip_reason(
+    source: Path,
+    relative: str,
+    rules: SelectionRules,
+    include: list[re.Pattern[str]],
+    exclude: list[re.Pattern[str]],
+) -> str | None:
+    """Return why ``source`` is not compiled, or None if it is."""
+    if not any(pattern.match(relative) for pattern in include):
+        return "not included"
+    if any(pattern.match(relative) for pattern in exclude):
+        return "excluded"
+    if not (rules.min_lines or rules.skip_constant_modules):
+        return None
+
+    text = source.read_text(encoding="utf-8", errors="replace")
+    if rules.min_lines:
+        lines = count_code_lines(text)
+        if lines < rules.min_lines:
+            return f"{lines} line(s) of code, fewer than {rules.min_lines}"
+    if rules.skip_constant_modules and is_constant_module(text):
+        return "only constants"
+    return None
+
+
+def count_code_lines(text: str) -> int:
+    """Return the number of lines that are neither blank nor only a comment."""
+    return sum(1 for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#"))
+
+
+def is_constant_module(text: str) -> bool:
+    """Return True if a module only has a docstring, imports and assignments at the top level.
+
+    Such modules define no functions, classes or control flow, so compiling them gains
+    nothing. A module that does not parse is compiled, so that Cython reports the error.
+    """
+    try:
+        tree = ast.parse(text)
+    except SyntaxError:
+        return False
+    return all(
+        isinstance(node, CONSTANT_STATEMENTS) or (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant))
+        for node in tree.body
+    )
+
+
+def _read_pyproject_table(pyproject: Path) -> dict[str, Any]:
+    """Return the ``[tool.python-build-utils.cythonize]`` table, or an empty one."""
+    if not pyproject.is_file():
+        return {}
+    if tomllib is None:
+        logger.warning("Install tomli to read the cythonize settings from %s on Python 3.10.", pyproject)
+        return {}
+    try:
+        table: Any = tomllib.loads(pyproject.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable %s: %s", pyproject, e)
+        return {}
+    for key in PYPROJECT_TABLE:
+        table = table.get(key, {}) if isinstance(table, dict) else {}
+    return table if isinstance(table, dict) else {}
+
+
+def _glob_regex(glob: str) -> re.Pattern[str]:
+    """Compile a path glob; ``**/`` matches any number of directories, ``*`` and ``?`` stay within one."""
+    if "/" not in glob:
+        glob = "**/" + glob
+    parts = re.split(r"(\*\*/|\*\*|\*|\?)", glob)
+    tokens = {"**/": "(?:.*/)?", "**": ".*", "*": "[^/]*", "?": "[^/]"}
+    return re.compile("".join(tokens.get(part, re.escape(part)) for part in parts) + r"\Z")
+
+
+def _describe_type(default: object) -> str:
+    """Return a description of the values a setting accepts."""
+    if isinstance(default, bool):
+        return "a boolean"
+    if isinstance(default, int):
+        return "a non-negative integer"
+    return "a list of globs"
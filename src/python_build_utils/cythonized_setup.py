@@ -6,8 +6,26 @@ from __future__ import annotations
 import logging
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from setuptools import setup
+from setuptools import Extension, setup
+from setuptools.command.build_ext import build_ext
+
+from .build_manifest import SOURCE_EXTENSIONS, write_manifest
+from .cython_selection import load_selection_rules, select_sources
+from .extension_cache import (
+    cache_settings_from_env,
+    evict_extensions,
+    extension_cache_key,
+    extension_filename,
+    is_cached,
+    restore_extension,
+    store_extension,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
 logger = logging.getLogger(__name__)
@@ -16,15 +34,30 @@ CYTHON_REQUIRED_MESSAGE = (
     "Cython is required for building this package with Cython extensions. Please install Cython and try again."
 )
 
+# Number of parallel jobs for the Cython translation and the C compilation.
+CYTHON_BUILD_JOBS_ENV = "CYTHON_BUILD_JOBS"
+
+# Cython.Compiler.Options set for every Cython build.
+CYTHON_OPTIONS = {"docstrings": False, "emit_code_comments": False}
+
 
 def cythonized_setup(module_name: str) -> None:
     """If CYTHON_BUILD is set/non-empty: compile all .py under src/{module_name} via Cython.
 
-    Otherwise: install as pure Python (keep .py files in the wheel).
+    Otherwise: install as pure Python (keep .py files in the wheel). The Cython translation
+    and the C compilation both run in CYTHON_BUILD_JOBS parallel jobs, by default one per CPU.
+    When CYTHON_BUILD_CACHE_DIR is set, modules compiled by an earlier build from the same
+    inputs are restored from that cache instead of being translated and compiled again.
+    Which modules are compiled can be narrowed down in pyproject.toml or the environment,
+    see `python_build_utils.cython_selection`; the others stay pure Python.
     """
     should_use_cython = os.environ.get("CYTHON_BUILD", "").strip() != ""
-    ext_modules = []
+    ext_modules: list[Extension] = []  # type: ignore[no-any-unimported]
+    manifest_sources: list[Path] = []
     exclude_package_data = {}
+    options = {}
+    cmdclass = {}
+    cache = cache_settings_from_env() if should_use_cython else None
 
     if should_use_cython:
         try:
@@ -34,18 +67,63 @@ def cythonized_setup(module_name: str) -> None:
             raise ImportError(CYTHON_REQUIRED_MESSAGE) from e
 
         # slimmer/faster artefacten
-        Options.docstrings = False
-        Options.emit_code_comments = False
+        for name, value in CYTHON_OPTIONS.items():
+            setattr(Options, name, value)
 
-        logger.info("⛓️ Building with Cython extensions")
+        jobs = build_jobs()
+        logger.info("⛓️ Building with Cython extensions in %d parallel job(s)", jobs)
+
+        package_dir = Path("src", module_name)
+        all_py_files = sorted(package_dir.rglob("*.py"))
+        py_files = select_sources(all_py_files, package_dir, load_selection_rules())
+        logger.info("🎯 Compiling %d of %d module(s); the others stay pure Python", len(py_files), len(all_py_files))
+        compiler_directives = {"language_level": "3"}
+
+        cached_modules: list[Extension] = []  # type: ignore[no-any-unimported]
+        if cache is not None:
+            cython_options = {"directives": compiler_directives, **CYTHON_OPTIONS}
+            cache_keys = {
+                _module_name(path): extension_cache_key(path, _module_name(path), cython_options) for path in py_files
+            }
+            # Cache hits need no translation; their build_ext step only copies the cached module
+            cached_modules = [
+                Extension(name, sources=[])
+                for name, key in cache_keys.items()
+                if is_cached(cache.cache_dir, key, extension_filename(name))
+            ]
+            cached_names = {ext.name for ext in cached_modules}
+            sources = {_module_name(path): path for path in py_files}
+            py_files = [path for path in py_files if _module_name(path) not in cached_names]
+
+            def cythonize_module(name: str) -> Extension:  # type: ignore[no-any-unimported]
+                """Translate a module whose cache entry disappeared after the build was planned."""
+                (extension,) = cythonize(
+                    [Extension(name, sources=[str(sources[name])])], compiler_directives=compiler_directives
+                )
+                return extension
+
+            cmdclass = {"build_ext": _caching_build_ext(cache.cache_dir, cache_keys, cythonize_module)}
+            logger.info(
+                "♻️ %d of %d module(s) found in extension cache %s",
+                len(cached_modules),
+                len(cache_keys),
+                cache.cache_dir,
+            )
 
-        py_files = [str(p) for p in Path("src", module_name).rglob("*.py")]
         # let cythonize derive module names; language_level=3 is enough
-        ext_modules = cythonize(
-            py_files,
-            compiler_directives={"language_level": "3"},
-            annotate=False,
-        )
+        ext_modules = (
+            cythonize(
+                [str(p) for p in py_files],
+                compiler_directives=compiler_directives,
+                annotate=False,
+                nthreads=jobs,
+            )
+            if py_files
+            else []
+        ) + cached_modules
+        # build_ext compiles the extensions concurrently, as with `setup.py build_ext -j N`
+        options = {"build_ext": {"parallel": jobs}}
+        manifest_sources = [p for p in package_dir.rglob("*") if p.suffix in SOURCE_EXTENSIONS]
 
         # Only remove the source files from the Wheel at Cythonized Build
         exclude_package_data = {
@@ -70,5 +148,63 @@ def cythonized_setup(module_name: str) -> None:
         package_data={module_name: ["**/*.so", "**/*.pyd", "**/**/*.so", "**/**/*.pyd"]},
         exclude_package_data=exclude_package_data,
         ext_modules=ext_modules,
+        options=options,
+        cmdclass=cmdclass,
         zip_safe=False,
     )
+
+    if manifest_sources:
+        # Only a successful build lets `clean-pyd-modules --stale-only` treat its artifacts as fresh
+        write_manifest(Path("src"), manifest_sources)
+
+    if cache is not None:
+        summary = evict_extensions(cache.cache_dir, max_bytes=cache.max_bytes, max_age_days=cache.max_age_days)
+        if summary.removed or summary.failed:
+            logger.info("🧹 Extension cache: %s", summary.describe("entry(ies)"))
+
+
+def build_jobs() -> int:
+    """Return the number of parallel build jobs: CYTHON_BUILD_JOBS if set, otherwise the CPU count."""
+    value = os.environ.get(CYTHON_BUILD_JOBS_ENV, "").strip()
+    if value:
+        try:
+            jobs = int(value)
+        except ValueError:
+            jobs = 0
+        if jobs >= 1:
+            return jobs
+        logger.warning("Ignoring %s=%r: expected a positive integer.", CYTHON_BUILD_JOBS_ENV, value)
+    return os.cpu_count() or 1
+
+
+def _module_name(path: Path) -> str:
+    """Return the dotted module name of a source file below ``src``."""
+    return ".".join(path.relative_to("src").with_suffix("").parts)
+
+
+def _caching_build_ext(  # type: ignore[no-any-unimported]
+    cache_dir: Path, cache_keys: dict[str, str], cythonize_module: Callable[[str], Extension]
+) -> type[build_ext]:
+    """Return a build_ext command that restores cached modules and stores the ones it compiles.
+
+    A cached module is looked up under `extension_filename`, the name it was stored and
+    found under, whatever file name setuptools gives it in the build directory. If it is
+    gone by the time it is restored, it is translated with ``cythonize_module`` and compiled.
+    """
+
+    class CachingBuildExt(build_ext):  # type: ignore[no-any-unimported]
+        def build_extension(self, ext: Extension) -> None:  # type: ignore[no-any-unimported]
+            target = Path(self.get_ext_fullpath(ext.name))
+            filename = extension_filename(ext.name)
+            if not ext.sources:
+                if restore_extension(cache_dir, cache_keys[ext.name], target, filename=filename):
+                    logger.debug("Restored %s from cache", ext.name)
+                    return
+                logger.warning("%s is no longer in extension cache %s; compiling it", ext.name, cache_dir)
+                ext = cythonize_module(ext.name)
+            super().build_extension(ext)
+            key = cache_keys.get(ext.name)
+            if key is not None:
+                store_extension(cache_dir, key, target, filename=filename)
+
+    return CachingBuildExt
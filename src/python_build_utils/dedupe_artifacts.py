@@ -0,0 +1,240 @@
+"""Replace byte-identical build artifacts with links to a single copy.
+
+Duplicates are found in three rounds that each only look at the candidates left by the
+previous one: files are grouped by size, files of equal size by a hash of their first
+bytes, and only files whose prefixes match are hashed in full. Files that are already
+hard links of each other count as one.
+"""
+
+import errno
+import fnmatch
+import logging
+import os
+import sys
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import click
+
+from .cli_options import jobs_option
+from .constants import EXIT_FAILURE
+from .dist_dirs import dist_glob_options, resolve_dist_dirs
+from .hashing import hash_file, hash_files
+from .wheel_cache import replace_with_hardlink
+from .wheel_retag import clone_prefix
+from .wheel_writer import atomic_write
+
+
+logger = logging.getLogger(__name__)
+
+# Number of leading bytes hashed to split files of equal size before hashing them fully.
+PREFIX_SIZE = 64 * 1024
+
+DEFAULT_PATTERNS = ("*.whl", "*.tar.gz", "*.so", "*.pyd")
+
+LINK_HARDLINK = "hardlink"
+LINK_REFLINK = "reflink"
+
+
+class DuplicateGroup(NamedTuple):
+    """Files with identical content on one device; the first one is kept, the others are linked to it."""
+
+    digest: bytes
+    size: int
+    device: int
+    paths: tuple[Path, ...]
+
+    @property
+    def reclaimable(self) -> int:
+        """Bytes freed by replacing all but the first file with links."""
+        return self.size * (len(self.paths) - 1)
+
+
+@click.command(
+    name="dedupe-artifacts",
+    help=(
+        "Replace byte-identical build artifacts with hard links or reflinks to one copy.\n\n"
+        "Candidates are grouped by size, then by a hash of their first 64 KiB, and only then "
+        "hashed in full, in a thread pool."
+    ),
+)
+@click.option(
+    "--dist-dir",
+    default="dist",
+    help="Directory containing the artifacts. Defaults to 'dist'.",
+)
+@dist_glob_options
+@click.option(
+    "--pattern",
+    "patterns",
+    multiple=True,
+    default=DEFAULT_PATTERNS,
+    show_default=True,
+    help="Glob selecting the files to deduplicate. Can be given multiple times.",
+)
+@click.option(
+    "--link",
+    type=click.Choice([LINK_HARDLINK, LINK_REFLINK]),
+    default=LINK_HARDLINK,
+    show_default=True,
+    help="Replace duplicates with hard links, or with copy-on-write reflinks (btrfs, XFS) that stay independent files.",
+)
+@jobs_option("Number of hashing threads. Defaults to the number of CPUs.")
+@click.option("--dry-run", is_flag=True, help="Print the duplicates without replacing them.")
+def dedupe_artifacts(  # noqa: PLR0913
+    dist_dir: str,
+    root: Path,
+    dist_glob: str | None,
+    patterns: tuple[str, ...],
+    link: str,
+    *,
+    jobs: int | None = None,
+    dry_run: bool = False,
+) -> None:
+    """Find duplicate artifacts in the dist directories and replace them with links."""
+    dist_paths = [path for path in resolve_dist_dirs(dist_dir, root, dist_glob) if path.is_dir()]
+    if not dist_paths:
+        logger.error("No distribution directory found for '%s'.", dist_glob or dist_dir)
+        sys.exit(EXIT_FAILURE)
+
+    groups = find_duplicates(collect_files(dist_paths, patterns), jobs=jobs)
+
+    if dry_run:
+        click.echo(_get_report(groups))
+        return
+
+    linked = reclaimed = 0
+    for group in groups:
+        count = replace_duplicates(group, link=link)
+        linked += count
+        reclaimed += count * group.size
+    click.echo(f"Linked {linked} duplicate(s) in {len(groups)} group(s), {reclaimed / 1e6:.1f} MB reclaimed")
+
+
+def collect_files(dist_paths: Iterable[Path], patterns: Iterable[str]) -> list[Path]:
+    """Return the files directly in the directories whose names match one of the patterns."""
+    patterns = tuple(patterns)
+    files: list[Path] = []
+    for dist_path in dist_paths:
+        with os.scandir(dist_path) as entries:
+            files.extend(
+                Path(entry.path)
+                for entry in entries
+                if entry.is_file(follow_symlinks=False) and any(fnmatch.fnmatch(entry.name, p) for p in patterns)
+            )
+    return sorted(files)
+
+
+def find_duplicates(paths: Iterable[Path], *, jobs: int | None = None) -> list[DuplicateGroup]:
+    """Group files with identical content.
+
+    Args:
+    ----
+        paths: The files to compare.
+        jobs: Number of hashing threads. Defaults to the number of CPUs.
+
+    Returns:
+    -------
+        list[DuplicateGroup]: One group per content shared by more than one file of the
+            same device, sorted by the first path of each group. Within a group the paths
+            keep the order of ``paths``.
+
+    """
+    # Round 1: size, per device since links cannot cross filesystems. Hard links of one
+    # inode are already deduplicated and only their first path takes part.
+    by_size: dict[tuple[int, int], list[Path]] = defaultdict(list)
+    seen_inodes: set[tuple[int, int]] = set()
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            logger.debug("Skipping %s: removed during the scan", path)
+            continue
+        if stat.st_size == 0 or (stat.st_dev, stat.st_ino) in seen_inodes:
+            continue
+        seen_inodes.add((stat.st_dev, stat.st_ino))
+        by_size[stat.st_dev, stat.st_size].append(path)
+    candidates = [(key, group) for key, group in by_size.items() if len(group) > 1]
+
+    # Round 2: hash of the first bytes, which already is the full hash of small files.
+    prefix_files = [path for _, group in candidates for path in group]
+    prefix_digests = dict(zip(prefix_files, _hash_prefixes(prefix_files, jobs), strict=True))
+    by_prefix: dict[tuple[int, int, bytes], list[Path]] = defaultdict(list)
+    for (device, size), group in candidates:
+        for path in group:
+            by_prefix[device, size, prefix_digests[path]].append(path)
+
+    # Round 3: full hash of the files whose prefixes collide.
+    groups: list[DuplicateGroup] = []
+    full_files = [
+        path for (_, size, _), group in by_prefix.items() if len(group) > 1 and size > PREFIX_SIZE for path in group
+    ]
+    full_digests = dict(zip(full_files, (d.digest for d in hash_files(full_files, jobs=jobs)), strict=True))
+    for (device, size, prefix_digest), group in by_prefix.items():
+        if len(group) < 2:  # noqa: PLR2004
+            continue
+        by_digest: dict[bytes, list[Path]] = defaultdict(list)
+        for path in group:
+            by_digest[full_digests.get(path, prefix_digest)].append(path)
+        groups.extend(
+            DuplicateGroup(digest, size, device, tuple(same)) for digest, same in by_digest.items() if len(same) > 1
+        )
+    return sorted(groups, key=lambda group: group.paths[0])
+
+
+def replace_duplicates(group: DuplicateGroup, *, link: str = LINK_HARDLINK) -> int:
+    """Replace every file of the group but the first with a link to it; return how many were replaced.
+
+    Each file is replaced atomically. A file that cannot be linked is left in place and
+    logged.
+    """
+    keeper, *duplicates = group.paths
+    linked = 0
+    for duplicate in duplicates:
+        try:
+            if link == LINK_REFLINK:
+                _reflink(keeper, duplicate)
+            else:
+                replace_with_hardlink(keeper, duplicate)
+        except OSError as e:  # noqa: PERF203
+            logger.warning("Could not link %s to %s: %s", duplicate, keeper.name, e)
+        else:
+            logger.info("🔗 Linked: %s → %s", duplicate, keeper.name)
+            linked += 1
+    return linked
+
+
+def _hash_prefixes(paths: list[Path], jobs: int | None) -> list[bytes]:
+    """Hash the first `PREFIX_SIZE` bytes of each file in worker threads."""
+
+    def hash_prefix(path: Path) -> bytes:
+        return hash_file(path, buffer_size=PREFIX_SIZE, max_bytes=PREFIX_SIZE).digest
+
+    if len(paths) <= 1 or jobs == 1:
+        return [hash_prefix(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(jobs or os.cpu_count() or 1, len(paths))) as executor:
+        return list(executor.map(hash_prefix, paths))
+
+
+def _reflink(keeper: Path, duplicate: Path) -> None:
+    """Atomically replace ``duplicate`` with a copy-on-write clone of ``keeper``."""
+    with keeper.open("rb") as src, atomic_write(duplicate) as f:
+        if not clone_prefix(src, f, keeper.stat().st_size):
+            raise OSError(errno.EOPNOTSUPP, "the filesystem does not support reflinks")
+
+
+def _get_report(groups: list[DuplicateGroup]) -> str:
+    """Return the dry-run report: every group of duplicates and the space they take."""
+    lines = []
+    for group in groups:
+        lines.append(f"{group.digest.hex()[:16]}  {group.size / 1e6:.1f} MB x {len(group.paths)}")
+        lines.extend(f"    {path}" for path in group.paths)
+    duplicates = sum(len(group.paths) - 1 for group in groups)
+    reclaimable = sum(group.reclaimable for group in groups)
+    lines.append(
+        f"Would link {duplicates} duplicate(s) in {len(groups)} group(s), {reclaimable / 1e6:.1f} MB reclaimed"
+    )
+    return "\n".join(lines)
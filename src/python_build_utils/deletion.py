@@ -0,0 +1,118 @@
+"""Delete many files concurrently, or describe them in a dry-run manifest.
+
+On network shares (SMB, NFS) every unlink is a round trip to the server, so deleting
+files one after the other is dominated by latency. A bounded thread pool keeps several
+unlinks in flight. Files are only logged one by one at debug level; callers report a
+single summary.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple, TypeVar
+
+import click
+
+from .constants import STDOUT_PATH
+from .wheel_writer import open_output
+
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Deleting is I/O bound, so more threads than CPUs pay off on network shares.
+DEFAULT_DELETE_JOBS = min(32, (os.cpu_count() or 1) + 4)
+DELETE_JOBS_HELP = "Number of threads deleting files concurrently. Defaults to the number of CPUs plus 4, at most 32."
+
+
+class DeletionSummary(NamedTuple):
+    """Outcome of deleting a batch of files."""
+
+    removed: int
+    freed: int
+    failed: int
+
+    def describe(self, noun: str = "file(s)", *, dry_run: bool = False) -> str:
+        """Return a one-line summary such as ``Removed 3 file(s), 1.2 MB freed``."""
+        if dry_run:
+            return f"Would remove {self.removed} {noun}, {self.freed / 1e6:.1f} MB"
+        message = f"Removed {self.removed} {noun}, {self.freed / 1e6:.1f} MB freed"
+        return f"{message}, {self.failed} failed" if self.failed else message
+
+
+def dry_run_option(func: F) -> F:
+    """Add a --dry-run option whose optional value is where the JSON manifest goes (stdout by default)."""
+    return click.option(
+        "--dry-run",
+        "dry_run",
+        is_flag=False,
+        flag_value=STDOUT_PATH,
+        default=None,
+        metavar="[PATH]",
+        help="Write a JSON manifest of the files that would be removed, with their sizes, instead of removing "
+        "them. Written to standard output unless PATH is given.",
+    )(func)
+
+
+def delete_files(paths: Iterable[Path], jobs: int | None = None) -> DeletionSummary:
+    """Delete files in a bounded thread pool and return how many were removed and the bytes freed.
+
+    Args:
+    ----
+        paths: The files to delete.
+        jobs: Maximum number of concurrent deletions. Defaults to `DEFAULT_DELETE_JOBS`.
+
+    Returns:
+    -------
+        DeletionSummary: The number of files removed, the bytes they took and the number
+            of files that could not be removed.
+
+    """
+    files = list(paths)
+    if len(files) <= 1 or jobs == 1:
+        sizes = [_delete_file(path) for path in files]
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs or DEFAULT_DELETE_JOBS, len(files))) as executor:
+            sizes = list(executor.map(_delete_file, files))
+
+    removed = [size for size in sizes if size is not None]
+    return DeletionSummary(len(removed), sum(removed), len(sizes) - len(removed))
+
+
+def write_dry_run_manifest(paths: Iterable[Path], target: Path | str) -> DeletionSummary:
+    """Write a JSON manifest of the files that would be deleted, with their sizes.
+
+    Returns the summary the deletion would have had.
+    """
+    sizes: dict[str, int] = {}
+    for path in paths:
+        try:
+            sizes[str(path)] = path.stat().st_size
+        except OSError as e:  # noqa: PERF203
+            logger.warning("Cannot stat %s: %s", path, e)
+
+    freed = sum(sizes.values())
+    entries = [{"path": path, "size": size} for path, size in sizes.items()]
+    manifest = {"files": entries, "count": len(entries), "bytes": freed}
+    with open_output(target) as f:
+        f.write(json.dumps(manifest, indent=2).encode("utf-8") + b"\n")
+    return DeletionSummary(len(entries), freed, 0)
+
+
+def _delete_file(path: Path) -> int | None:
+    """Delete one file and return its size, or None if it could not be deleted."""
+    try:
+        size = path.stat().st_size
+        path.unlink()
+    except FileNotFoundError:
+        logger.warning("File not found: %s", path)
+        return None
+    except OSError as e:
+        logger.error("Error removing file %s: %s", path, e)  # noqa: TRY400
+        return None
+    logger.debug("Removed %s", path)
+    return size
@@ -0,0 +1,187 @@
+"""Package a directory of compiled modules, stubs and data files into a single wheel."""
+
+import fnmatch
+import logging
+import sys
+import sysconfig
+from collections.abc import Iterable
+from pathlib import Path
+
+import click
+
+from .cli_options import jobs_option
+from .pyd2wheel import compression_options, get_compression_policy
+from .wheel_retag import normalize_name, split_wheel_tag
+from .wheel_writer import (
+    CompressionPolicy,
+    WheelWriter,
+    atomic_write,
+    get_metadata_content,
+    get_wheel_content,
+    get_wheel_info,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Build leftovers that never belong in a wheel.
+DEFAULT_EXCLUDES: tuple[str, ...] = ("__pycache__", "*.pyc", "*.c")
+
+
+def _validate_tag(_ctx: click.Context, _param: click.Parameter, value: str | None) -> str | None:
+    """Reject a tag that is empty or holds a ``-``, which would break up the wheel tag."""
+    if value is not None and (not value or "-" in value):
+        msg = f"'{value}' is not a single tag: it must be non-empty and must not contain '-'."
+        raise click.BadParameter(msg)
+    return value
+
+
+@click.command(
+    name="dir2wheel",
+    help=(
+        "Create one Python wheel from a package directory with compiled modules (.pyd/.so), "
+        "stubs (.pyi), py.typed and other package files."
+    ),
+)
+@click.argument("package_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--package-version", required=True, help="Version of the package.")
+@click.option("--name", default=None, help="Distribution name. Defaults to the name of PACKAGE_DIR.")
+@click.option(
+    "--python-tag",
+    default=None,
+    callback=_validate_tag,
+    help="Python tag (e.g. cp312). Defaults to the current Python version.",
+)
+@click.option(
+    "--abi-tag",
+    default=None,
+    callback=_validate_tag,
+    help="ABI tag (e.g. cp312). Defaults to the Python tag.",
+)
+@click.option(
+    "--platform-tag",
+    default=None,
+    callback=_validate_tag,
+    help="Platform tag (e.g. win_amd64). Defaults to the current platform.",
+)
+@click.option(
+    "--out-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default="dist",
+    show_default=True,
+    help="Directory to write the wheel to.",
+)
+@click.option(
+    "--exclude",
+    "excludes",
+    multiple=True,
+    help="Glob for files or directories to leave out, in addition to __pycache__, *.pyc and *.c.",
+)
+@jobs_option("Number of threads hashing and compressing members. Defaults to the number of CPUs.")
+@compression_options
+def dir2wheel(  # noqa: PLR0913, PLR0917
+    package_dir: Path,
+    package_version: str,
+    name: str | None = None,
+    python_tag: str | None = None,
+    abi_tag: str | None = None,
+    platform_tag: str | None = None,
+    out_dir: Path = Path("dist"),
+    excludes: tuple[str, ...] = (),
+    jobs: int | None = None,
+    compression: str = "deflate",
+    compresslevel: int | None = None,
+    compression_rules: tuple[str, ...] = (),
+) -> Path:
+    """CLI entrypoint to convert a package directory into a Python wheel."""
+    policy = get_compression_policy(compression, compresslevel, compression_rules)
+    py_tag = python_tag or f"cp{sys.version_info.major}{sys.version_info.minor}"
+    plat_tag = platform_tag or sysconfig.get_platform().replace("-", "_").replace(".", "_")
+    wheel_tag = f"{py_tag}-{abi_tag or py_tag}-{plat_tag}"
+
+    return convert_dir_to_wheel(
+        package_dir,
+        package_version,
+        wheel_tag,
+        name=name,
+        out_dir=out_dir,
+        excludes=excludes,
+        jobs=jobs,
+        compression=policy,
+    )
+
+
+def convert_dir_to_wheel(  # noqa: PLR0913
+    package_dir: Path,
+    package_version: str,
+    wheel_tag: str,
+    *,
+    name: str | None = None,
+    out_dir: Path | None = None,
+    excludes: Iterable[str] = (),
+    jobs: int | None = None,
+    compression: CompressionPolicy | None = None,
+) -> Path:
+    """Convert a package directory into a wheel with the package at the wheel root.
+
+    Members are hashed and compressed in ``jobs`` threads and written to the archive in
+    sorted order in a single pass, so the result is reproducible.
+
+    Args:
+    ----
+        package_dir: The importable package directory, e.g. ``build/lib/mypkg``.
+        package_version: Version of the distribution.
+        wheel_tag: Combined ``{python tag}-{abi tag}-{platform tag}``. A tag with another
+            number of parts raises ValueError.
+        name: Distribution name. Defaults to the name of ``package_dir``. It is normalized
+            (``my-pkg`` becomes ``my_pkg``) in the file name and the .dist-info directory.
+        out_dir: Directory to write the wheel to. Defaults to ``dist``.
+        excludes: Extra glob patterns for files or directories to leave out.
+        jobs: Number of worker threads. Defaults to the number of CPUs.
+        compression: Compression policy for the members.
+
+    Returns:
+    -------
+        Path: The path of the created wheel.
+
+    """
+    dist_name = name or package_dir.name
+    py_tag, abi_tag, platform = split_wheel_tag(wheel_tag)
+    members = collect_package_files(package_dir, (*DEFAULT_EXCLUDES, *excludes))
+
+    logger.info("=" * 80)
+    logger.info("Wheel Metadata:\n%s", get_wheel_info(dist_name, package_version, py_tag, platform, abi_tag))
+    logger.info("=" * 80)
+    logger.info("Packaging %d files from %s", len(members), package_dir)
+
+    wheel_dir = out_dir or Path("dist")
+    wheel_dir.mkdir(parents=True, exist_ok=True)
+    wheel_path = wheel_dir / f"{normalize_name(dist_name)}-{package_version}-{wheel_tag}.whl"
+
+    dist_info = f"{normalize_name(dist_name)}-{package_version}.dist-info"
+    with atomic_write(wheel_path) as f, WheelWriter(f, dist_info, compression) as writer:
+        writer.write_files(members, jobs)
+        writer.write_dist_info("METADATA", get_metadata_content(dist_name, package_version))
+        writer.write_dist_info("WHEEL", get_wheel_content(py_tag, abi_tag, platform))
+
+    logger.info("✅ Created wheel file: %s", wheel_path)
+    return wheel_path
+
+
+def collect_package_files(package_dir: Path, excludes: Iterable[str] = DEFAULT_EXCLUDES) -> list[tuple[str, Path]]:
+    """Return sorted ``(arcname, path)`` pairs for every file in the package directory.
+
+    Arcnames are prefixed with the package directory name. A pattern in ``excludes``
+    matching a file or any of its parent directories leaves the file out.
+    """
+    patterns = tuple(excludes)
+    root = package_dir.parent
+    members: list[tuple[str, Path]] = []
+    for path in package_dir.rglob("*"):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(package_dir)
+        if any(fnmatch.fnmatch(part, pattern) for part in relative.parts for pattern in patterns):
+            continue
+        members.append((path.relative_to(root).as_posix(), path))
+    return sorted(members)
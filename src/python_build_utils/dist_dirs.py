@@ -0,0 +1,88 @@
+"""Discover the distribution directories of a monorepo in one pruned walk."""
+
+import fnmatch
+import glob
+import os
+from collections.abc import Callable
+from pathlib import Path, PurePosixPath
+from typing import Any, TypeVar
+
+import click
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Directories never entered while expanding ``**``.
+SKIPPED_DIRS = frozenset({"node_modules", "__pycache__", "site-packages"})
+
+
+def dist_glob_options(func: F) -> F:
+    """Add the --root and --dist-glob options that select many dist directories at once."""
+    func = click.option(
+        "--dist-glob",
+        default=None,
+        metavar="PATTERN",
+        help=(
+            "Glob relative to --root selecting the dist directories to process, e.g. 'packages/*/dist'. "
+            "Overrides --dist-dir."
+        ),
+    )(func)
+    return click.option(
+        "--root",
+        type=click.Path(exists=True, file_okay=False, path_type=Path),
+        default=Path(),
+        show_default=True,
+        help="Directory in which --dist-glob is expanded.",
+    )(func)
+
+
+def resolve_dist_dirs(dist_dir: str, root: Path, dist_glob: str | None) -> list[Path]:
+    """Return the directories selected by --dist-glob, or just --dist-dir without it."""
+    if dist_glob is None:
+        return [Path(dist_dir.rstrip("/")).resolve()]
+    return find_dist_dirs(root.resolve(), dist_glob)
+
+
+def find_dist_dirs(root: Path, pattern: str) -> list[Path]:
+    """Return the sorted directories below ``root`` matching a glob such as ``packages/*/dist``.
+
+    The pattern is matched one path component at a time, so only directories that can
+    still match are listed: ``packages/*/dist`` reads ``root``, ``packages`` and each
+    package directory once, however large the rest of the tree is. ``**`` matches any
+    number of directories; hidden directories are only entered when a component names
+    them explicitly. Like ``glob``, ``**`` does not descend into symlinked directories,
+    so a link pointing back up the tree cannot make the walk loop.
+    """
+    matches: set[Path] = set()
+    _walk(root, PurePosixPath(pattern).parts, matches)
+    return sorted(matches)
+
+
+def _walk(directory: Path, parts: tuple[str, ...], matches: set[Path]) -> None:
+    """Match the remaining pattern components below ``directory``."""
+    if not parts:
+        matches.add(directory)
+        return
+
+    head, rest = parts[0], parts[1:]
+    if head == "**":
+        _walk(directory, rest, matches)
+        for subdir in _subdirs(directory, follow_symlinks=False):
+            if subdir.name not in SKIPPED_DIRS and not subdir.name.startswith("."):
+                _walk(subdir, parts, matches)
+    elif not glob.has_magic(head):
+        if (directory / head).is_dir():
+            _walk(directory / head, rest, matches)
+    else:
+        for subdir in _subdirs(directory):
+            if fnmatch.fnmatch(subdir.name, head) and (head.startswith(".") or not subdir.name.startswith(".")):
+                _walk(subdir, rest, matches)
+
+
+def _subdirs(directory: Path, *, follow_symlinks: bool = True) -> list[Path]:
+    """List the subdirectories of ``directory`` with a single scandir call."""
+    try:
+        with os.scandir(directory) as entries:
+            return [Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=follow_symlinks)]
+    except OSError:
+        return []
@@ -4,11 +4,11 @@ from .constants import PYD_FILE_FORMATS
 
 
 class PydFileSuffixError(Exception):
-    """Raised when a file does not have a .pyd suffix."""
+    """Raised when a file does not have a .pyd or .so suffix."""
 
     def __init__(self, filename: str) -> None:
-        """Initialize the error with the filename that lacks a .pyd suffix."""
-        message = f"The file '{filename}' is not of type '.pyd'. Quitting."
+        """Initialize the error with the filename that lacks a .pyd or .so suffix."""
+        message = f"The file '{filename}' is not of type '.pyd' or '.so'. Quitting."
         super().__init__(message)
 
 
@@ -21,7 +21,8 @@ class PydFileFormatError(Exception):
             f"File information could not be extracted from '{filename}'.\n"
             "Supported formats:\n"
             f"  • {PYD_FILE_FORMATS['long']}\n"
-            f"  • {PYD_FILE_FORMATS['short']}"
+            f"  • {PYD_FILE_FORMATS['short']}\n"
+            f"  • {PYD_FILE_FORMATS['so']}"
         )
         super().__init__(message)
 
@@ -36,3 +37,21 @@ class VersionNotFoundError(Exception):
             "Please provide the version explicitly using '--package_version <version>'."
         )
         super().__init__(message)
+
+
+class RenameTransactionError(Exception):
+    """Raised when a batch of wheel renames failed and was rolled back."""
+
+    def __init__(self, failed: int, total: int) -> None:
+        """Initialize the error with the number of failed renames in the batch."""
+        message = f"{failed} of {total} wheel renames failed; all wheels in the batch were restored."
+        super().__init__(message)
+
+
+class GitListingError(Exception):
+    """Raised when git cannot list the untracked files of a source directory."""
+
+    def __init__(self, src_path: object, reason: str) -> None:
+        """Initialize the error with the directory and the reason git gave."""
+        message = f"Could not list the untracked files of '{src_path}' with git: {reason}"
+        super().__init__(message)
@@ -0,0 +1,244 @@
+"""Content-addressed cache of compiled extension modules for `cythonized_setup`.
+
+A cache key covers everything that determines the bytes of a compiled module: the
+hashes of its ``.py`` source and of the ``.pxd``/``.pxi`` files it depends on, the
+module name, the Cython version and compiler settings, the C compiler and its flags,
+and the Python ABI. A module whose key is in the cache is neither translated nor compiled; the cached
+``.so``/``.pyd`` is copied into the build directory instead. Modules are copied rather
+than hard-linked in both directions, so post-processing a build in place (strip,
+codesign, patchelf) never changes a cache entry.
+
+The cache is enabled by setting ``CYTHON_BUILD_CACHE_DIR``. Entries unused for
+``CYTHON_BUILD_CACHE_MAX_AGE`` days are evicted after every build, and then the least
+recently used ones until the cache is smaller than ``CYTHON_BUILD_CACHE_MAX_SIZE`` MB.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import sysconfig
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import NamedTuple
+
+from . import __version__
+from .deletion import DeletionSummary
+from .hashing import hash_file
+from .wheel_cache import copy_atomically
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "CYTHON_BUILD_CACHE_DIR"
+CACHE_MAX_SIZE_ENV = "CYTHON_BUILD_CACHE_MAX_SIZE"
+CACHE_MAX_AGE_ENV = "CYTHON_BUILD_CACHE_MAX_AGE"
+
+DEFAULT_MAX_SIZE_MB = 1024
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Build variables of the interpreter and environment variables that change the compiled code.
+COMPILER_CONFIG_VARS = ("CC", "CFLAGS", "CCSHARED", "LDSHARED", "EXT_SUFFIX", "SOABI")
+COMPILER_ENV_VARS = ("CC", "CFLAGS", "CPPFLAGS", "LDFLAGS", "LDSHARED", "ARCHFLAGS", "_PYTHON_HOST_PLATFORM")
+
+
+class CacheSettings(NamedTuple):
+    """Location and eviction limits of the extension cache; a limit of None disables it."""
+
+    cache_dir: Path
+    max_bytes: int | None
+    max_age_days: float | None
+
+
+def cache_settings_from_env() -> CacheSettings | None:
+    """Return the cache settings from the environment, or None if the cache is not enabled.
+
+    A maximum size or age of 0 disables that limit; an invalid value falls back to the default.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV, "").strip()
+    if not cache_dir:
+        return None
+    max_size_mb = _env_limit(CACHE_MAX_SIZE_ENV, DEFAULT_MAX_SIZE_MB)
+    max_age_days = _env_limit(CACHE_MAX_AGE_ENV, DEFAULT_MAX_AGE_DAYS)
+    max_bytes = None if max_size_mb is None else int(max_size_mb * 1e6)
+    return CacheSettings(Path(cache_dir).expanduser(), max_bytes, max_age_days)
+
+
+def extension_cache_key(source: Path, module_name: str, cython_options: Mapping[str, object]) -> str:
+    """Return the cache key for compiling ``source`` into the extension ``module_name``.
+
+    Args:
+    ----
+        source: The ``.py`` or ``.pyx`` file the module is compiled from. The files
+            returned by `cython_dependencies` are part of the key as well.
+        module_name: The dotted name of the extension module.
+        cython_options: The compiler directives and `Cython.Compiler.Options` of the build.
+
+    Returns:
+    -------
+        str: The hexadecimal sha256 of all inputs.
+
+    """
+    from Cython import __version__ as cython_version  # noqa: PLC0415
+
+    fields = [
+        f"builder={__version__}",
+        f"source={hash_file(source).digest.hex()}",
+        *(
+            f"dependency={os.path.relpath(dependency, source.parent)}={hash_file(dependency).digest.hex()}"
+            for dependency in cython_dependencies(source)
+        ),
+        f"module={module_name}",
+        f"cython={cython_version}",
+        f"options={json.dumps(cython_options, sort_keys=True, default=str)}",
+        f"python={sys.implementation.cache_tag}",
+        f"platform={sysconfig.get_platform()}",
+        *(f"config.{name}={sysconfig.get_config_var(name)}" for name in COMPILER_CONFIG_VARS),
+        *(f"env.{name}={os.environ.get(name, '')}" for name in COMPILER_ENV_VARS),
+    ]
+    return hashlib.sha256("\n".join(fields).encode("utf-8")).hexdigest()
+
+
+def cython_dependencies(source: Path) -> list[Path]:
+    """Return the files Cython reads when compiling ``source``, other than ``source`` itself.
+
+    These are the ``.pxd`` next to it, the ``.pxd`` files it cimports, also from other
+    packages, and the ``.pxi`` files it includes, followed transitively, as found by
+    Cython's own dependency tree. Like `cythonize`, the tree is built once per process.
+    """
+    from Cython.Build.Dependencies import create_dependency_tree  # noqa: PLC0415
+
+    resolved = source.resolve()
+    dependencies = {Path(path).resolve() for path in create_dependency_tree().all_dependencies(str(resolved))}
+    pxd = resolved.with_suffix(".pxd")
+    if pxd.is_file():  # the tree misses it for a module outside a package
+        dependencies.add(pxd)
+    return sorted(dependencies - {resolved})
+
+
+def extension_filename(module_name: str) -> str:
+    """Return the file name of a compiled module for this interpreter, such as ``mod.cpython-312-x86_64-linux-gnu.so``."""
+    return module_name.rpartition(".")[2] + str(sysconfig.get_config_var("EXT_SUFFIX"))
+
+
+def cached_extension_path(cache_dir: Path, key: str, filename: str) -> Path:
+    """Return the location of a compiled module in the cache directory."""
+    return cache_dir / key[:2] / key / filename
+
+
+def is_cached(cache_dir: Path, key: str, filename: str) -> bool:
+    """Return True if the cache holds the compiled module for ``key``."""
+    return cached_extension_path(cache_dir, key, filename).is_file()
+
+
+def restore_extension(cache_dir: Path, key: str, target: Path, *, filename: str | None = None) -> bool:
+    """Place the cached module for ``key`` at ``target``; return False on a cache miss.
+
+    ``filename`` is the name of the module in the cache, by default ``target.name``. The
+    entry is marked as used, so that size-based eviction removes it last.
+    """
+    cached = cached_extension_path(cache_dir, key, filename or target.name)
+    if not cached.is_file():
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        copy_atomically(cached, target)
+    except FileNotFoundError:  # evicted by a concurrent build
+        return False
+    try:
+        os.utime(cached.parent)
+    except OSError as e:
+        logger.debug("Could not mark cache entry %s as used: %s", cached.parent, e)
+    return True
+
+
+def store_extension(cache_dir: Path, key: str, built: Path, *, filename: str | None = None) -> None:
+    """Add a freshly compiled module to the cache directory, as ``filename`` if given."""
+    cached = cached_extension_path(cache_dir, key, filename or built.name)
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        copy_atomically(built, cached)
+    except OSError as e:
+        logger.warning("Could not store %s in cache '%s': %s", built.name, cache_dir, e)
+
+
+def evict_extensions(
+    cache_dir: Path,
+    *,
+    max_bytes: int | None = None,
+    max_age_days: float | None = None,
+    now: float | None = None,
+) -> DeletionSummary:
+    """Remove cache entries that are too old, then the least recently used ones until the cache fits.
+
+    Args:
+    ----
+        cache_dir: The cache directory.
+        max_bytes: Maximum total size of the cache. None means no limit.
+        max_age_days: Maximum number of days since an entry was stored or last restored.
+            None means no limit.
+        now: The current time as a timestamp. Defaults to `time.time`.
+
+    Returns:
+    -------
+        DeletionSummary: The number of entries removed, the bytes they took and the number
+            of entries that could not be removed.
+
+    """
+    entries = sorted(_cache_entries(cache_dir))  # oldest first
+    now = time.time() if now is None else now
+    total = sum(size for _, size, _ in entries)
+
+    evicted: list[tuple[Path, int]] = []
+    for used, size, path in entries:
+        too_old = max_age_days is not None and now - used > max_age_days * 86400
+        too_big = max_bytes is not None and total > max_bytes
+        if not (too_old or too_big):
+            continue
+        evicted.append((path, size))
+        total -= size
+
+    removed = freed = failed = 0
+    for path, size in evicted:
+        try:
+            shutil.rmtree(path)
+        except OSError as e:  # noqa: PERF203
+            logger.warning("Could not evict cache entry %s: %s", path, e)
+            failed += 1
+        else:
+            logger.debug("Evicted %s", path)
+            removed += 1
+            freed += size
+    return DeletionSummary(removed, freed, failed)
+
+
+def _cache_entries(cache_dir: Path) -> list[tuple[float, int, Path]]:
+    """Return the last use, the size and the path of every entry in the cache directory."""
+    entries = []
+    for entry in cache_dir.glob("*/*"):
+        try:
+            size = sum(file.stat().st_size for file in entry.iterdir())
+            entries.append((entry.stat().st_mtime, size, entry))
+        except OSError as e:  # noqa: PERF203
+            logger.debug("Skipping cache entry %s: %s", entry, e)
+    return entries
+
+
+def _env_limit(name: str, default: float) -> float | None:
+    """Return a positive limit from the environment, None when it is 0, or ``default`` when unset or invalid."""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        limit = float(value)
+    except ValueError:
+        limit = -1
+    if limit == 0:
+        return None
+    if limit > 0:
+        return limit
+    logger.warning("Ignoring %s=%r: expected a non-negative number.", name, value)
+    return default
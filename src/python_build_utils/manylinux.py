@@ -0,0 +1,160 @@
+"""Derive manylinux platform tags from the glibc symbol versions an ELF shared object needs.
+
+Only the ELF header, the section header table and the ``SHT_GNU_verneed`` section with
+its string table are read, through a memory map, so large binaries cost a few page
+reads instead of a full scan. This gives the minimum glibc version; it does not check
+the external libraries a module links against the way auditwheel does.
+"""
+
+import logging
+import mmap
+import re
+import struct
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+
+ELF_MAGIC = b"\x7fELF"
+SHT_GNU_VERNEED = 0x6FFFFFFE
+VERSION_ENTRY_SIZE = 16  # both Elf_Verneed and Elf_Vernaux
+
+_GLIBC_VERSION_PATTERN = re.compile(rb"GLIBC_(\d+)\.(\d+)(?:\.\d+)*")
+
+# Oldest glibc covered by a manylinux standard: manylinux1 for x86, manylinux2014 for the others.
+MANYLINUX_BASELINES: dict[str, tuple[int, int]] = {"x86_64": (2, 5), "i686": (2, 5)}
+DEFAULT_MANYLINUX_BASELINE = (2, 17)
+
+# Architecture as used in CPython's multiarch suffix -> wheel platform architecture.
+LINUX_ARCHITECTURES: dict[str, str] = {
+    "x86_64": "x86_64",
+    "i386": "i686",
+    "i686": "i686",
+    "aarch64": "aarch64",
+    "arm": "armv7l",
+    "powerpc64le": "ppc64le",
+    "s390x": "s390x",
+    "riscv64": "riscv64",
+}
+
+
+def detect_glibc_version(path: Path) -> tuple[int, int] | None:
+    """Return the highest ``GLIBC_x.y`` symbol version required by an ELF file.
+
+    Returns None when the file is not an ELF file, is truncated or corrupt, or requires no
+    versioned glibc symbols.
+    """
+    with path.open("rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+        with data:
+            try:
+                return _max_glibc_version(data)
+            except MalformedElfError as e:
+                logger.warning("Cannot read the glibc version of %s: %s", path, e)
+                return None
+
+
+def manylinux_platform_tag(path: Path, arch: str) -> str:
+    """Return ``manylinux_x_y_<arch>`` for the glibc ``path`` needs, or ``linux_<arch>`` if unknown.
+
+    Versions below the oldest manylinux baseline of the architecture are raised to it.
+    """
+    glibc = detect_glibc_version(path)
+    if glibc is None:
+        return f"linux_{arch}"
+    major, minor = max(glibc, MANYLINUX_BASELINES.get(arch, DEFAULT_MANYLINUX_BASELINE))
+    return f"manylinux_{major}_{minor}_{arch}"
+
+
+class MalformedElfError(ValueError):
+    """Raised when an offset or count in an ELF image points outside the file."""
+
+
+def _max_glibc_version(data: mmap.mmap) -> tuple[int, int] | None:
+    """Walk the version-needed entries of an ELF image and return the highest glibc version."""
+    if len(data) < 64 or data[:4] != ELF_MAGIC:  # noqa: PLR2004
+        return None
+
+    is_64bit = data[4] == 2  # noqa: PLR2004
+    endian = "<" if data[5] == 1 else ">"
+
+    if is_64bit:
+        (shoff,) = _unpack(f"{endian}Q", data, 0x28)
+        shentsize, shnum = _unpack(f"{endian}HH", data, 0x3A)
+        section_format = f"{endian}IIQQQQIIQQ"
+    else:
+        (shoff,) = _unpack(f"{endian}I", data, 0x20)
+        shentsize, shnum = _unpack(f"{endian}HH", data, 0x2E)
+        section_format = f"{endian}IIIIIIIIII"
+
+    if shnum and shentsize < struct.calcsize(section_format):
+        msg = f"section header size {shentsize} is too small"
+        raise MalformedElfError(msg)
+    sections = [_unpack(section_format, data, shoff + i * shentsize) for i in range(shnum)]
+
+    best: tuple[int, int] | None = None
+    for section in sections:
+        if section[1] != SHT_GNU_VERNEED:
+            continue
+        offset, size, link, count = section[4], section[5], section[6], section[7]
+        if link >= len(sections):
+            msg = f"string table index {link} out of range"
+            raise MalformedElfError(msg)
+        strtab_offset = sections[link][4]
+
+        # Every Verneed and Vernaux entry is 16 bytes and lies in the section, which bounds the walk.
+        budget = size // VERSION_ENTRY_SIZE
+        for i in range(_chain_length(count, budget)):
+            _, aux_count, _, aux_offset, next_offset = _unpack(f"{endian}HHIII", data, offset)
+            budget -= 1 + _chain_length(aux_count, budget - 1)
+            aux = offset + aux_offset
+            for j in range(aux_count):
+                _, _, _, name_offset, aux_next = _unpack(f"{endian}IHHII", data, aux)
+                version = _glibc_version(data, strtab_offset + name_offset)
+                if version and (best is None or version > best):
+                    best = version
+                _check_next(aux_next, j, aux_count)
+                aux += aux_next
+            _check_next(next_offset, i, count)
+            offset += next_offset
+
+    return best
+
+
+def _chain_length(count: int, budget: int) -> int:
+    """Return ``count`` if that many version entries fit in the section, else raise `MalformedElfError`."""
+    if count > budget:
+        msg = f"{count} version entries do not fit in the version section"
+        raise MalformedElfError(msg)
+    return count
+
+
+def _check_next(next_offset: int, index: int, count: int) -> None:
+    """Raise `MalformedElfError` if a version entry that is not the last one does not point ahead."""
+    if next_offset == 0 and index < count - 1:
+        msg = f"version chain ends after {index + 1} of {count} entries"
+        raise MalformedElfError(msg)
+
+
+def _unpack(fmt: str, data: mmap.mmap, offset: int) -> tuple[int, ...]:
+    """Unpack ``fmt`` at ``offset``, raising `MalformedElfError` if it does not fit in the image."""
+    if offset < 0 or offset + struct.calcsize(fmt) > len(data):
+        msg = f"offset {offset:#x} is outside the file of {len(data)} bytes"
+        raise MalformedElfError(msg)
+    return struct.unpack_from(fmt, data, offset)
+
+
+def _glibc_version(data: mmap.mmap, offset: int) -> tuple[int, int] | None:
+    """Parse the NUL-terminated version name at ``offset`` if it is a glibc version."""
+    end = data.find(b"\x00", offset) if 0 <= offset < len(data) else -1
+    if end < 0:
+        msg = f"version name at {offset:#x} is not terminated within the file"
+        raise MalformedElfError(msg)
+    match = _GLIBC_VERSION_PATTERN.fullmatch(data[offset:end])
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
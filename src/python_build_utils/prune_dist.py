@@ -0,0 +1,276 @@
+"""Prune old wheels and source distributions from build directories by a retention policy.
+
+The artifact file names are parsed once into an index of package name, version and
+tags. The retention rules are evaluated on that index alone, and the selected files are
+then deleted in one pass.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+import click
+
+from .cli_options import jobs_option
+from .constants import EXIT_FAILURE, SDIST_EXTENSION, WHEEL_EXTENSION
+from .deletion import DELETE_JOBS_HELP, DeletionSummary, delete_files
+from .dist_dirs import dist_glob_options, resolve_dist_dirs
+from .wheel_retag import expand_tag, normalize_name, split_wheel_name
+
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+KIND_WHEEL = "wheel"
+KIND_SDIST = "sdist"
+
+# PEP 440 versions; anything else sorts before every valid version.
+_VERSION_PATTERN = re.compile(
+    r"""
+    ^v?(?:(?P<epoch>\d+)!)?
+    (?P<release>\d+(?:\.\d+)*)
+    (?:[-_.]?(?P<pre_label>a|b|c|rc|alpha|beta|pre|preview)[-_.]?(?P<pre>\d*))?
+    (?:-(?P<post_implicit>\d+)|[-_.]?(?:post|rev|r)[-_.]?(?P<post>\d*))?
+    (?:[-_.]?dev[-_.]?(?P<dev>\d*))?
+    (?:\+[a-z0-9]+(?:[-_.][a-z0-9]+)*)?$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+_PRE_RANKS = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+_FINAL_RANK = 3
+
+# Epoch, release without trailing zeros, pre-release rank and number, post-release, dev-release,
+# and the version itself for versions that are not PEP 440, which sort first.
+VersionKey = tuple[int, tuple[int, ...], tuple[int, int], int, int, str]
+
+
+class Artifact(NamedTuple):
+    """A wheel or sdist, described by its parsed file name and its stat result."""
+
+    path: Path
+    name: str
+    version: str
+    kind: str
+    tags: tuple[str, ...]
+    size: int
+    mtime: float
+
+
+class RetentionPolicy(NamedTuple):
+    """Rules deciding which artifacts to keep. An artifact is kept if any rule keeps it."""
+
+    keep: int | None = None
+    max_age_days: float | None = None
+    keep_tags: tuple[str, ...] = ()
+
+
+@click.command(
+    name="prune-dist",
+    help=(
+        "Prune old wheels and source distributions from the dist directory.\n\n"
+        "An artifact is kept when its version is one of the --keep newest of its package, when it is "
+        "younger than --max-age days, or when one of its tags matches --keep-tag. Everything else is deleted."
+    ),
+)
+@click.option(
+    "--dist-dir",
+    default="dist",
+    help="Directory containing the artifacts. Defaults to 'dist'.",
+)
+@dist_glob_options
+@click.option(
+    "--keep",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of newest versions to keep per package.",
+)
+@click.option(
+    "--max-age",
+    "max_age_days",
+    type=click.FloatRange(min=0),
+    default=None,
+    metavar="DAYS",
+    help="Keep artifacts modified less than this many days ago.",
+)
+@click.option(
+    "--keep-tag",
+    "keep_tags",
+    multiple=True,
+    metavar="PATTERN",
+    help="Keep wheels with a tag matching this glob, e.g. 'cp312-*'. Can be given multiple times.",
+)
+@click.option(
+    "--kind",
+    type=click.Choice([KIND_WHEEL, KIND_SDIST, "all"]),
+    default="all",
+    show_default=True,
+    help="Which artifacts to consider; the others are always kept.",
+)
+@jobs_option(DELETE_JOBS_HELP)
+@click.option("--dry-run", is_flag=True, help="Print the artifacts that would be deleted without deleting them.")
+def prune_dist(  # noqa: PLR0913, PLR0917
+    dist_dir: str,
+    root: Path,
+    dist_glob: str | None,
+    keep: int | None,
+    max_age_days: float | None,
+    keep_tags: tuple[str, ...],
+    kind: str,
+    *,
+    jobs: int | None = None,
+    dry_run: bool = False,
+) -> None:
+    """Delete the artifacts that no retention rule keeps."""
+    if keep is None and max_age_days is None:
+        msg = "Give --keep, --max-age or both."
+        raise click.UsageError(msg)
+
+    dist_paths = [path for path in resolve_dist_dirs(dist_dir, root, dist_glob) if path.is_dir()]
+    if not dist_paths:
+        logger.error("No distribution directory found for '%s'.", dist_glob or dist_dir)
+        sys.exit(EXIT_FAILURE)
+
+    index = build_index(dist_paths, kinds=None if kind == "all" else {kind})
+    pruned = select_pruned(index, RetentionPolicy(keep, max_age_days, keep_tags))
+
+    if dry_run:
+        click.echo(_get_report(pruned, index))
+        return
+
+    summary = delete_artifacts(pruned, jobs=jobs)
+    click.echo(_get_summary(summary, pruned, index))
+
+
+def build_index(dist_paths: Iterable[Path], kinds: set[str] | None = None) -> dict[str, list[Artifact]]:
+    """Parse the artifact file names in the directories into lists per package.
+
+    Each directory is listed with a single scandir call; files that are not wheels or
+    sdists, or whose names cannot be parsed, are skipped.
+    """
+    index: dict[str, list[Artifact]] = defaultdict(list)
+    for dist_path in dist_paths:
+        with os.scandir(dist_path) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                artifact = parse_artifact(Path(entry.path), entry.stat())
+                if artifact is None:
+                    logger.debug("Skipping %s: not a wheel or sdist name", entry.name)
+                elif kinds is None or artifact.kind in kinds:
+                    index[artifact.name].append(artifact)
+    return dict(index)
+
+
+def parse_artifact(path: Path, stat: os.stat_result) -> Artifact | None:
+    """Parse the file name of a wheel or sdist, or return None for any other file."""
+    filename = path.name
+    if filename.endswith(WHEEL_EXTENSION):
+        try:
+            prefix, wheel_tag = split_wheel_name(filename)
+        except ValueError:
+            return None
+        name, version = prefix.split("-")[:2]
+        return Artifact(
+            path, normalize_name(name), version, KIND_WHEEL, tuple(expand_tag(wheel_tag)), stat.st_size, stat.st_mtime
+        )
+    if filename.endswith(SDIST_EXTENSION):
+        name, sep, version = filename.removesuffix(SDIST_EXTENSION).rpartition("-")
+        if not sep or not name:
+            return None
+        return Artifact(path, normalize_name(name), version, KIND_SDIST, (), stat.st_size, stat.st_mtime)
+    return None
+
+
+def version_key(version: str) -> VersionKey:
+    """Return a sort key ordering versions like PEP 440: ``1.0.dev1 < 1.0a1 < 1.0 < 1.0.post1 < 1.10``.
+
+    Equal versions get equal keys, so ``1.0`` and ``1.0.0`` are the same version.
+    """
+    match = _VERSION_PATTERN.match(version)
+    if match is None:
+        return (-1, (), (0, 0), -1, 0, version)
+
+    release = tuple(int(part) for part in match["release"].split("."))
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+
+    post = match["post_implicit"] or match["post"]
+    has_post = match["post_implicit"] is not None or match["post"] is not None
+    if match["pre_label"]:
+        pre = (_PRE_RANKS[match["pre_label"].lower()], int(match["pre"] or 0))
+    elif match["dev"] is not None and not has_post:
+        pre = (-1, 0)  # 1.0.dev1 comes before 1.0a1
+    else:
+        pre = (_FINAL_RANK, 0)
+    dev = int(match["dev"] or 0) if match["dev"] is not None else sys.maxsize
+    return (int(match["epoch"] or 0), release, pre, int(post or 0) if has_post else -1, dev, "")
+
+
+def select_pruned(
+    index: dict[str, list[Artifact]], policy: RetentionPolicy, now: float | None = None
+) -> list[Artifact]:
+    """Return the artifacts that no rule of the policy keeps, sorted by path."""
+    now = time.time() if now is None else now
+    cutoff = None if policy.max_age_days is None else now - policy.max_age_days * SECONDS_PER_DAY
+
+    pruned: list[Artifact] = []
+    for artifacts in index.values():
+        newest: set[VersionKey] = set()
+        if policy.keep is not None:
+            versions = sorted({version_key(artifact.version) for artifact in artifacts}, reverse=True)
+            newest = set(versions[: policy.keep])
+        pruned.extend(artifact for artifact in artifacts if not _is_kept(artifact, policy, newest, cutoff))
+    return sorted(pruned, key=lambda artifact: artifact.path)
+
+
+def delete_artifacts(artifacts: Iterable[Artifact], jobs: int | None = None) -> DeletionSummary:
+    """Delete the artifacts in a bounded thread pool; see `python_build_utils.deletion.delete_files`."""
+    return delete_files((artifact.path for artifact in artifacts), jobs=jobs)
+
+
+def _is_kept(artifact: Artifact, policy: RetentionPolicy, newest: set[VersionKey], cutoff: float | None) -> bool:
+    """Return True if any retention rule keeps the artifact."""
+    if version_key(artifact.version) in newest:
+        return True
+    if cutoff is not None and artifact.mtime >= cutoff:
+        return True
+    return any(fnmatch.fnmatch(tag, pattern) for tag in artifact.tags for pattern in policy.keep_tags)
+
+
+def _get_report(pruned: list[Artifact], index: dict[str, list[Artifact]]) -> str:
+    """Return the dry-run report: the artifacts that would be deleted and the space freed."""
+    lines = [f"{'Artifact':<70}{'Version':<14}{'MB':>9}", "-" * 93]
+    lines.extend(f"{artifact.path.name:<70}{artifact.version:<14}{artifact.size / 1e6:>9.1f}" for artifact in pruned)
+    lines.append("-" * 93)
+    lines.append(f"Would delete {_describe(pruned, index)}")
+    return "\n".join(lines)
+
+
+def _get_summary(summary: DeletionSummary, pruned: list[Artifact], index: dict[str, list[Artifact]]) -> str:
+    """Return the summary line after deleting, with the bytes actually freed."""
+    total = sum(len(package) for package in index.values())
+    packages = len({artifact.name for artifact in pruned})
+    message = (
+        f"Deleted {summary.removed} of {total} artifact(s) from {packages} package(s), "
+        f"{summary.freed / 1e6:.1f} MB freed, {total - summary.removed} kept"
+    )
+    return f"{message}, {summary.failed} failed" if summary.failed else message
+
+
+def _describe(artifacts: list[Artifact], index: dict[str, list[Artifact]]) -> str:
+    """Describe how many files of how many packages, and how many bytes, are affected."""
+    total = sum(len(package) for package in index.values())
+    packages = len({artifact.name for artifact in artifacts})
+    freed = sum(artifact.size for artifact in artifacts)
+    return (
+        f"{len(artifacts)} of {total} artifact(s) from {packages} package(s), "
+        f"{freed / 1e6:.1f} MB freed, {total - len(artifacts)} kept"
+    )
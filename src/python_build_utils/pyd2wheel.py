@@ -1,21 +1,113 @@
-"""Convert compiled .pyd files into valid Python wheel (.whl) files."""
+"""Convert compiled .pyd and .so extension modules into valid Python wheel (.whl) files."""
 
-import hashlib
 import logging
+import os
 import re
 import shutil
+import sys
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, NamedTuple, TypeVar
 
 import click
 
+from .cli_options import collect_files, jobs_option
+from .constants import EXIT_FAILURE, PYD_EXTENSION, SO_EXTENSION, STDOUT_PATH, WHEEL_EXTENSION
 from .exceptions import PydFileFormatError, PydFileSuffixError, VersionNotFoundError
+from .manylinux import LINUX_ARCHITECTURES, manylinux_platform_tag
+from .wheel_cache import cache_key, cached_wheel_path, has_cache_key, restore_from_cache, store_in_cache
+from .wheel_writer import (
+    CHUNK_SIZE,
+    COMPRESSION_METHODS,
+    CompressionPolicy,
+    WheelWriter,
+    get_metadata_content,
+    get_wheel_content,
+    get_wheel_info,
+    open_output,
+    parse_compression_rules,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# CPython's Linux extension suffix, e.g. ``name.cpython-312-x86_64-linux-gnu.so``.
+_SO_NAME_PATTERN = re.compile(
+    r"(?P<name>[^.]+)\.cpython-(?P<version>\d+)(?P<flags>[a-z]*)-(?P<arch>[^-]+)-linux-(?P<libc>[a-z]+)"
+)
 
-@click.command(name="pyd2wheel", help="Create a Python wheel file from a compiled .pyd file.")
-@click.argument("pyd_file", type=click.Path(exists=True, path_type=Path))
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def compression_options(func: F) -> F:
+    """Add the --compression, --compresslevel and --compression-rule options to a command."""
+    func = click.option(
+        "--compression-rule",
+        "compression_rules",
+        multiple=True,
+        metavar="SUFFIX=METHOD",
+        help="Per-suffix compression override, e.g. '.pyd=stored'. Can be given multiple times.",
+    )(func)
+    func = click.option(
+        "--compresslevel",
+        type=click.IntRange(0, 9),
+        default=None,
+        help="Compression level (deflate: 0-9, bzip2: 1-9). Defaults to the method's default level.",
+    )(func)
+    return click.option(
+        "--compression",
+        type=click.Choice(list(COMPRESSION_METHODS), case_sensitive=False),
+        default="deflate",
+        show_default=True,
+        help="Default zip compression method for the wheel members.",
+    )(func)
+
+
+def get_compression_policy(
+    compression: str, compresslevel: int | None, compression_rules: Iterable[str]
+) -> CompressionPolicy:
+    """Build a compression policy from the values of the compression options."""
+    try:
+        rules = parse_compression_rules(compression_rules)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--compression-rule") from e
+    return CompressionPolicy(COMPRESSION_METHODS[compression.lower()], compresslevel, rules)
+
+
+class WheelOptions(NamedTuple):
+    """Settings shared by every conversion in a pyd2wheel run."""
+
+    package_version: str | None = None
+    abi_tag: str | None = None
+    out_dir: Path | None = None
+    compression: CompressionPolicy | None = None
+    use_cache: bool = False
+    cache_dir: Path | None = None  # setting a cache directory implies use_cache
+    output: Path | str | None = None  # directory, .whl file or "-" for stdout; overrides out_dir
+
+
+class ConversionResult(NamedTuple):
+    """Outcome of converting a single .pyd file in a batch."""
+
+    pyd_file: Path
+    wheel_path: Path | None
+    seconds: float
+    error: str | None = None
+    cache_hit: bool | None = None
+
+
+@click.command(
+    name="pyd2wheel",
+    help=(
+        "Create Python wheel files from compiled .pyd or .so extension modules.\n\n"
+        "PYD_FILES may be files, directories (all *.pyd and *.so inside) or glob patterns. "
+        "Linux .so modules get a manylinux tag based on the glibc version they require. "
+        "Multiple files are converted concurrently in a process pool."
+    ),
+)
+@click.argument("pyd_files", nargs=-1, required=True)
 @click.option(
     "--package-version",
     help="Version of the package. If not provided, the version is extracted from the file name.",
@@ -23,61 +115,275 @@ logger = logging.getLogger(__name__)
 )
 @click.option(
     "--abi-tag",
-    help="ABI tag for the wheel. Defaults to 'none'.",
+    help="ABI tag for the wheel. Defaults to 'none', or the CPython ABI of a .so module.",
     default=None,
 )
-def pyd2wheel(
-    pyd_file: Path,
+@click.option(
+    "--out-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory to write the wheels to. Defaults to the directory of each .pyd file.",
+)
+@click.option(
+    "--output",
+    "-o",
+    default=None,
+    metavar="PATH",
+    help=(
+        "Where to write the wheel: a directory, a .whl file path, or '-' to stream it to stdout. "
+        "A file path or '-' accepts a single input file."
+    ),
+)
+@jobs_option("Number of worker processes. Defaults to the number of CPUs.")
+@compression_options
+@click.option(
+    "--cache",
+    "use_cache",
+    is_flag=True,
+    default=False,
+    help="Skip the build when an identical wheel already exists in the output directory.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    envvar="PYTHON_BUILD_UTILS_CACHE_DIR",
+    default=None,
+    help="Local wheel cache to reuse (hard-link) wheels from and store new wheels in. Implies --cache.",
+)
+def pyd2wheel(  # noqa: PLR0913, PLR0917
+    pyd_files: tuple[str, ...],
     package_version: str | None = None,
     abi_tag: str | None = None,
-) -> Path | None:
-    """CLI entrypoint to convert a .pyd file into a Python wheel."""
-    logger.info("Converting %s to wheel...", pyd_file)
-    return convert_pyd_to_wheel(pyd_file, package_version, abi_tag)
-
-
-def convert_pyd_to_wheel(
+    out_dir: Path | None = None,
+    output: str | None = None,
+    jobs: int | None = None,
+    compression: str = "deflate",
+    compresslevel: int | None = None,
+    compression_rules: tuple[str, ...] = (),
+    *,
+    use_cache: bool = False,
+    cache_dir: Path | None = None,
+) -> list[ConversionResult]:
+    """CLI entrypoint to convert one or more .pyd/.so files into Python wheels."""
+    policy = get_compression_policy(compression, compresslevel, compression_rules)
+    files = collect_pyd_files(pyd_files)
+
+    if not files:
+        logger.error("No .pyd or .so files found for: %s", ", ".join(pyd_files))
+        sys.exit(EXIT_FAILURE)
+
+    to_stdout = output == STDOUT_PATH
+    if output is not None:
+        _check_output(output, out_dir, len(files))
+
+    options = WheelOptions(package_version, abi_tag, out_dir, policy, use_cache, cache_dir, output)
+    results = convert_pyd_files(files, options, jobs=jobs)
+    click.echo(_get_summary(results), err=to_stdout)
+
+    if any(result.error for result in results):
+        sys.exit(EXIT_FAILURE)
+    return results
+
+
+def _check_output(output: str, out_dir: Path | None, file_count: int) -> None:
+    """Reject --output values that cannot hold the requested conversions."""
+    message = None
+    is_file = output == STDOUT_PATH or (output.endswith(WHEEL_EXTENSION) and not Path(output).is_dir())
+    if out_dir is not None:
+        message = "cannot be combined with --out-dir"
+    elif output == STDOUT_PATH and sys.stdout.isatty():
+        message = "refusing to write a wheel to a terminal"
+    elif is_file and file_count > 1:
+        message = f"'{output}' holds one wheel, but {file_count} files were given"
+    if message:
+        raise click.BadParameter(message, param_hint="--output")
+
+
+def collect_pyd_files(sources: Iterable[str]) -> list[Path]:
+    """Expand files, directories and glob patterns into a list of unique .pyd/.so paths."""
+    return collect_files(sources, {PYD_EXTENSION, SO_EXTENSION})
+
+
+def convert_pyd_files(
+    pyd_files: list[Path],
+    options: WheelOptions | None = None,
+    *,
+    jobs: int | None = None,
+) -> list[ConversionResult]:
+    """Convert many .pyd files into wheels, concurrently when there is more than one.
+
+    A failing file is reported in its result and never aborts the rest of the batch.
+    Results are returned in the order of ``pyd_files``.
+    """
+    options = options or WheelOptions()
+    if options.out_dir is not None:
+        options.out_dir.mkdir(parents=True, exist_ok=True)
+
+    if len(pyd_files) == 1 or jobs == 1:
+        return [_convert_one(pyd_file, options) for pyd_file in pyd_files]
+
+    workers = min(jobs or os.cpu_count() or 1, len(pyd_files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_convert_one, pyd_file, options) for pyd_file in pyd_files]
+        return [future.result() for future in futures]
+
+
+def convert_pyd_to_wheel(  # noqa: PLR0913
     pyd_file: Path,
     package_version: str | None = None,
     abi_tag: str | None = None,
+    out_dir: Path | None = None,
+    compression: CompressionPolicy | None = None,
+    *,
+    output: Path | str | None = None,
 ) -> Path | None:
-    """Convert a .pyd file into a valid Python wheel."""
+    """Convert a .pyd file into a valid Python wheel.
+
+    The wheel is written to ``output`` when given: a directory, a ``.whl`` file path or
+    ``-`` to stream it to stdout. Otherwise it goes to ``out_dir``, or next to the input.
+    """
+    options = WheelOptions(package_version, abi_tag, out_dir, compression, output=output)
     try:
-        name, version_from_filename, py_tag, platform = _extract_pyd_file_info(pyd_file)
+        return _build_wheel(pyd_file, options)[0]
     except (PydFileFormatError, PydFileSuffixError):
         logger.exception("Error extracting metadata")
-        return None
-
-    try:
-        package_version = _get_package_version(package_version, version_from_filename)
     except VersionNotFoundError:
         logger.exception("Version extraction failed")
-        return None
+    return None
 
-    abi_tag = abi_tag or "none"
 
+def _convert_one(pyd_file: Path, options: WheelOptions) -> ConversionResult:
+    """Convert a single file for a batch, capturing any error instead of raising it.
+
+    Unexpected errors are logged with their traceback, but still only fail this file.
+    """
+    start = time.perf_counter()
+    try:
+        wheel_path, cache_hit = _build_wheel(pyd_file, options)
+    except (PydFileFormatError, PydFileSuffixError, VersionNotFoundError, OSError) as e:
+        logger.error("❌ Failed to convert %s: %s", pyd_file, e)  # noqa: TRY400
+        return ConversionResult(pyd_file, None, time.perf_counter() - start, str(e))
+    except Exception as e:
+        logger.exception("❌ Unexpected error converting %s", pyd_file)
+        return ConversionResult(pyd_file, None, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+    return ConversionResult(pyd_file, wheel_path, time.perf_counter() - start, cache_hit=cache_hit)
+
+
+def resolve_output(output: Path | str | None, wheel_name: str, default_dir: Path) -> Path:
+    """Return the path a wheel is written to; ``Path("-")`` stands for stdout.
+
+    ``output`` may be a directory, a path ending in ``.whl`` or ``-``. Without it the wheel
+    goes into ``default_dir`` under its standard name.
+    """
+    if output is None:
+        return default_dir / wheel_name
+    path = Path(output)
+    if str(output) == STDOUT_PATH or (path.suffix == WHEEL_EXTENSION and not path.is_dir()):
+        return path
+    return path / wheel_name
+
+
+def _build_wheel(pyd_file: Path, options: WheelOptions) -> tuple[Path, bool | None]:
+    """Build the wheel for a .pyd/.so file, raising on invalid input.
+
+    Returns the wheel path (``Path("-")`` for stdout) and whether it came from the cache
+    (None if the cache is disabled).
+    """
+    so_info = _extract_so_file_info(pyd_file)
+    if so_info:
+        name, py_tag, default_abi_tag, platform = so_info
+        version_from_filename = None
+    else:
+        name, version_from_filename, py_tag, platform = _extract_pyd_file_info(pyd_file)
+        default_abi_tag = "none"
+
+    if pyd_file.suffix == SO_EXTENSION and platform.startswith("linux_"):
+        platform = manylinux_platform_tag(pyd_file, platform.removeprefix("linux_"))
+
+    package_version = _get_package_version(options.package_version, version_from_filename)
+    abi_tag = options.abi_tag or default_abi_tag
+
+    logger.info("Converting %s to wheel...", pyd_file)
     logger.info("=" * 80)
-    logger.info("Wheel Metadata:\n%s", _get_wheel_info(name, package_version, py_tag, platform, abi_tag))
+    logger.info("Wheel Metadata:\n%s", get_wheel_info(name, package_version, py_tag, platform, abi_tag))
     logger.info("=" * 80)
 
     wheel_name = f"{name}-{package_version}-{py_tag}-{abi_tag}-{platform}.whl"
-    temp_root = create_temp_directory(pyd_file)
-    dist_info = create_dist_info_directory(temp_root, name, package_version)
-
-    _create_metadata_file(dist_info, name, package_version)
-    _create_wheel_file(dist_info, py_tag, abi_tag, platform)
-    _create_record_file(temp_root, dist_info)
+    wheel_path = resolve_output(
+        options.output if options.output is not None else options.out_dir, wheel_name, pyd_file.parent
+    )
+    to_stdout = str(wheel_path) == STDOUT_PATH
+    if not to_stdout:
+        wheel_path.parent.mkdir(parents=True, exist_ok=True)
+
+    use_cache = options.use_cache or options.cache_dir is not None
+    key = ""
+    if use_cache:
+        key = cache_key(pyd_file, pyd_file.name, wheel_name, options.compression)
+        if not to_stdout and has_cache_key(wheel_path, key):
+            logger.info("♻️ Up to date: %s", wheel_path)
+            return wheel_path, True
+        if options.cache_dir is not None and _restore_from_cache(options.cache_dir, key, wheel_name, wheel_path):
+            logger.info("♻️ Restored from cache: %s", wheel_path)
+            return wheel_path, True
+
+    # A wheel streamed to stdout with a cache directory is built once, in the cache, and streamed from there.
+    build_path = wheel_path
+    if to_stdout and options.cache_dir is not None:
+        build_path = cached_wheel_path(options.cache_dir, key, wheel_name)
+        build_path.parent.mkdir(parents=True, exist_ok=True)
+
+    dist_info = f"{name}-{package_version}.dist-info"
+    with open_output(build_path) as f, WheelWriter(f, dist_info, options.compression, comment=key) as writer:
+        writer.write_file(pyd_file.name, pyd_file)
+        writer.write_dist_info("METADATA", get_metadata_content(name, package_version))
+        writer.write_dist_info("WHEEL", get_wheel_content(py_tag, abi_tag, platform))
+
+    if options.cache_dir is not None:
+        if build_path == wheel_path:
+            store_in_cache(options.cache_dir, key, wheel_path)
+        else:
+            _copy_to_stdout(build_path)
 
-    wheel_path = _create_wheel_archive(pyd_file, wheel_name, temp_root)
     logger.info("✅ Created wheel file: %s", wheel_path)
+    return wheel_path, (False if use_cache else None)
+
+
+def _restore_from_cache(cache_dir: Path, key: str, wheel_name: str, wheel_path: Path) -> bool:
+    """Publish a cached wheel at ``wheel_path`` or stream it to stdout; return False on a miss."""
+    if str(wheel_path) != STDOUT_PATH:
+        return restore_from_cache(cache_dir, key, wheel_path)
+    cached = cached_wheel_path(cache_dir, key, wheel_name)
+    if not has_cache_key(cached, key):
+        return False
+    _copy_to_stdout(cached)
+    return True
+
+
+def _copy_to_stdout(path: Path) -> None:
+    """Stream a file to stdout."""
+    with path.open("rb") as src:
+        shutil.copyfileobj(src, sys.stdout.buffer, CHUNK_SIZE)
+    sys.stdout.buffer.flush()
 
-    shutil.rmtree(temp_root)
-    return wheel_path
+
+def _extract_so_file_info(so_file: Path) -> tuple[str, str, str, str] | None:
+    """Extract name, python tag, ABI tag and platform from a CPython Linux extension filename.
+
+    Returns None if the file does not use the ``name.cpython-XY-arch-linux-libc.so`` form.
+    """
+    match = _SO_NAME_PATTERN.fullmatch(so_file.stem) if so_file.suffix == SO_EXTENSION else None
+    if match is None:
+        return None
+
+    py_tag = f"cp{match['version']}"
+    arch = LINUX_ARCHITECTURES.get(match["arch"], match["arch"])
+    return match["name"], py_tag, f"{py_tag}{match['flags']}", f"linux_{arch}"
 
 
 def _extract_pyd_file_info(pyd_file: Path) -> tuple[str, str | None, str, str]:
-    """Extract metadata from .pyd filename."""
-    if pyd_file.suffix != ".pyd":
+    """Extract metadata from .pyd (or .so) filename."""
+    if pyd_file.suffix not in {PYD_EXTENSION, SO_EXTENSION}:
         raise PydFileSuffixError(pyd_file.name)
 
     stem = pyd_file.stem
@@ -102,84 +408,24 @@ def _get_package_version(version: str | None, fallback: str | None) -> str:
     raise VersionNotFoundError
 
 
-def _get_wheel_info(name: str, version: str, py_tag: str, platform: str, abi_tag: str) -> str:
-    """Return formatted wheel metadata."""
+def _get_summary(results: list[ConversionResult]) -> str:
+    """Return a table summarising the outcome of a batch conversion."""
     lines = [
-        f"{'Field':<25}Value",
-        "-" * 80,
-        f"{'Name:':<25}{name}",
-        f"{'Version:':<25}{version}",
-        f"{'Python Version:':<25}{py_tag}",
-        f"{'Platform:':<25}{platform}",
-        f"{'ABI Tag:':<25}{abi_tag}",
-        "-" * 80,
+        f"{'File':<50}{'Status':<8}{'Seconds':>9}  Wheel / Error",
+        "-" * 100,
     ]
+    for result in results:
+        status = "FAILED" if result.error else "CACHED" if result.cache_hit else "OK"
+        detail = result.error or (result.wheel_path.name if result.wheel_path else "")
+        lines.append(f"{result.pyd_file.name:<50}{status:<8}{result.seconds:>9.3f}  {detail}")
+
+    failed = sum(1 for result in results if result.error)
+    lines.append("-" * 100)
+    cumulative = sum(result.seconds for result in results)
+    lines.append(f"{len(results) - failed} succeeded, {failed} failed, {cumulative:.3f}s cumulative conversion time")
+
+    if any(result.cache_hit is not None for result in results):
+        hits = sum(1 for result in results if result.cache_hit)
+        misses = sum(1 for result in results if result.cache_hit is False)
+        lines.append(f"Cache: {hits} hits, {misses} misses")
     return "\n".join(lines)
-
-
-def create_temp_directory(pyd_file: Path) -> Path:
-    """Create temp directory and copy the .pyd file there."""
-    temp = pyd_file.parent / "wheel_temp"
-    temp.mkdir(exist_ok=True)
-    shutil.copy(pyd_file, temp / pyd_file.name)
-    return temp
-
-
-def create_dist_info_directory(root: Path, name: str, version: str) -> Path:
-    """Create .dist-info directory under temp root."""
-    dist_info = root / f"{name}-{version}.dist-info"
-    dist_info.mkdir(exist_ok=True)
-    return dist_info
-
-
-def _create_metadata_file(dist_info: Path, name: str, version: str) -> None:
-    """Write METADATA file."""
-    content = f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
-    dist_info.joinpath("METADATA").write_text(content, encoding="utf-8")
-
-
-def _create_wheel_file(dist_info: Path, py_tag: str, abi_tag: str, platform: str) -> None:
-    """Write WHEEL file."""
-    content = (
-        "Wheel-Version: 1.0\n"
-        "Generator: bdist_wheel 1.0\n"
-        "Root-Is-Purelib: false\n"
-        f"Tag: {py_tag}-{abi_tag}-{platform}\n"
-        "Build: 1"
-    )
-    dist_info.joinpath("WHEEL").write_text(content, encoding="utf-8")
-
-
-def _create_record_file(root: Path, dist_info: Path) -> None:
-    """Write RECORD file listing all files in the wheel."""
-    lines: list[str] = []
-    for file in root.rglob("*"):
-        if file.is_file():
-            sha256 = hashlib.sha256()
-            with file.open("rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256.update(chunk)
-            digest = sha256.hexdigest()
-            size = file.stat().st_size
-            rel_path = file.relative_to(root).as_posix()
-            lines.append(f"{rel_path},sha256={digest},{size}")
-    rel_record = dist_info.relative_to(root).joinpath("RECORD").as_posix()
-    lines.append(f"{rel_record},,")
-    dist_info.joinpath("RECORD").write_text("\n".join(lines), encoding="utf-8")
-
-
-def _create_wheel_archive(pyd_file: Path, wheel_name: str, root: Path) -> Path:
-    """Zip temp directory into final .whl file."""
-    wheel_path = pyd_file.parent / wheel_name
-    zip_path = wheel_path.with_suffix(".zip")
-
-    if zip_path.exists():
-        zip_path.unlink()
-
-    created = shutil.make_archive(str(wheel_path), "zip", root)
-
-    if wheel_path.exists():
-        wheel_path.unlink()
-
-    Path(created).rename(wheel_path)
-    return wheel_path
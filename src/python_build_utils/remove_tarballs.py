@@ -1,10 +1,17 @@
-"""Remove .tar.gz source distribution files from a build directory."""
+"""Remove .tar.gz source distribution files from one or many build directories."""
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 
+from .cli_options import jobs_option
+from .constants import SDIST_EXTENSION, STDOUT_PATH
+from .deletion import DELETE_JOBS_HELP, delete_files, dry_run_option, write_dry_run_manifest
+from .dist_dirs import dist_glob_options, resolve_dist_dirs
+
 
 logger = logging.getLogger(__name__)
 
@@ -15,21 +22,43 @@ logger = logging.getLogger(__name__)
     default="dist",
     help="Directory containing the .tar.gz files. Defaults to 'dist'.",
 )
-def remove_tarballs(dist_dir: str) -> None:
-    """Remove all .tar.gz source distribution files from the specified directory."""
-    dist_path = Path(dist_dir.rstrip("/"))
-    tarball_paths = list(dist_path.glob("*.tar.gz"))
+@dist_glob_options
+@jobs_option(DELETE_JOBS_HELP)
+@dry_run_option
+def remove_tarballs(
+    dist_dir: str,
+    root: Path = Path(),
+    dist_glob: str | None = None,
+    jobs: int | None = None,
+    dry_run: str | None = None,
+) -> None:
+    """Remove all .tar.gz source distribution files from the specified directories.
 
-    if not tarball_paths:
-        logger.info("No .tar.gz files found in '%s'.", dist_path)
+    The directories are listed concurrently and the tarballs of all of them are deleted
+    in one bounded thread pool, followed by a summary.
+    """
+    dist_paths = resolve_dist_dirs(dist_dir, root, dist_glob)
+    if not dist_paths:
+        logger.info("No directories matching '%s' found in '%s'.", dist_glob, root)
         return
 
-    for path in tarball_paths:
-        try:
-            path.unlink()
-        except FileNotFoundError:  # noqa: PERF203
-            logger.warning("File not found: %s", path)
-        except OSError:
-            logger.exception("Error removing file: %s", path)
-        else:
-            logger.info("🗑️ Removed: %s", path)
+    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(dist_paths))) as executor:
+        tarball_paths = [path for paths in executor.map(find_tarballs, dist_paths) for path in paths]
+
+    if dry_run is not None:
+        summary = write_dry_run_manifest(tarball_paths, dry_run)
+    else:
+        summary = delete_files(tarball_paths, jobs)
+
+    message = summary.describe("tarball(s)", dry_run=dry_run is not None)
+    if dist_glob is not None:
+        message += f" from {len(dist_paths)} directories"
+    click.echo(message, err=dry_run == STDOUT_PATH)
+
+
+def find_tarballs(dist_path: Path) -> list[Path]:
+    """Return the .tar.gz files in one directory."""
+    tarball_paths = list(dist_path.glob(f"*{SDIST_EXTENSION}"))
+    if not tarball_paths:
+        logger.info("No .tar.gz files found in '%s'.", dist_path)
+    return tarball_paths
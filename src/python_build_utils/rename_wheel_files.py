@@ -1,25 +1,78 @@
-"""Rename wheel files to include platform and Python version tags."""
+"""Rename wheel files to include platform and Python version tags, or fan them out to several tags.
 
+A batch is applied as a transaction: the planned renames are written to a journal in the
+distribution directory first, then applied by a pool of worker threads. If any rename
+fails, the ones that succeeded are undone, so ``dist/`` is never left half renamed. A
+journal left behind by an interrupted run is recovered at the start of the next run.
+"""
+
+import fnmatch
+import json
 import logging
+import os
 import sys
 import sysconfig
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 import click
 
+from .cli_options import jobs_option
+from .constants import EXIT_FAILURE, WHEEL_EXTENSION
+from .dist_dirs import dist_glob_options, resolve_dist_dirs
+from .exceptions import RenameTransactionError
+from .wheel_cache import link_or_copy
+from .wheel_retag import retag_wheel, split_wheel_name
+from .wheel_writer import atomic_write
+
 
 logger = logging.getLogger(__name__)
 
+JOURNAL_NAME = ".rename-wheel-files.journal"
+
+# Journal states: renames may be partly applied and are rolled back, or every target
+# exists and only the retagged sources remain to be removed.
+_PENDING = "pending"
+_COMMITTING = "committing"
+
+
+class RenameEntry(NamedTuple):
+    """One planned step of a batch: ``source`` is renamed, linked or retagged to ``target``."""
+
+    source: Path
+    target: Path
+    action: str = "rename"
+    wheel_tag: str = ""
+
+
+# Actions of a RenameEntry. RENAME and RETAG replace the source, LINK and RETAG_COPY add a variant.
+RENAME = "rename"
+LINK = "link"
+RETAG = "retag"
+RETAG_COPY = "retag-copy"
+
 
 @click.command(
     name="rename-wheel-files",
-    help="Rename wheel files by replacing 'py3-none-any' with a custom wheel tag.",
+    help=(
+        "Rename wheel files by replacing their tag (by default 'py3-none-any') with a custom wheel tag. "
+        "Give --wheel-tag several times to fan each wheel out to several tags."
+    ),
 )
 @click.option(
     "--dist-dir",
     default="dist",
     help="Directory containing the wheel files. Defaults to 'dist'.",
 )
+@dist_glob_options
+@click.option(
+    "--from-tag",
+    default="py3-none-any",
+    show_default=True,
+    help="Tag of the wheels to rename; glob patterns such as 'cp312-cp312-linux_*' are allowed.",
+)
 @click.option(
     "--python-version-tag",
     default=None,
@@ -32,43 +85,282 @@ logger = logging.getLogger(__name__)
 )
 @click.option(
     "--wheel-tag",
-    default=None,
-    help="Full custom wheel tag (e.g. cp310-cp310-win_amd64). Overrides other tag options.",
+    "wheel_tags",
+    multiple=True,
+    help=(
+        "Full custom wheel tag (e.g. cp310-cp310-win_amd64). Overrides other tag options. "
+        "Can be given multiple times: the first tag replaces the wheel, the others are added as variants."
+    ),
+)
+@click.option(
+    "--retag",
+    is_flag=True,
+    default=False,
+    help=(
+        "Also rewrite the Tag lines in the WHEEL file and its RECORD entry. "
+        "Other members are copied without recompression."
+    ),
+)
+@jobs_option("Number of worker threads. Defaults to the number of CPUs.")
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Print the planned renames without changing any file.",
 )
-def rename_wheel_files(
+def rename_wheel_files(  # noqa: PLR0913, PLR0917
     dist_dir: str,
+    root: Path,
+    dist_glob: str | None,
+    from_tag: str,
     python_version_tag: str | None,
     platform_tag: str | None,
-    wheel_tag: str | None,
+    wheel_tags: tuple[str, ...],
+    *,
+    retag: bool = False,
+    jobs: int | None = None,
+    dry_run: bool = False,
 ) -> None:
-    """Rename all wheel files in dist-dir with a custom Python/platform tag."""
-    dist_path = Path(dist_dir.rstrip("/")).resolve()
+    """Rename all wheel files in dist-dir, or in every directory matching dist-glob, with a custom tag.
 
-    if not dist_path.exists() or not dist_path.is_dir():
-        logger.error("Distribution directory '%s' does not exist.", dist_path)
-        return
+    With --dist-glob all matching directories are renamed as one transaction, journaled
+    in --root.
+    """
+    dist_paths = resolve_dist_dirs(dist_dir, root, dist_glob)
+    journal_dir = root.resolve() if dist_glob else dist_paths[0]
 
-    if wheel_tag:
-        new_tag = wheel_tag
-    else:
-        py_tag = python_version_tag or f"cp{sys.version_info.major}{sys.version_info.minor}"
-        plat_tag = platform_tag or sysconfig.get_platform().replace("-", "_")
-        new_tag = f"{py_tag}-{py_tag}-{plat_tag}"
+    if dist_glob is None and not dist_paths[0].is_dir():
+        logger.error("Distribution directory '%s' does not exist.", dist_paths[0])
+        return
+    if not dist_paths:
+        logger.info("No directories matching '%s' found in '%s'.", dist_glob, journal_dir)
+        return
 
-    wheel_files = list(dist_path.glob("*py3-none-any.whl"))
+    if not dry_run and recover_journal(journal_dir):
+        logger.warning("Recovered an interrupted rename in '%s'.", journal_dir)
 
+    wheel_files = find_all_wheels(dist_paths, from_tag, jobs=jobs)
     if not wheel_files:
-        logger.info("No matching wheel files found in '%s'.", dist_path)
+        logger.info("No matching wheel files found in '%s'.", ", ".join(str(path) for path in dist_paths))
         return
 
-    for wheel_file in wheel_files:
-        new_name = wheel_file.name.replace("py3-none-any", new_tag)
-        new_path = wheel_file.with_name(new_name)
+    entries = plan_renames(wheel_files, _get_new_tags(python_version_tag, platform_tag, wheel_tags), retag=retag)
+
+    if dry_run:
+        click.echo(_get_plan(entries))
+        return
+
+    if conflicts := find_conflicts(entries):
+        _report_conflicts(conflicts)
+        sys.exit(EXIT_FAILURE)
+
+    try:
+        apply_renames(entries, journal_dir, jobs=jobs)
+    except RenameTransactionError as e:
+        logger.error("%s", e)  # noqa: TRY400
+        sys.exit(EXIT_FAILURE)
+
+    for entry in entries:
+        logger.info("📝 %s: %s → %s", entry.action.capitalize(), entry.source.name, entry.target.name)
+    if dist_glob is not None:
+        click.echo(_get_summary(entries, dist_paths))
 
+
+def find_all_wheels(dist_paths: list[Path], from_tag: str, *, jobs: int | None = None) -> list[Path]:
+    """Find the wheels tagged ``from_tag`` in several directories, listing them concurrently."""
+    if len(dist_paths) == 1:
+        return find_wheels(dist_paths[0], from_tag)
+    workers = min(jobs or os.cpu_count() or 1, len(dist_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [
+            wheel for wheels in executor.map(lambda path: find_wheels(path, from_tag), dist_paths) for wheel in wheels
+        ]
+
+
+def find_wheels(dist_dir: Path, from_tag: str = "py3-none-any") -> list[Path]:
+    """Return the wheels in ``dist_dir`` whose tag matches the glob pattern ``from_tag``."""
+    wheels = []
+    for wheel_file in sorted(dist_dir.glob(f"*{WHEEL_EXTENSION}")):
         try:
-            wheel_file.rename(new_path)
-            logger.info("📝 Renamed: %s → %s", wheel_file.name, new_path.name)
-        except FileExistsError:
-            logger.warning("❌ File already exists: %s", new_path)
-        except OSError:
-            logger.exception("Unexpected error while renaming: %s", wheel_file)
+            _, tag = split_wheel_name(wheel_file.name)
+        except ValueError:
+            continue
+        if fnmatch.fnmatchcase(tag, from_tag):
+            wheels.append(wheel_file)
+    return wheels
+
+
+def plan_renames(wheel_files: list[Path], new_tags: list[str], *, retag: bool = False) -> list[RenameEntry]:
+    """Plan the steps that give each wheel the tags in ``new_tags``.
+
+    The first tag replaces the wheel; every further tag adds a variant. Without ``retag``
+    a variant is a hard link, since only its name differs. With ``retag`` it is a copy
+    with its own WHEEL and RECORD, sharing the payload with the source where possible.
+    A variant is made before the wheel it is made from is replaced.
+    """
+    entries: list[RenameEntry] = []
+    for wheel_file in wheel_files:
+        prefix, old_tag = split_wheel_name(wheel_file.name)
+        steps = [(tag, RETAG_COPY if retag else LINK) for tag in new_tags[1:]]
+        steps.append((new_tags[0], RETAG if retag else RENAME))
+        entries.extend(
+            RenameEntry(wheel_file, wheel_file.with_name(f"{prefix}-{tag}{WHEEL_EXTENSION}"), action, tag)
+            for tag, action in steps
+            if tag != old_tag
+        )
+    return entries
+
+
+def find_conflicts(entries: list[RenameEntry]) -> list[Path]:
+    """Return the targets that already exist or that more than one step would produce."""
+    seen: set[Path] = set()
+    conflicts = []
+    for entry in entries:
+        if entry.target in seen or entry.target.exists():
+            conflicts.append(entry.target)
+        seen.add(entry.target)
+    return conflicts
+
+
+def apply_renames(entries: list[RenameEntry], dist_dir: Path, *, jobs: int | None = None) -> None:
+    """Apply a batch of renames as one transaction.
+
+    The batch is journaled in ``dist_dir`` before any file is touched. The steps of each
+    source wheel run in order, and different wheels are handled by worker threads. If
+    any step fails, all completed steps are undone and `RenameTransactionError` is
+    raised. Retagged sources are only removed once every target exists.
+    """
+    if not entries:
+        logger.info("Nothing to rename: the matching wheels already have the requested tags.")
+        return
+
+    journal = dist_dir / JOURNAL_NAME
+    _write_journal(journal, entries, _PENDING)
+
+    groups: dict[Path, list[RenameEntry]] = {}
+    for entry in entries:
+        groups.setdefault(entry.source, []).append(entry)
+
+    def apply(group: list[RenameEntry]) -> list[RenameEntry]:
+        done = []
+        for entry in group:
+            try:
+                _apply(entry)
+            except FileExistsError:
+                logger.warning("❌ File already exists: %s", entry.target)
+                break
+            except (OSError, zipfile.BadZipFile, ValueError):
+                logger.exception("Unexpected error while renaming: %s", entry.source)
+                break
+            done.append(entry)
+        return done
+
+    workers = min(jobs or os.cpu_count() or 1, len(groups))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        done = [entry for applied in executor.map(apply, groups.values()) for entry in applied]
+
+    if len(done) != len(entries):
+        _rollback(done)
+        journal.unlink()
+        raise RenameTransactionError(len(entries) - len(done), len(entries))
+
+    if any(entry.action == RETAG for entry in entries):
+        _write_journal(journal, entries, _COMMITTING)
+        _commit(entries)
+    journal.unlink()
+
+
+def recover_journal(dist_dir: Path) -> bool:
+    """Finish or roll back a batch interrupted before its journal was removed.
+
+    Returns True if a journal was found.
+    """
+    journal = dist_dir / JOURNAL_NAME
+    if not journal.exists():
+        return False
+
+    state = json.loads(journal.read_text(encoding="utf-8"))
+    entries = [RenameEntry(Path(source), Path(target), action, tag) for source, target, action, tag in state["entries"]]
+    if state["state"] == _COMMITTING:
+        _commit(entries)
+    else:
+        _rollback(entries)
+    journal.unlink()
+    return True
+
+
+def _apply(entry: RenameEntry) -> None:
+    """Carry out one step of a batch."""
+    if entry.action == RENAME:
+        entry.source.rename(entry.target)
+    elif entry.action == LINK:
+        link_or_copy(entry.source, entry.target)
+    else:
+        retag_wheel(entry.source, entry.wheel_tag, entry.target)
+
+
+def _write_journal(journal: Path, entries: list[RenameEntry], state: str) -> None:
+    """Durably record the batch and its state before acting on it."""
+    content = {
+        "state": state,
+        "entries": [[str(entry.source), str(entry.target), entry.action, entry.wheel_tag] for entry in entries],
+    }
+    with atomic_write(journal) as f:
+        f.write(json.dumps(content, indent=2).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _rollback(entries: list[RenameEntry]) -> None:
+    """Undo steps in reverse order; steps that were never applied are skipped."""
+    for entry in reversed(entries):
+        if entry.action == RENAME:
+            if entry.target.exists() and not entry.source.exists():
+                entry.target.rename(entry.source)
+        elif entry.source.exists():  # never remove the last copy of a wheel
+            entry.target.unlink(missing_ok=True)
+
+
+def _commit(entries: list[RenameEntry]) -> None:
+    """Remove the sources of retagged wheels whose target has been written."""
+    for entry in entries:
+        if entry.action == RETAG and entry.target.exists():
+            entry.source.unlink(missing_ok=True)
+
+
+def _get_plan(entries: list[RenameEntry]) -> str:
+    """Return the planned steps as text, one per line."""
+    lines = [f"{entry.action}: {entry.source.name} → {entry.target.name}" for entry in entries]
+    conflicts = find_conflicts(entries)
+    lines.extend(f"conflict: {target.name} already exists" for target in conflicts)
+    wheels = len({entry.source for entry in entries})
+    lines.append(f"{len(entries)} step(s) for {wheels} wheel(s), {len(conflicts)} conflict(s)")
+    return "\n".join(lines)
+
+
+def _report_conflicts(conflicts: list[Path]) -> None:
+    """Log every target that already exists."""
+    for target in conflicts:
+        logger.warning("❌ File already exists: %s", target)
+
+
+def _get_new_tags(python_version_tag: str | None, platform_tag: str | None, wheel_tags: tuple[str, ...]) -> list[str]:
+    """Return the requested target tags, defaulting to the running interpreter and platform."""
+    if wheel_tags:
+        return list(dict.fromkeys(wheel_tags))
+    py_tag = python_version_tag or f"cp{sys.version_info.major}{sys.version_info.minor}"
+    plat_tag = platform_tag or sysconfig.get_platform().replace("-", "_")
+    return [f"{py_tag}-{py_tag}-{plat_tag}"]
+
+
+def _get_summary(entries: list[RenameEntry], dist_paths: list[Path]) -> str:
+    """Return the number of wheels renamed per directory and in total."""
+    per_dir: dict[Path, set[Path]] = {path: set() for path in dist_paths}
+    for entry in entries:
+        per_dir.setdefault(entry.source.parent, set()).add(entry.source)
+    lines = [f"{len(wheels):>6}  {path}" for path, wheels in per_dir.items()]
+    total = sum(len(wheels) for wheels in per_dir.values())
+    lines.append(
+        f"{total} wheel(s) in {len(per_dir)} director{'y' if len(per_dir) == 1 else 'ies'}, {len(entries)} step(s)"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,224 @@
+"""Verify that wheel files are internally consistent before they are uploaded."""
+
+import base64
+import csv
+import hashlib
+import io
+import logging
+import os
+import sys
+import time
+import zipfile
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import click
+
+from .cli_options import collect_files, jobs_option
+from .constants import EXIT_FAILURE, WHEEL_EXTENSION
+from .wheel_retag import expand_tag, split_wheel_name
+
+
+logger = logging.getLogger(__name__)
+
+# Members are hashed in large reads: multi-hundred-MB binaries otherwise spend most of
+# their time in per-call overhead of the zip and hash layers.
+READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Hash algorithms the wheel specification forbids in RECORD.
+WEAK_HASH_ALGORITHMS = frozenset({"md5", "sha1"})
+
+# Signature files that are allowed to be missing from RECORD.
+_UNRECORDED_SUFFIXES = (".jws", ".p7s")
+
+
+class VerificationResult(NamedTuple):
+    """Outcome of verifying one wheel file."""
+
+    wheel_path: Path
+    errors: tuple[str, ...]
+    seconds: float
+
+
+@click.command(
+    name="verify-wheels",
+    help=(
+        "Verify that wheel files are internally consistent.\n\n"
+        "Every member is hashed and compared to the sha256 and size in RECORD, and the WHEEL "
+        "'Tag:' lines are compared to the tags in the file name. WHEELS may be files, "
+        "directories (all *.whl inside) or glob patterns. Wheels are verified concurrently "
+        "in a process pool."
+    ),
+)
+@click.argument("wheels", nargs=-1, required=True)
+@jobs_option("Number of worker processes. Defaults to the number of CPUs.")
+def verify_wheels(wheels: tuple[str, ...], jobs: int | None = None) -> list[VerificationResult]:
+    """CLI entrypoint to verify one or more wheel files."""
+    files = collect_wheel_files(wheels)
+
+    if not files:
+        logger.error("No wheel files found for: %s", ", ".join(wheels))
+        sys.exit(EXIT_FAILURE)
+
+    results = verify_wheel_files(files, jobs=jobs)
+    click.echo(_get_summary(results))
+
+    if any(result.errors for result in results):
+        sys.exit(EXIT_FAILURE)
+    return results
+
+
+def collect_wheel_files(sources: Iterable[str]) -> list[Path]:
+    """Expand files, directories and glob patterns into a list of unique wheel paths."""
+    return collect_files(sources, {WHEEL_EXTENSION})
+
+
+def verify_wheel_files(wheel_files: list[Path], *, jobs: int | None = None) -> list[VerificationResult]:
+    """Verify many wheels, concurrently when there is more than one.
+
+    Results are returned in the order of ``wheel_files``.
+    """
+    if len(wheel_files) == 1 or jobs == 1:
+        return [_verify_one(wheel_file) for wheel_file in wheel_files]
+
+    workers = min(jobs or os.cpu_count() or 1, len(wheel_files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_verify_one, wheel_file) for wheel_file in wheel_files]
+        return [future.result() for future in futures]
+
+
+def verify_wheel(wheel_path: Path) -> list[str]:
+    """Return the inconsistencies found in a wheel, or an empty list if it is valid.
+
+    Args:
+    ----
+        wheel_path: Path to the wheel file.
+
+    Returns:
+    -------
+        list[str]: One message per problem found.
+
+    """
+    try:
+        with zipfile.ZipFile(wheel_path) as zf:
+            return _verify_archive(zf, wheel_path.name)
+    except (zipfile.BadZipFile, OSError, NotImplementedError) as e:  # NotImplementedError: unknown compression
+        return [f"cannot read wheel: {e}"]
+    except UnicodeDecodeError as e:
+        return [f"metadata is not valid UTF-8: {e}"]
+    except csv.Error as e:
+        return [f"malformed RECORD: {e}"]
+
+
+def expand_wheel_tags(wheel_name: str) -> set[str]:
+    """Return the tags encoded in a wheel file name, expanding compressed tag sets.
+
+    ``pkg-1.0-py2.py3-none-any.whl`` gives ``{"py2-none-any", "py3-none-any"}``.
+    """
+    try:
+        return set(expand_tag(split_wheel_name(wheel_name)[1]))
+    except ValueError:
+        return set()
+
+
+def _verify_one(wheel_path: Path) -> VerificationResult:
+    """Verify a single wheel for a batch."""
+    start = time.perf_counter()
+    errors = verify_wheel(wheel_path)
+    for error in errors:
+        logger.error("❌ %s: %s", wheel_path.name, error)
+    return VerificationResult(wheel_path, tuple(errors), time.perf_counter() - start)
+
+
+def _verify_archive(zf: zipfile.ZipFile, wheel_name: str) -> list[str]:
+    """Check RECORD and WHEEL of an open wheel archive."""
+    names = set(zf.namelist())
+    dist_infos = {name.split("/", 1)[0] for name in names if name.split("/", 1)[0].endswith(".dist-info")}
+    if len(dist_infos) != 1:
+        return [f"expected exactly one .dist-info directory, found {len(dist_infos)}"]
+    dist_info = dist_infos.pop()
+    record_name = f"{dist_info}/RECORD"
+    wheel_file_name = f"{dist_info}/WHEEL"
+
+    errors = [f"missing {required}" for required in (record_name, wheel_file_name) if required not in names]
+    if errors:
+        return errors
+
+    errors.extend(_check_tags(zf.read(wheel_file_name).decode("utf-8"), wheel_name))
+
+    recorded: set[str] = set()
+    record = io.StringIO(zf.read(record_name).decode("utf-8"))
+    for row in csv.reader(record):
+        if not row:
+            continue
+        arcname, hash_value, size = [*row, "", ""][:3]
+        recorded.add(arcname)
+        if arcname == record_name:
+            continue
+        if arcname not in names:
+            errors.append(f"{arcname}: listed in RECORD but missing from the archive")
+            continue
+        errors.extend(_check_member(zf, arcname, hash_value, size))
+
+    errors.extend(
+        f"{name}: not listed in RECORD"
+        for name in sorted(names - recorded)
+        if not name.endswith("/") and not name.endswith(_UNRECORDED_SUFFIXES)
+    )
+    return errors
+
+
+def _check_tags(wheel_content: str, wheel_name: str) -> list[str]:
+    """Compare the ``Tag:`` lines of the WHEEL file with the tags in the file name."""
+    declared = {line.split(":", 1)[1].strip() for line in wheel_content.splitlines() if line.startswith("Tag:")}
+    expected = expand_wheel_tags(wheel_name)
+    if declared == expected:
+        return []
+    return [f"WHEEL tags {sorted(declared)} do not match file name tags {sorted(expected)}"]
+
+
+def _check_member(zf: zipfile.ZipFile, arcname: str, hash_value: str, size: str) -> list[str]:
+    """Stream one member and compare its hash and size with its RECORD entry."""
+    if not hash_value:
+        return [f"{arcname}: no hash in RECORD"]
+    algorithm, _, expected_digest = hash_value.partition("=")
+    if algorithm in WEAK_HASH_ALGORITHMS or algorithm not in hashlib.algorithms_available:
+        return [f"{arcname}: unsupported hash algorithm '{algorithm}'"]
+
+    digest = hashlib.new(algorithm)
+    actual_size = 0
+    try:
+        with zf.open(arcname) as member:
+            while chunk := member.read(READ_BUFFER_SIZE):
+                digest.update(chunk)
+                actual_size += len(chunk)
+    except (zipfile.BadZipFile, OSError, NotImplementedError, RuntimeError) as e:
+        # CRC mismatches of corrupt members, unsupported compression methods and encrypted members
+        return [f"{arcname}: cannot read member: {e}"]
+
+    errors = []
+    actual_digest = base64.urlsafe_b64encode(digest.digest()).rstrip(b"=").decode("ascii")
+    if actual_digest != expected_digest:
+        errors.append(f"{arcname}: {algorithm} mismatch")
+    if size and size != str(actual_size):
+        errors.append(f"{arcname}: size {actual_size} does not match RECORD size {size}")
+    return errors
+
+
+def _get_summary(results: list[VerificationResult]) -> str:
+    """Return a table summarising the outcome of a batch verification."""
+    lines = [
+        f"{'Wheel':<70}{'Status':<8}{'Seconds':>9}",
+        "-" * 87,
+    ]
+    for result in results:
+        status = "FAILED" if result.errors else "OK"
+        lines.append(f"{result.wheel_path.name:<70}{status:<8}{result.seconds:>9.3f}")
+        lines.extend(f"    {error}" for error in result.errors)
+
+    failed = sum(1 for result in results if result.errors)
+    lines.append("-" * 87)
+    lines.append(f"{len(results) - failed} valid, {failed} invalid")
+    return "\n".join(lines)
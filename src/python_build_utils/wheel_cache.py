@@ -0,0 +1,99 @@
+"""Content-addressed cache that lets pyd2wheel skip rebuilding unchanged wheels.
+
+A cache key covers everything that determines the bytes of a wheel: the hash of the
+input binary, the wheel file name (name, version and tags), the member name, the
+compression policy, the archive timestamp and the builder version. Because builds
+are reproducible, equal keys mean byte-identical wheels.
+
+The key is stored as the zip comment of every wheel built with the cache enabled, so
+an existing wheel in the output directory can be recognised by reading only the end
+of its central directory.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+
+from . import __version__
+from .hashing import hash_file
+from .wheel_writer import CHUNK_SIZE, CompressionPolicy, atomic_write, source_date_time
+
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(payload: Path, arcname: str, wheel_name: str, compression: CompressionPolicy | None) -> str:
+    """Return the cache key for building ``wheel_name`` from ``payload``."""
+    fields = [
+        f"builder={__version__}",
+        f"payload={hash_file(payload).digest.hex()}",
+        f"arcname={arcname}",
+        f"wheel={wheel_name}",
+        f"compression={tuple(compression or CompressionPolicy())}",
+        f"date_time={source_date_time()}",
+    ]
+    return hashlib.sha256("\n".join(fields).encode("utf-8")).hexdigest()
+
+
+def has_cache_key(wheel_path: Path, key: str) -> bool:
+    """Return True if ``wheel_path`` exists and was built for ``key``."""
+    if not wheel_path.is_file():
+        return False
+    try:
+        with zipfile.ZipFile(wheel_path) as zf:
+            return zf.comment == key.encode("ascii")
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def cached_wheel_path(cache_dir: Path, key: str, wheel_name: str) -> Path:
+    """Return the location of a wheel in the local cache directory."""
+    return cache_dir / key[:2] / key / wheel_name
+
+
+def restore_from_cache(cache_dir: Path, key: str, wheel_path: Path) -> bool:
+    """Publish a cached wheel at ``wheel_path``; return False on a cache miss."""
+    cached = cached_wheel_path(cache_dir, key, wheel_path.name)
+    if not has_cache_key(cached, key):
+        return False
+    link_or_copy(cached, wheel_path)
+    return True
+
+
+def store_in_cache(cache_dir: Path, key: str, wheel_path: Path) -> None:
+    """Add a freshly built wheel to the local cache directory."""
+    cached = cached_wheel_path(cache_dir, key, wheel_path.name)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        link_or_copy(wheel_path, cached)
+    except OSError as e:
+        logger.warning("Could not store %s in cache '%s': %s", wheel_path.name, cache_dir, e)
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Atomically place ``src`` at ``dst`` as a hard link, or as a copy if linking is not possible."""
+    try:
+        replace_with_hardlink(src, dst)
+    except OSError:
+        copy_atomically(src, dst)
+
+
+def copy_atomically(src: Path, dst: Path) -> None:
+    """Place an independent copy of ``src`` at ``dst``; readers never see a partial file."""
+    with atomic_write(dst) as f, src.open("rb") as source:
+        shutil.copyfileobj(source, f, CHUNK_SIZE)
+
+
+def replace_with_hardlink(src: Path, dst: Path) -> None:
+    """Atomically place ``src`` at ``dst`` as a hard link, raising OSError if that is not possible."""
+    tmp_path = Path(tempfile.mktemp(prefix=f".{dst.name}.", suffix=".tmp", dir=dst.parent))  # noqa: S306
+    os.link(src, tmp_path)
+    try:
+        tmp_path.replace(dst)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
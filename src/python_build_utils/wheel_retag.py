@@ -0,0 +1,237 @@
+"""Retag a wheel: rewrite the tags in its WHEEL file and RECORD without recompressing the payload.
+
+The members that precede WHEEL and RECORD in the archive, normally the whole payload, are
+cloned from the source file: as a copy-on-write reflink where the filesystem supports it,
+otherwise with an in-kernel copy. Only the tail of the archive is written anew, so making
+several variants of a large wheel costs little more than making one.
+"""
+
+import copy
+import csv
+import hashlib
+import io
+import logging
+import os
+import re
+import zipfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO
+
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+from .constants import WHEEL_EXTENSION
+from .wheel_writer import CHUNK_SIZE, atomic_write, read_raw_member, record_hash, write_raw_member
+
+
+logger = logging.getLogger(__name__)
+
+# Zip64 extra field id; the writer adds a fresh one where a member needs it.
+_ZIP64_EXTRA_ID = 0x0001
+
+# Linux ioctl that makes the destination file share all blocks of the source (btrfs, XFS, ...).
+_FICLONE = 0x40049409
+
+
+def split_wheel_name(wheel_name: str) -> tuple[str, str]:
+    """Split a wheel file name into its ``name-version[-build]`` prefix and its tag.
+
+    ``pkg-1.0-py3-none-any.whl`` gives ``("pkg-1.0", "py3-none-any")``.
+    """
+    parts = wheel_name.removesuffix(WHEEL_EXTENSION).split("-")
+    if len(parts) < 5:  # noqa: PLR2004
+        msg = f"'{wheel_name}' is not a valid wheel file name"
+        raise ValueError(msg)
+    return "-".join(parts[:-3]), "-".join(parts[-3:])
+
+
+def split_wheel_tag(wheel_tag: str) -> tuple[str, str, str]:
+    """Split ``{python tag}-{abi tag}-{platform tag}`` into its three tags.
+
+    Raises ValueError if ``wheel_tag`` does not have three non-empty parts.
+    """
+    parts = wheel_tag.split("-")
+    if len(parts) != 3 or not all(parts):  # noqa: PLR2004
+        msg = f"'{wheel_tag}' is not a wheel tag of the form '{{python tag}}-{{abi tag}}-{{platform tag}}'"
+        raise ValueError(msg)
+    py_tag, abi_tag, platform_tag = parts
+    return py_tag, abi_tag, platform_tag
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name for wheel file names, so that ``My.Pkg`` and ``my-pkg`` become ``my_pkg``."""
+    return re.sub(r"[-_.]+", "_", name).lower()
+
+
+def expand_tag(wheel_tag: str) -> list[str]:
+    """Expand a possibly compressed tag such as ``py2.py3-none-any`` into single tags."""
+    py_tags, abi_tags, platform_tags = split_wheel_tag(wheel_tag)
+    return [
+        f"{py_tag}-{abi_tag}-{platform_tag}"
+        for py_tag in py_tags.split(".")
+        for abi_tag in abi_tags.split(".")
+        for platform_tag in platform_tags.split(".")
+    ]
+
+
+def retag_wheel(wheel_path: Path, wheel_tag: str, out_path: Path | None = None) -> Path:
+    """Write a copy of a wheel with a new tag, in its file name and in its WHEEL file.
+
+    Only WHEEL and RECORD are rewritten. Every other member is kept as raw compressed
+    bytes, without being decompressed or recompressed: the members stored before WHEEL
+    and RECORD are cloned with the file, the few after them are copied one by one. The
+    new wheel is published atomically.
+
+    Args:
+    ----
+        wheel_path: The wheel to retag. It is left unchanged.
+        wheel_tag: The new ``{python tag}-{abi tag}-{platform tag}``.
+        out_path: Where to write the retagged wheel. Defaults to the retagged file name
+            in the directory of ``wheel_path``.
+
+    Returns:
+    -------
+        Path: The path of the retagged wheel.
+
+    """
+    prefix, _ = split_wheel_name(wheel_path.name)
+    target = out_path or wheel_path.with_name(f"{prefix}-{wheel_tag}{WHEEL_EXTENSION}")
+
+    # The source is closed before the result is renamed into place, which may replace it.
+    with atomic_write(target) as f, wheel_path.open("rb") as src, zipfile.ZipFile(src) as source:
+        dist_info = _find_dist_info(source)
+        wheel_name = f"{dist_info}/WHEEL"
+        record_name = f"{dist_info}/RECORD"
+        wheel_content = retag_wheel_content(source.read(wheel_name).decode("utf-8"), wheel_tag).encode("utf-8")
+        record_lines = _read_record(source, record_name)
+
+        members = sorted(source.infolist(), key=lambda zinfo: zinfo.header_offset)
+        prefix_end = min(source.getinfo(wheel_name).header_offset, source.getinfo(record_name).header_offset)
+        clone_prefix(src, f, prefix_end)
+
+        with zipfile.ZipFile(f, "w") as dest:
+            for zinfo in members:
+                if zinfo.filename in {wheel_name, record_name}:
+                    continue
+                if zinfo.header_offset < prefix_end:
+                    _adopt_member(dest, zinfo)
+                else:
+                    write_raw_member(dest, _copy_info(zinfo), read_raw_member(src, zinfo))
+
+            dest.writestr(_copy_info(source.getinfo(wheel_name)), wheel_content)
+            record_lines[wheel_name] = [
+                wheel_name,
+                record_hash(hashlib.sha256(wheel_content).digest()),
+                str(len(wheel_content)),
+            ]
+            record_lines[record_name] = [record_name, "", ""]
+            dest.writestr(_copy_info(source.getinfo(record_name)), _format_record(record_lines.values()))
+
+    logger.info("🏷️ Retagged: %s → %s", wheel_path.name, target.name)
+    return target
+
+
+def clone_prefix(src: BinaryIO, dst: BinaryIO, length: int) -> bool:
+    """Make the empty file ``dst`` hold the first ``length`` bytes of ``src``, positioned at its end.
+
+    The blocks are shared copy-on-write (a reflink) when the filesystem supports it, and
+    copied in the kernel otherwise, falling back to a plain read and write where the
+    kernel copy is not supported. Returns True for a reflink.
+    """
+    dst.flush()
+    cloned = False
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            cloned = True
+        except OSError:
+            pass
+
+    offset = 0
+    if cloned:
+        dst.truncate(length)
+        offset = length
+    elif hasattr(os, "copy_file_range"):
+        try:
+            while offset < length:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), length - offset, offset, offset)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError as e:  # e.g. EXDEV, EINVAL, ENOSYS or EOPNOTSUPP on some filesystems and kernels
+            logger.debug("copy_file_range failed after %d bytes, copying the rest: %s", offset, e)
+
+    if offset < length:
+        src.seek(offset)
+        dst.seek(offset)
+        remaining = length - offset
+        while remaining > 0 and (chunk := src.read(min(CHUNK_SIZE, remaining))):
+            dst.write(chunk)
+            remaining -= len(chunk)
+        dst.flush()
+    dst.seek(length)
+    return cloned
+
+
+def retag_wheel_content(content: str, wheel_tag: str) -> str:
+    """Replace the ``Tag:`` lines of a WHEEL file with the tags of ``wheel_tag``.
+
+    The new lines take the place of the first old ``Tag:`` line; all other lines are kept.
+    """
+    new_tags = [f"Tag: {tag}" for tag in expand_tag(wheel_tag)]
+    lines: list[str] = []
+    for line in content.splitlines():
+        if line.startswith("Tag:"):
+            lines.extend(new_tags)
+            new_tags = []
+        else:
+            lines.append(line)
+    lines.extend(new_tags)  # a WHEEL file without Tag lines
+    return "\n".join(lines) + "\n"
+
+
+def _find_dist_info(source: zipfile.ZipFile) -> str:
+    """Return the name of the single ``.dist-info`` directory that holds WHEEL and RECORD."""
+    dist_infos = {
+        name.split("/", 1)[0]
+        for name in source.namelist()
+        if name.endswith(("/WHEEL", "/RECORD")) and name.split("/", 1)[0].endswith(".dist-info")
+    }
+    if len(dist_infos) != 1:
+        msg = f"Expected one .dist-info directory with WHEEL and RECORD, found {sorted(dist_infos)}"
+        raise zipfile.BadZipFile(msg)
+    return dist_infos.pop()
+
+
+def _read_record(source: zipfile.ZipFile, record_name: str) -> dict[str, list[str]]:
+    """Read RECORD into rows keyed by path, keeping their order."""
+    content = source.read(record_name).decode("utf-8")
+    return {row[0]: row for row in csv.reader(io.StringIO(content)) if row}
+
+
+def _format_record(rows: Iterable[list[str]]) -> str:
+    """Serialise RECORD rows the way wheel tools write them."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _adopt_member(dest: zipfile.ZipFile, zinfo: zipfile.ZipInfo) -> None:
+    """Register a member whose local header and data were cloned at its original offset."""
+    new_info = copy.copy(zinfo)
+    new_info.extra = zipfile._strip_extra(zinfo.extra, (_ZIP64_EXTRA_ID,))  # type: ignore[attr-defined]
+    dest.filelist.append(new_info)
+    dest.NameToInfo[new_info.filename] = new_info
+
+
+def _copy_info(zinfo: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    """Return a header for writing ``zinfo`` into a new archive, keeping its metadata."""
+    new_info = copy.copy(zinfo)
+    new_info.extra = zipfile._strip_extra(zinfo.extra, (_ZIP64_EXTRA_ID,))  # type: ignore[attr-defined]
+    new_info.flag_bits = 0
+    return new_info
@@ -0,0 +1,383 @@
+"""Stream files into a wheel archive, hashing each member while it is written."""
+
+import base64
+import hashlib
+import logging
+import os
+import stat
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, NamedTuple, cast
+
+from .constants import STDOUT_PATH
+
+
+logger = logging.getLogger(__name__)
+
+# Read size used when streaming a payload from disk into the archive.
+CHUNK_SIZE = 1024 * 1024
+
+DateTime = tuple[int, int, int, int, int, int]
+
+# Zip timestamps cannot predate 1980; this is also the timestamp used without SOURCE_DATE_EPOCH.
+ZIP_EPOCH: DateTime = (1980, 1, 1, 0, 0, 0)
+
+COMPRESSION_METHODS: dict[str, int] = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+
+class CompressionPolicy(NamedTuple):
+    """Choose the zip compression for each wheel member.
+
+    ``suffix_rules`` maps file suffixes (e.g. ``.pyd``) to a compression method and
+    takes precedence over the default ``method``. ``level`` is passed to the
+    compressor; it is ignored for ``stored`` and ``lzma``.
+    """
+
+    method: int = zipfile.ZIP_DEFLATED
+    level: int | None = None
+    suffix_rules: tuple[tuple[str, int], ...] = ()
+
+    def method_for(self, arcname: str) -> int:
+        """Return the compression method for a member name."""
+        name = arcname.lower()
+        for suffix, method in self.suffix_rules:
+            if name.endswith(suffix):
+                return method
+        return self.method
+
+
+def parse_compression_rules(rules: Iterable[str]) -> tuple[tuple[str, int], ...]:
+    """Parse ``SUFFIX=METHOD`` rules such as ``.pyd=stored`` into policy suffix rules."""
+    parsed: list[tuple[str, int]] = []
+    for rule in rules:
+        suffix, sep, method = rule.partition("=")
+        suffix = suffix.strip().lower()
+        method = method.strip().lower()
+        if not sep or not suffix or method not in COMPRESSION_METHODS:
+            msg = f"Invalid compression rule '{rule}'. Expected SUFFIX=METHOD with METHOD one of {', '.join(COMPRESSION_METHODS)}."
+            raise ValueError(msg)
+        if not suffix.startswith("."):
+            suffix = f".{suffix}"
+        parsed.append((suffix, COMPRESSION_METHODS[method]))
+    return tuple(parsed)
+
+
+def get_wheel_info(name: str, version: str, py_tag: str, platform: str, abi_tag: str) -> str:
+    """Return formatted wheel metadata."""
+    lines = [
+        f"{'Field':<25}Value",
+        "-" * 80,
+        f"{'Name:':<25}{name}",
+        f"{'Version:':<25}{version}",
+        f"{'Python Version:':<25}{py_tag}",
+        f"{'Platform:':<25}{platform}",
+        f"{'ABI Tag:':<25}{abi_tag}",
+        "-" * 80,
+    ]
+    return "\n".join(lines)
+
+
+def get_metadata_content(name: str, version: str) -> str:
+    """Return the content of the METADATA file."""
+    return f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+
+
+def get_wheel_content(py_tag: str, abi_tag: str, platform: str) -> str:
+    """Return the content of the WHEEL file."""
+    return (
+        "Wheel-Version: 1.0\n"
+        "Generator: bdist_wheel 1.0\n"
+        "Root-Is-Purelib: false\n"
+        f"Tag: {py_tag}-{abi_tag}-{platform}\n"
+        "Build: 1\n"
+    )
+
+
+def record_hash(digest: bytes) -> str:
+    """Format a raw sha256 digest as a RECORD hash (urlsafe base64 without padding)."""
+    encoded = base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+    return f"sha256={encoded}"
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[BinaryIO]:
+    """Write to a unique temporary file next to ``path`` and rename it into place on success.
+
+    Readers never observe a partially written file, and concurrent writers of the same
+    path do not interfere: the last one to finish wins with a complete file. On error the
+    temporary file is removed and ``path`` is left untouched.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        tmp_path.chmod(0o644)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def open_output(target: Path | str) -> Iterator[BinaryIO]:
+    """Open the destination of an archive: standard output for ``-``, otherwise a file.
+
+    Files are written with `atomic_write`. Standard output is written to directly, so a
+    wheel streamed into a pipe is never staged on disk.
+    """
+    if str(target) == STDOUT_PATH:
+        stream = sys.stdout.buffer
+        yield stream
+        stream.flush()
+        return
+    with atomic_write(Path(target)) as f:
+        yield f
+
+
+def source_date_time() -> DateTime:
+    """Return the timestamp for archive members, taken from ``SOURCE_DATE_EPOCH`` when set.
+
+    Without ``SOURCE_DATE_EPOCH`` the fixed zip epoch is used, so builds are
+    reproducible by default. Values before 1980 are clamped to the zip epoch. An
+    invalid value is reported once and replaced by the zip epoch.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if not epoch:
+        return ZIP_EPOCH
+    return _parse_source_date_epoch(epoch)
+
+
+@lru_cache
+def _parse_source_date_epoch(epoch: str) -> DateTime:
+    """Convert a ``SOURCE_DATE_EPOCH`` value to a zip timestamp, warning when it is invalid."""
+    try:
+        year, month, day, hour, minute, second = time.gmtime(int(epoch))[:6]
+    except (ValueError, OverflowError, OSError):
+        logger.warning("Ignoring SOURCE_DATE_EPOCH=%r: expected a Unix timestamp in seconds.", epoch)
+        return ZIP_EPOCH
+    return max(ZIP_EPOCH, (year, month, day, hour, minute, second))
+
+
+def _member_info(arcname: str, date_time: DateTime, file_size: int = 0) -> zipfile.ZipInfo:
+    """Create a zip header that depends only on the member name, timestamp and size.
+
+    Permissions and the creating system are fixed so the header is identical
+    whichever machine or checkout the wheel is built from.
+    """
+    zinfo = zipfile.ZipInfo(arcname, date_time=date_time)
+    zinfo.create_system = 3
+    zinfo.external_attr = (stat.S_IFREG | 0o644) << 16
+    zinfo.file_size = file_size
+    return zinfo
+
+
+class _CompressedMember(NamedTuple):
+    """A member compressed ahead of time, ready to be appended as raw bytes."""
+
+    zinfo: zipfile.ZipInfo
+    data: bytes
+    digest: bytes
+
+
+def _compress_file(zinfo: zipfile.ZipInfo, path: Path, level: int | None) -> _CompressedMember:
+    """Read, hash and compress a file in one pass, filling in the CRC and sizes of ``zinfo``."""
+    compressor = zipfile._get_compressor(zinfo.compress_type, level)  # type: ignore[attr-defined]
+    sha256 = hashlib.sha256()
+    crc = 0
+    size = 0
+    chunks: list[bytes] = []
+    with path.open("rb") as src:
+        while chunk := src.read(CHUNK_SIZE):
+            sha256.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            chunks.append(compressor.compress(chunk) if compressor else chunk)
+    if compressor:
+        chunks.append(compressor.flush())
+
+    data = b"".join(chunks)
+    zinfo.CRC = crc
+    zinfo.file_size = size
+    zinfo.compress_size = len(data)
+    return _CompressedMember(zinfo, data, sha256.digest())
+
+
+def write_raw_member(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, chunks: Iterable[bytes]) -> None:
+    """Append a member whose data is already compressed.
+
+    ``zinfo`` must carry the final CRC, ``file_size`` and ``compress_size``. The zipfile
+    module has no public API for this, so this mirrors what ``ZipFile.open(..., "w")``
+    does when it writes a local header followed by the member data.
+    """
+    # Bit 1 marks the end-of-stream marker that zipfile's LZMA compressor always writes.
+    zinfo.flag_bits = 0x02 if zinfo.compress_type == zipfile.ZIP_LZMA else 0x00
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    fp = cast("BinaryIO", zf.fp)
+    with zf._lock:  # type: ignore[attr-defined]
+        if zf._seekable:  # type: ignore[attr-defined]
+            fp.seek(zf.start_dir)
+        zinfo.header_offset = fp.tell()
+        zf._writecheck(zinfo)  # type: ignore[attr-defined]
+        zf._didModify = True  # type: ignore[attr-defined]
+        fp.write(zinfo.FileHeader(zip64))
+        for chunk in chunks:
+            fp.write(chunk)
+        zf.start_dir = fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def read_raw_member(src: BinaryIO, zinfo: zipfile.ZipInfo) -> Iterator[bytes]:
+    """Yield the still-compressed data of a member of the archive open as ``src``.
+
+    The local header is skipped using its own name and extra field lengths, which may
+    differ from those in the central directory.
+    """
+    src.seek(zinfo.header_offset)
+    header = src.read(zipfile.sizeFileHeader)  # type: ignore[attr-defined]
+    if len(header) != zipfile.sizeFileHeader or header[:4] != zipfile.stringFileHeader:  # type: ignore[attr-defined]
+        msg = f"Bad local file header for {zinfo.filename!r}"
+        raise zipfile.BadZipFile(msg)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    src.seek(name_length + extra_length, os.SEEK_CUR)
+
+    remaining = zinfo.compress_size
+    while remaining > 0:
+        chunk = src.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            msg = f"Truncated data for {zinfo.filename!r}"
+            raise zipfile.BadZipFile(msg)
+        remaining -= len(chunk)
+        yield chunk
+
+
+class WheelWriter:
+    """Write a wheel archive member by member and finish it with a RECORD file.
+
+    Every payload is read exactly once: the bytes are hashed and handed to the zip
+    stream in the same pass, so no temporary copy of the wheel tree is needed.
+    """
+
+    def __init__(
+        self,
+        file: Path | BinaryIO,
+        dist_info: str,
+        compression: CompressionPolicy | None = None,
+        *,
+        comment: str = "",
+    ) -> None:
+        """Open the archive for writing.
+
+        Args:
+        ----
+            file: Destination path or writable binary stream.
+            dist_info: Name of the ``.dist-info`` directory, e.g. ``name-1.0.dist-info``.
+            compression: Compression per member. Defaults to deflate for everything.
+            comment: Optional ASCII archive comment, e.g. a build cache key.
+
+        """
+        # Everything that can fail is done before the archive exists, so no half-open ZipFile is left behind
+        self._date_time = source_date_time()
+        encoded_comment = comment.encode("ascii")
+        self._zip = zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED)
+        self._zip.comment = encoded_comment
+        self._dist_info = dist_info
+        self._compression = compression or CompressionPolicy()
+        self._records: list[str] = []
+
+    def __enter__(self) -> "WheelWriter":  # noqa: PYI034
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Write RECORD and close the archive, or just close it on error."""
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+
+    def write_file(self, arcname: str, path: Path) -> None:
+        """Stream a file from disk into the archive under ``arcname``."""
+        zinfo = self._compressed(_member_info(arcname, self._date_time, path.stat().st_size))
+
+        sha256 = hashlib.sha256()
+        size = 0
+        with path.open("rb") as src, self._zip.open(zinfo, "w") as dst:
+            while chunk := src.read(CHUNK_SIZE):
+                sha256.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+
+        self._add_record(arcname, sha256.digest(), size)
+
+    def write_files(self, members: Iterable[tuple[str, Path]], jobs: int | None = None) -> None:
+        """Hash and compress many files in worker threads and append them in the given order.
+
+        hashlib and the zlib/bz2/lzma compressors release the GIL on large buffers, so
+        members are processed in parallel while the archive itself is written
+        sequentially. At most ``2 * jobs`` compressed members are held in memory.
+        """
+        workers = jobs or os.cpu_count() or 1
+        pending: deque[Future[_CompressedMember]] = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for arcname, path in members:
+                zinfo = self._compressed(_member_info(arcname, self._date_time))
+                pending.append(executor.submit(_compress_file, zinfo, path, self._compression.level))
+                if len(pending) >= 2 * workers:
+                    self._append_compressed(pending.popleft().result())
+            while pending:
+                self._append_compressed(pending.popleft().result())
+
+    def write_bytes(self, arcname: str, data: bytes) -> None:
+        """Write an in-memory member to the archive under ``arcname``."""
+        self._zip.writestr(self._compressed(_member_info(arcname, self._date_time)), data)
+        self._add_record(arcname, hashlib.sha256(data).digest(), len(data))
+
+    def write_dist_info(self, filename: str, content: str) -> None:
+        """Write a text file into the ``.dist-info`` directory."""
+        self.write_bytes(f"{self._dist_info}/{filename}", content.encode("utf-8"))
+
+    def close(self) -> None:
+        """Append the RECORD file and close the archive."""
+        record_name = f"{self._dist_info}/RECORD"
+        lines = [*sorted(self._records), f"{record_name},,"]
+        self._zip.writestr(self._compressed(_member_info(record_name, self._date_time)), "\n".join(lines) + "\n")
+        self._zip.close()
+
+    def _compressed(self, zinfo: zipfile.ZipInfo) -> zipfile.ZipInfo:
+        """Apply the compression policy to a member header."""
+        zinfo.compress_type = self._compression.method_for(zinfo.filename)
+        # Public as ``compress_level`` since Python 3.13; the private name works on all versions.
+        zinfo._compresslevel = self._compression.level  # type: ignore[attr-defined]
+        return zinfo
+
+    def _append_compressed(self, member: _CompressedMember) -> None:
+        """Write a member compressed by a worker thread and record it."""
+        write_raw_member(self._zip, member.zinfo, [member.data])
+        self._add_record(member.zinfo.filename, member.digest, member.zinfo.file_size)
+
+    def _add_record(self, arcname: str, digest: bytes, size: int) -> None:
+        """Remember the RECORD line for a written member."""
+        self._records.append(f"{arcname},{record_hash(digest)},{size}")
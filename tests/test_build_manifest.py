@@ -0,0 +1,84 @@
+"""Tests for `python_build_utils.build_manifest`."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.build_manifest import MANIFEST_NAME, find_manifest_root, is_stale, read_manifest, write_manifest
+
+
+@pytest.fixture
+def built_src(tmp_path: Path) -> Path:
+    """Create a src tree with one compiled module and a manifest of its source."""
+    package = tmp_path / "src" / "pkg"
+    package.mkdir(parents=True)
+    source = package / "mod.py"
+    source.write_text("def f(): pass\n")
+    os.utime(source, ns=(1_000_000_000_000, 1_000_000_000_000))
+    write_manifest(tmp_path / "src", [source])
+    artifact = package / "mod.cpython-312-x86_64-linux-gnu.so"
+    artifact.write_bytes(b"binary")
+    os.utime(artifact, ns=(2_000_000_000_000, 2_000_000_000_000))
+    return tmp_path / "src"
+
+
+def test_write_and_read_manifest(built_src: Path) -> None:
+    """Sources are recorded relative to the src root."""
+    manifest = read_manifest(built_src)
+
+    assert manifest is not None
+    assert list(manifest) == ["pkg/mod.py"]
+    assert manifest["pkg/mod.py"].size == len("def f(): pass\n")
+
+
+def test_read_manifest_missing_or_corrupt(tmp_path: Path) -> None:
+    """A missing or unreadable manifest gives None."""
+    assert read_manifest(tmp_path) is None
+    (tmp_path / MANIFEST_NAME).write_text("{not json")
+    assert read_manifest(tmp_path) is None
+
+
+def test_is_stale_unchanged(built_src: Path) -> None:
+    """An artifact whose source is unchanged is not stale."""
+    artifact = built_src / "pkg" / "mod.cpython-312-x86_64-linux-gnu.so"
+    assert not is_stale(artifact, built_src, read_manifest(built_src) or {})
+
+
+def test_is_stale_content_changed_with_old_mtime(built_src: Path) -> None:
+    """A source with other content is detected even when its mtime is older than the artifact."""
+    source = built_src / "pkg" / "mod.py"
+    source.write_text("def g(): pass\n")
+    os.utime(source, ns=(1_500_000_000_000, 1_500_000_000_000))
+
+    artifact = built_src / "pkg" / "mod.cpython-312-x86_64-linux-gnu.so"
+    assert is_stale(artifact, built_src, read_manifest(built_src) or {})
+
+
+def test_is_stale_newer_source_or_unrecorded(built_src: Path) -> None:
+    """A newer source, or one missing from the manifest, makes the artifact stale."""
+    artifact = built_src / "pkg" / "mod.cpython-312-x86_64-linux-gnu.so"
+    source = built_src / "pkg" / "mod.py"
+    os.utime(source, ns=(3_000_000_000_000, 3_000_000_000_000))
+    assert is_stale(artifact, built_src, read_manifest(built_src) or {})
+
+    os.utime(source, ns=(1_000_000_000_000, 1_000_000_000_000))
+    assert is_stale(artifact, built_src, {})
+
+
+def test_is_stale_without_source(built_src: Path) -> None:
+    """Artifacts without a source next to them are kept."""
+    orphan = built_src / "pkg" / "vendored.pyd"
+    orphan.write_bytes(b"binary")
+    assert not is_stale(orphan, built_src, {})
+
+
+def test_find_manifest_root(built_src: Path) -> None:
+    """The manifest is found from the src root and below it, but not above the project root."""
+    assert find_manifest_root(built_src) == built_src
+    assert find_manifest_root(built_src / "pkg") == built_src
+
+    project = built_src / "vendored"  # a nested project with its own pyproject.toml
+    (project / "pkg").mkdir(parents=True)
+    (project / "pyproject.toml").touch()
+    assert find_manifest_root(project / "pkg") is None
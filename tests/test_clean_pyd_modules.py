@@ -1,12 +1,21 @@
 """Tests for the clean_pyd_modules CLI and helpers."""
 
+import json
 import logging
+import os
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from python_build_utils.clean_pyd_modules import clean_by_extensions
+from python_build_utils.clean_pyd_modules import (
+    CYTHON_HEADER_SIZE,
+    clean_build_artifacts,
+    clean_by_extensions,
+    filter_cython_generated,
+    find_build_artifacts,
+)
+from python_build_utils.deletion import DeletionSummary
 
 
 logger = logging.getLogger("python_build_utils.clean_pyd_modules")
@@ -36,11 +45,12 @@ def test_clean_by_extensions_files_removed(mock_src_path: Path, caplog: pytest.L
     file2.touch()
 
     with caplog.at_level(logging.INFO):
-        clean_by_extensions(mock_src_path, regex=None, extension="*.pyd")
+        summary = clean_by_extensions(mock_src_path, regex=None, extension="*.pyd")
 
     assert not file1.exists()
     assert not file2.exists()
-    assert any("Removing" in r.message for r in caplog.records)
+    assert summary == DeletionSummary(removed=2, freed=0, failed=0)
+    assert any("Removed 2 *.pyd file(s)" in r.message for r in caplog.records)
 
 
 def test_clean_by_extensions_regex_filter(mock_src_path: Path, caplog: pytest.LogCaptureFixture) -> None:
@@ -55,7 +65,7 @@ def test_clean_by_extensions_regex_filter(mock_src_path: Path, caplog: pytest.Lo
 
     assert file1.exists()
     assert not file2.exists()
-    assert any("Removing" in r.message and "test_module.pyd" in r.message for r in caplog.records)
+    assert any("Removed 1 *.pyd file(s)" in r.message for r in caplog.records)
 
 
 def test_clean_by_extensions_no_match_with_regex(mock_src_path: Path, caplog: pytest.LogCaptureFixture) -> None:
@@ -82,3 +92,78 @@ def test_clean_by_extensions_error_handling(mock_src_path: Path, caplog: pytest.
         clean_by_extensions(mock_src_path, regex=None, extension="*.pyd")
 
     assert any("Error removing" in r.message and "Mocked error" in r.message for r in caplog.records)
+
+
+def test_find_build_artifacts_single_walk(mock_src_path: Path) -> None:
+    """All extensions are classified in one walk and the regex only filters the matches."""
+    package = mock_src_path / "pkg" / "sub"
+    package.mkdir(parents=True)
+    for name in ("a.pyd", "b.cpython-312-x86_64-linux-gnu.so", "c.c", "test_d.c", "e.py", "f.h"):
+        (package / name).touch()
+
+    matches, found = find_build_artifacts(mock_src_path, (".pyd", ".so", ".c"), regex="sub/[abc]")
+
+    assert {extension: [path.name for path in paths] for extension, paths in matches.items()} == {
+        ".pyd": ["a.pyd"],
+        ".so": ["b.cpython-312-x86_64-linux-gnu.so"],
+        ".c": ["c.c"],
+    }
+    assert found == {".pyd": 1, ".so": 1, ".c": 2}
+
+
+def test_clean_build_artifacts_one_traversal(mock_src_path: Path) -> None:
+    """Cleaning several extensions walks the tree only once."""
+    (mock_src_path / "module.pyd").touch()
+    (mock_src_path / "module.c").write_text("/* Generated by Cython 3.0.11 */\n")
+
+    with patch("python_build_utils.clean_pyd_modules.os.walk", wraps=os.walk) as walk:
+        clean_build_artifacts(mock_src_path, regex=None, extensions=(".pyd", ".so", ".c"))
+
+    assert walk.call_count == 1
+    assert not list(mock_src_path.iterdir())
+
+
+def test_clean_build_artifacts_keeps_hand_written_c(mock_src_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Only C files with the Cython header or a .pyx/.py source next to them are removed."""
+    generated = mock_src_path / "generated.c"
+    generated.write_text("/* Generated by Cython 3.0.11 */\n#include <Python.h>\n")
+    with_source = mock_src_path / "fast.c"
+    with_source.write_text("int x;\n")
+    (mock_src_path / "fast.pyx").write_text("cdef int x\n")
+    hand_written = mock_src_path / "handwritten.c"
+    hand_written.write_text("/* Hand-written helper */\nint add(int a, int b) { return a + b; }\n")
+
+    with caplog.at_level(logging.INFO):
+        clean_build_artifacts(mock_src_path, regex=None, extensions=(".c",))
+
+    assert not generated.exists()
+    assert not with_source.exists()
+    assert hand_written.exists()
+    assert any("Keeping" in r.message and "handwritten.c" in r.message for r in caplog.records)
+
+
+def test_filter_cython_generated_reads_only_the_prefix(mock_src_path: Path) -> None:
+    """A Cython header beyond the first bytes does not count."""
+    late_header = mock_src_path / "late.c"
+    late_header.write_text(" " * CYTHON_HEADER_SIZE + "Generated by Cython")
+    paths = [late_header] + [mock_src_path / f"gen{i}.c" for i in range(4)]
+    for path in paths[1:]:
+        path.write_text("/* Generated by Cython 3.0.11 */\n")
+
+    assert filter_cython_generated(paths, jobs=2) == paths[1:]
+
+
+def test_clean_build_artifacts_parallel_dry_run(mock_src_path: Path) -> None:
+    """A dry run writes a JSON manifest with sizes and removes nothing."""
+    for i in range(5):
+        (mock_src_path / f"module{i}.pyd").write_bytes(b"x" * 100)
+    manifest_path = mock_src_path.parent / "plan.json"
+
+    summary = clean_build_artifacts(mock_src_path, None, (".pyd",), jobs=4, dry_run=str(manifest_path))
+
+    manifest = json.loads(manifest_path.read_text())
+    assert summary == DeletionSummary(removed=5, freed=500, failed=0)
+    assert manifest["count"] == len(manifest["files"])
+    assert manifest["bytes"] == summary.freed
+    assert {entry["size"] for entry in manifest["files"]} == {100}
+    assert len(list(mock_src_path.iterdir())) == summary.removed
@@ -5,14 +5,19 @@ Covers:
 - File removal behavior
 - Regex filtering
 - Invalid path handling
+- Incremental cleaning with --stale-only
+- Candidates from git with --git
 """
 
 import logging
+import os
+import subprocess
 from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
 
+from python_build_utils.build_manifest import write_manifest
 from python_build_utils.clean_pyd_modules import clean_pyd_modules
 
 
@@ -31,11 +36,11 @@ def test_clean_pyd_modules_no_files(tmp_path: Path, caplog: pytest.LogCaptureFix
 
 
 def test_clean_pyd_modules_removes_files(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
-    """Test that .pyd and .c files are removed as expected."""
+    """Test that .pyd and Cython-generated .c files are removed as expected."""
     file1 = tmp_path / "test1.pyd"
     file2 = tmp_path / "test2.c"
     file1.write_text("dummy")
-    file2.write_text("dummy")
+    file2.write_text("/* Generated by Cython 3.0.11 */")
 
     runner = CliRunner()
     with caplog.at_level("INFO"):
@@ -44,7 +49,7 @@ def test_clean_pyd_modules_removes_files(tmp_path: Path, caplog: pytest.LogCaptu
     assert result.exit_code == 0
     assert not file1.exists()
     assert not file2.exists()
-    assert any("Removing" in r.message for r in caplog.records)
+    assert "Removed 2 file(s)" in result.output
 
 
 def test_clean_pyd_modules_with_regex(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
@@ -59,7 +64,7 @@ def test_clean_pyd_modules_with_regex(tmp_path: Path, caplog: pytest.LogCaptureF
     assert result.exit_code == 0
     assert (tmp_path / "skip_this.pyd").exists()
     assert not (tmp_path / "match_this.pyd").exists()
-    assert any("Removing" in r.message for r in caplog.records)
+    assert "Removed 1 file(s)" in result.output
 
 
 def test_clean_pyd_modules_invalid_path(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
@@ -70,3 +75,81 @@ def test_clean_pyd_modules_invalid_path(tmp_path: Path, caplog: pytest.LogCaptur
         result = runner.invoke(clean_pyd_modules, ["--src-path", str(bad_path)])
     assert result.exit_code == 0
     assert any("does not exist or is not a directory" in r.message for r in caplog.records)
+
+
+def test_clean_pyd_modules_stale_only(tmp_path: Path) -> None:
+    """With --stale-only only artifacts of changed sources are removed."""
+    for name in ("fresh", "changed"):
+        (tmp_path / f"{name}.py").write_text("x = 1\n")
+        os.utime(tmp_path / f"{name}.py", ns=(1_000_000_000_000, 1_000_000_000_000))
+    write_manifest(tmp_path, [tmp_path / "fresh.py", tmp_path / "changed.py"])
+    for name in ("fresh", "changed"):
+        (tmp_path / f"{name}.pyd").write_text("dummy")
+        (tmp_path / f"{name}.c").write_text("/* Generated by Cython 3.0.11 */")
+    (tmp_path / "changed.py").write_text("x = 2\n")
+
+    runner = CliRunner()
+    result = runner.invoke(clean_pyd_modules, ["--src-path", str(tmp_path), "--stale-only"])
+
+    assert result.exit_code == 0
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix in {".pyd", ".c"}) == ["fresh.c", "fresh.pyd"]
+
+
+def test_clean_pyd_modules_stale_only_finds_manifest_in_parent(tmp_path: Path) -> None:
+    """--stale-only on a package directory uses the manifest of the src directory above it."""
+    (tmp_path / "pyproject.toml").touch()
+    package = tmp_path / "src" / "pkg"
+    package.mkdir(parents=True)
+    (package / "mod.py").write_text("x = 1\n")
+    os.utime(package / "mod.py", ns=(1_000_000_000_000, 1_000_000_000_000))
+    write_manifest(tmp_path / "src", [package / "mod.py"])
+    (package / "mod.pyd").write_text("dummy")
+
+    runner = CliRunner()
+    result = runner.invoke(clean_pyd_modules, ["--src-path", str(package), "--stale-only"])
+
+    assert result.exit_code == 0
+    assert (package / "mod.pyd").exists()
+
+
+def test_clean_pyd_modules_dry_run_to_stdout(tmp_path: Path) -> None:
+    """--dry-run without a path prints the JSON manifest and keeps the files."""
+    (tmp_path / "module.pyd").write_bytes(b"x" * 10)
+
+    runner = CliRunner()
+    result = runner.invoke(clean_pyd_modules, ["--src-path", str(tmp_path), "--dry-run", "-j", "2"])
+
+    assert result.exit_code == 0
+    assert (tmp_path / "module.pyd").exists()
+    assert '"bytes": 10' in result.output
+
+
+def test_clean_pyd_modules_git_mode(tmp_path: Path) -> None:
+    """With --git only untracked, ignored files are candidates; tracked and unignored files are kept."""
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)  # noqa: S607
+    (tmp_path / ".gitignore").write_text("*.pyd\n*.c\n")
+    package = tmp_path / "pkg"
+    package.mkdir()
+    for name in ("ignored.pyd", "tracked.pyd", "ignored.c"):
+        (package / name).write_text("/* Generated by Cython 3.0.11 */")
+    (package / "untracked.so").write_text("dummy")  # untracked but not ignored
+    subprocess.run(["git", "add", "-f", "pkg/tracked.pyd"], cwd=tmp_path, check=True)  # noqa: S607
+
+    runner = CliRunner()
+    result = runner.invoke(clean_pyd_modules, ["--src-path", str(tmp_path), "--git"])
+
+    assert result.exit_code == 0
+    assert sorted(p.name for p in package.iterdir()) == ["tracked.pyd", "untracked.so"]
+
+
+def test_clean_pyd_modules_git_outside_work_tree(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """--git outside a git work tree logs an error and removes nothing."""
+    (tmp_path / "module.pyd").write_text("dummy")
+
+    runner = CliRunner()
+    with caplog.at_level("ERROR"):
+        result = runner.invoke(clean_pyd_modules, ["--src-path", str(tmp_path), "--git"])
+
+    assert result.exit_code == 0
+    assert (tmp_path / "module.pyd").exists()
+    assert any("Could not list the untracked files" in r.message for r in caplog.records)
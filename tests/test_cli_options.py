@@ -0,0 +1,36 @@
+"""Tests for the shared command options in `python_build_utils.cli_options`."""
+
+from pathlib import Path
+
+import click
+from click.testing import CliRunner
+
+from python_build_utils.cli_options import collect_files, jobs_option
+
+
+def test_collect_files_by_suffix(tmp_path: Path) -> None:
+    """Directories give the files with the requested suffixes; files and globs are taken as given."""
+    wheel = tmp_path / "a-1.0-py3-none-any.whl"
+    sdist = tmp_path / "a-1.0.tar.gz"
+    wheel.touch()
+    sdist.touch()
+    missing = tmp_path / "missing.whl"
+
+    files = collect_files([str(tmp_path), str(tmp_path / "*.gz"), str(wheel), str(missing)], {".whl"})
+
+    assert files == [wheel, sdist, missing]
+
+
+def test_jobs_option() -> None:
+    """--jobs/-j takes a positive worker count with the given help text and defaults to None."""
+
+    @click.command()
+    @jobs_option("Number of workers.")
+    def command(jobs: int | None) -> None:
+        click.echo(repr(jobs))
+
+    runner = CliRunner()
+    assert runner.invoke(command, []).output == "None\n"
+    assert runner.invoke(command, ["-j", "3"]).output == "3\n"
+    assert runner.invoke(command, ["--jobs", "0"]).exit_code != 0
+    assert "Number of workers." in runner.invoke(command, ["--help"]).output
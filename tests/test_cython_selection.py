@@ -0,0 +1,143 @@
+"""Tests for choosing the modules to cythonize in `python_build_utils.cython_selection`."""
+
+import logging
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.cython_selection import (
+    SelectionRules,
+    count_code_lines,
+    is_constant_module,
+    load_selection_rules,
+    select_sources,
+)
+
+
+MIN_LINES = 3
+PYPROJECT_MIN_LINES = 4
+
+CODE = "def f(x):\n    y = x * 2\n    return y\n"
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Remove the selection variables of the environment the tests run in."""
+    for name in (
+        "CYTHON_BUILD_INCLUDE",
+        "CYTHON_BUILD_EXCLUDE",
+        "CYTHON_BUILD_MIN_LINES",
+        "CYTHON_BUILD_SKIP_CONSTANTS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def package(tmp_path: Path) -> Path:
+    """Create a package with code, constants, an empty __init__ and test helpers."""
+    package_dir = tmp_path / "src" / "pkg"
+    for name, text in {
+        "__init__.py": "",
+        "core.py": CODE,
+        "config.py": '"""Settings."""\n\nimport os\n\nTIMEOUT: int = 10\nHOME = os.environ.get("HOME")\n',
+        "sub/__init__.py": '"""Subpackage."""\n',
+        "sub/engine.py": CODE,
+        "tests/helpers.py": CODE,
+        "tests/deep/conftest.py": CODE,
+    }.items():
+        path = package_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return package_dir
+
+
+def _selected(package_dir: Path, rules: SelectionRules) -> list[str]:
+    """Return the selected modules relative to the package directory."""
+    sources = sorted(package_dir.rglob("*.py"))
+    return [path.relative_to(package_dir).as_posix() for path in select_sources(sources, package_dir, rules)]
+
+
+def test_default_rules_select_everything(package: Path) -> None:
+    """Without rules every module is compiled, as before."""
+    assert len(_selected(package, SelectionRules())) == len(list(package.rglob("*.py")))
+
+
+def test_include_and_exclude_globs(package: Path) -> None:
+    """Excluded globs win over included ones; a glob without a slash matches the file name anywhere."""
+    rules = SelectionRules(include=("**/*.py",), exclude=("tests/**", "__init__.py"))
+
+    assert _selected(package, rules) == ["config.py", "core.py", "sub/engine.py"]
+    assert _selected(package, SelectionRules(include=("sub/*.py",))) == ["sub/__init__.py", "sub/engine.py"]
+
+
+def test_skip_rules(package: Path) -> None:
+    """Short modules and modules with only constants stay Python."""
+    rules = SelectionRules(exclude=("tests/**",), min_lines=MIN_LINES, skip_constant_modules=True)
+
+    assert _selected(package, rules) == ["core.py", "sub/engine.py"]
+
+
+def test_count_code_lines() -> None:
+    """Blank lines and comments are not counted."""
+    assert count_code_lines("# header\n\nx = 1\n    # indented comment\ny = 2\n") == len(["x = 1", "y = 2"])
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", True),
+        ('"""Doc."""\nfrom os import sep\nA = 1\nB: str = "b"\n', True),
+        ("A = 1\ndef f(): pass\n", False),
+        ("class C: pass\n", False),
+        ("for i in range(3): pass\n", False),
+        ("print('side effect')\n", False),
+        ("def broken(:\n", False),
+    ],
+)
+def test_is_constant_module(text: str, *, expected: bool) -> None:
+    """Only docstrings, imports and assignments make a constant module."""
+    assert is_constant_module(text) is expected
+
+
+def test_load_rules_from_pyproject_and_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """pyproject.toml sets the rules and the environment overrides them."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        '[tool.python-build-utils.cythonize]\nexclude = ["tests/**"]\nmin-lines = 5\nskip-constant-modules = true\n'
+    )
+
+    assert load_selection_rules(pyproject) == SelectionRules(("**/*.py",), ("tests/**",), 5, skip_constant_modules=True)
+
+    monkeypatch.setenv("CYTHON_BUILD_INCLUDE", "core/**, api/*.py")
+    monkeypatch.setenv("CYTHON_BUILD_MIN_LINES", "0")
+    monkeypatch.setenv("CYTHON_BUILD_SKIP_CONSTANTS", "no")
+
+    assert load_selection_rules(pyproject) == SelectionRules(
+        ("core/**", "api/*.py"), ("tests/**",), 0, skip_constant_modules=False
+    )
+
+
+def test_invalid_settings_are_ignored(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Unknown keys and values of the wrong type are logged and the defaults are kept."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[tool.python-build-utils.cythonize]\ninclude = "*.py"\nmin-lines = -1\nfast = true\n')
+
+    with caplog.at_level(logging.WARNING):
+        assert load_selection_rules(pyproject) == SelectionRules()
+    assert "unknown cythonize setting 'fast'" in caplog.text
+    assert "expected a list of globs" in caplog.text
+    assert "min-lines=-1: expected a non-negative integer" in caplog.text
+
+
+def test_invalid_environment_value_is_ignored(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A minimum line count that is not a number keeps the value from pyproject.toml."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(f"[tool.python-build-utils.cythonize]\nmin-lines = {PYPROJECT_MIN_LINES}\n")
+    monkeypatch.setenv("CYTHON_BUILD_MIN_LINES", "few")
+
+    assert load_selection_rules(pyproject).min_lines == PYPROJECT_MIN_LINES
+
+
+def test_missing_pyproject(tmp_path: Path) -> None:
+    """Without pyproject.toml and environment variables the defaults apply."""
+    assert load_selection_rules(tmp_path / "pyproject.toml") == SelectionRules()
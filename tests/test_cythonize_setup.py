@@ -6,8 +6,13 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from setuptools import Distribution, Extension
 
 import python_build_utils.cythonized_setup as mod
+from python_build_utils.extension_cache import cached_extension_path, extension_filename
+
+
+BUILD_JOBS = 6
 
 
 @pytest.fixture(autouse=True)
@@ -55,6 +60,33 @@ def test_cythonized_setup_success(monkeypatch: pytest.MonkeyPatch, tmp_path: Pat
         mock_setup.assert_called_once()
 
 
+def test_build_manifest_written_only_after_successful_setup(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """A failed build leaves no manifest, so stale artifacts are not taken for fresh ones."""
+    os.environ["CYTHON_BUILD"] = "1"
+    src_dir = tmp_path / "src" / "dummy_module"
+    src_dir.mkdir(parents=True)
+    (src_dir / "foo.py").write_text("def bar(): pass")
+    monkeypatch.chdir(tmp_path)
+    manifest = tmp_path / "src" / ".build-manifest.json"
+
+    with (
+        patch("Cython.Build.cythonize", return_value=["dummy_ext"]),
+        patch("Cython.Compiler.Options"),
+        patch("python_build_utils.cythonized_setup.setup", side_effect=SystemExit("error: build failed")),
+        pytest.raises(SystemExit),
+    ):
+        mod.cythonized_setup("dummy_module")
+    assert not manifest.exists()
+
+    with (
+        patch("Cython.Build.cythonize", return_value=["dummy_ext"]),
+        patch("Cython.Compiler.Options"),
+        patch("python_build_utils.cythonized_setup.setup"),
+    ):
+        mod.cythonized_setup("dummy_module")
+    assert manifest.exists()
+
+
 def test_cython_required_but_not_installed(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test that ImportError is raised with clear message when Cython is missing."""
     os.environ["CYTHON_BUILD"] = "1"
@@ -66,3 +98,106 @@ def test_cython_required_but_not_installed(monkeypatch: pytest.MonkeyPatch) -> N
         pytest.raises(ImportError, match="Cython is required"),
     ):
         mod.cythonized_setup("dummy_module")
+
+
+def test_cythonized_setup_parallel_jobs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """CYTHON_BUILD_JOBS sets both the cythonize threads and the parallel build_ext."""
+    os.environ["CYTHON_BUILD"] = "1"
+    os.environ["CYTHON_BUILD_JOBS"] = str(BUILD_JOBS)
+    src_dir = tmp_path / "src" / "dummy_module"
+    src_dir.mkdir(parents=True)
+    (src_dir / "foo.py").write_text("def bar(): pass")
+    monkeypatch.chdir(tmp_path)
+
+    with (
+        patch("Cython.Build.cythonize", return_value=["dummy_ext"]) as mock_cythonize,
+        patch("Cython.Compiler.Options"),
+        patch("python_build_utils.cythonized_setup.setup") as mock_setup,
+    ):
+        mod.cythonized_setup("dummy_module")
+
+    assert mock_cythonize.call_args.kwargs["nthreads"] == BUILD_JOBS
+    assert mock_setup.call_args.kwargs["options"] == {"build_ext": {"parallel": BUILD_JOBS}}
+
+
+@pytest.mark.parametrize(("value", "expected"), [("", 8), ("3", 3), ("0", 8), ("many", 8)])
+def test_build_jobs(monkeypatch: pytest.MonkeyPatch, value: str, expected: int) -> None:
+    """The job count comes from CYTHON_BUILD_JOBS when it is a positive integer, else from the CPU count."""
+    monkeypatch.setenv("CYTHON_BUILD_JOBS", value)
+    monkeypatch.setattr(mod.os, "cpu_count", lambda: 8)
+
+    assert mod.build_jobs() == expected
+
+
+def test_cythonized_setup_restores_cached_modules(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Modules found in the extension cache are not cythonized and are restored by the build_ext command."""
+    os.environ["CYTHON_BUILD"] = "1"
+    os.environ["CYTHON_BUILD_CACHE_DIR"] = str(tmp_path / "cache")
+    src_dir = tmp_path / "src" / "dummy_module"
+    src_dir.mkdir(parents=True)
+    (src_dir / "cached.py").write_text("def bar(): pass")
+    (src_dir / "changed.py").write_text("def baz(): pass")
+    monkeypatch.chdir(tmp_path)
+
+    monkeypatch.setattr(mod, "is_cached", lambda _cache_dir, key, _filename: key == "key-dummy_module.cached")
+    monkeypatch.setattr(mod, "extension_cache_key", lambda _path, name, _options: f"key-{name}")
+    with (
+        patch("Cython.Build.cythonize", return_value=["changed_ext"]) as mock_cythonize,
+        patch("Cython.Compiler.Options"),
+        patch("python_build_utils.cythonized_setup.setup") as mock_setup,
+    ):
+        mod.cythonized_setup("dummy_module")
+
+    assert mock_cythonize.call_args.args[0] == [str(Path("src", "dummy_module", "changed.py"))]
+    changed_ext, cached_ext = mock_setup.call_args.kwargs["ext_modules"]
+    assert changed_ext == "changed_ext"
+    assert cached_ext.name == "dummy_module.cached"
+    assert cached_ext.sources == []
+    assert "build_ext" in mock_setup.call_args.kwargs["cmdclass"]
+
+
+def test_caching_build_ext_restores_or_compiles(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """A cached module is found under its cache file name; one that disappeared is compiled instead."""
+    cache_dir = tmp_path / "cache"
+    cached = cached_extension_path(cache_dir, "ab12", extension_filename("pkg.mod"))
+    cached.parent.mkdir(parents=True)
+    cached.write_bytes(b"compiled")
+    target = tmp_path / "build" / "pkg" / "mod.abi3.so"  # a name other than the one of EXT_SUFFIX
+    compiled = Extension("pkg.other", sources=["src/pkg/other.c"])
+    built: list[Extension] = []
+    monkeypatch.setattr(mod.build_ext, "build_extension", lambda _self, ext: built.append(ext))
+
+    command = mod._caching_build_ext(cache_dir, {"pkg.mod": "ab12", "pkg.other": "cd34"}, lambda _name: compiled)(
+        Distribution()
+    )
+    monkeypatch.setattr(
+        command, "get_ext_fullpath", lambda name: str(target.with_name(name.rpartition(".")[2] + ".abi3.so"))
+    )
+
+    command.build_extension(Extension("pkg.mod", sources=[]))
+    assert target.read_bytes() == b"compiled"
+    assert built == []
+
+    command.build_extension(Extension("pkg.other", sources=[]))
+    assert built == [compiled]
+
+
+def test_cythonized_setup_compiles_selected_modules(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Modules left out by the selection rules are not passed to cythonize."""
+    os.environ["CYTHON_BUILD"] = "1"
+    os.environ["CYTHON_BUILD_EXCLUDE"] = "__init__.py"
+    os.environ.pop("CYTHON_BUILD_CACHE_DIR", None)
+    src_dir = tmp_path / "src" / "dummy_module"
+    src_dir.mkdir(parents=True)
+    (src_dir / "__init__.py").write_text("")
+    (src_dir / "foo.py").write_text("def bar(): pass")
+    monkeypatch.chdir(tmp_path)
+
+    with (
+        patch("Cython.Build.cythonize", return_value=["dummy_ext"]) as mock_cythonize,
+        patch("Cython.Compiler.Options"),
+        patch("python_build_utils.cythonized_setup.setup"),
+    ):
+        mod.cythonized_setup("dummy_module")
+
+    assert mock_cythonize.call_args.args[0] == [str(Path("src", "dummy_module", "foo.py"))]
@@ -0,0 +1,117 @@
+"""Tests for `python_build_utils.dedupe_artifacts`."""
+
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from python_build_utils.dedupe_artifacts import PREFIX_SIZE, dedupe_artifacts, find_duplicates, replace_duplicates
+
+
+@pytest.fixture
+def dist_dir(tmp_path: Path) -> Path:
+    """Create a dist directory with two duplicate groups and near-duplicates."""
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    large = os.urandom(PREFIX_SIZE * 2)
+    (dist / "pkg-1.0-py3-none-any.whl").write_bytes(large)
+    (dist / "pkg-1.0-cp312-cp312-linux_x86_64.whl").write_bytes(large)
+    (dist / "pkg-1.1-py3-none-any.whl").write_bytes(large[:-1] + bytes([large[-1] ^ 1]))  # same size and prefix
+    (dist / "mod.cpython-312-x86_64-linux-gnu.so").write_bytes(b"small binary")
+    (dist / "mod.so").write_bytes(b"small binary")
+    (dist / "other.so").write_bytes(b"other binary")  # same size, other content
+    (dist / "notes.txt").write_bytes(b"small binary")  # not matched by the default patterns
+    return dist
+
+
+def test_find_duplicates(dist_dir: Path) -> None:
+    """Only files with identical content are grouped, including those that share size and prefix."""
+    groups = find_duplicates(sorted(dist_dir.iterdir()))
+
+    assert [[path.name for path in group.paths] for group in groups] == [
+        ["mod.cpython-312-x86_64-linux-gnu.so", "mod.so", "notes.txt"],
+        ["pkg-1.0-cp312-cp312-linux_x86_64.whl", "pkg-1.0-py3-none-any.whl"],
+    ]
+    assert groups[1].reclaimable == PREFIX_SIZE * 2
+
+
+def test_find_duplicates_skips_existing_hardlinks(tmp_path: Path) -> None:
+    """Files that already share an inode are not reported again."""
+    first = tmp_path / "a.whl"
+    first.write_bytes(b"content")
+    os.link(first, tmp_path / "b.whl")
+
+    assert find_duplicates([first, tmp_path / "b.whl"]) == []
+
+
+def test_find_duplicates_skips_removed_files(tmp_path: Path) -> None:
+    """A file deleted after it was listed is skipped instead of aborting the scan."""
+    first, second = tmp_path / "a.whl", tmp_path / "b.whl"
+    first.write_bytes(b"content")
+    second.write_bytes(b"content")
+
+    groups = find_duplicates([first, tmp_path / "gone.whl", second])
+
+    assert [group.paths for group in groups] == [(first, second)]
+
+
+def test_find_duplicates_per_device(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Identical files on two devices form one group per device, so every group can be linked."""
+    content = os.urandom(PREFIX_SIZE * 2)
+    paths = []
+    for device in ("a", "b"):
+        (tmp_path / device).mkdir()
+        for name in ("one.whl", "two.whl"):
+            path = tmp_path / device / name
+            path.write_bytes(content)
+            paths.append(path)
+    real_stat = Path.stat
+
+    def stat(path: Path, **kwargs: bool) -> os.stat_result:
+        result = real_stat(path, **kwargs)
+        if path.parent.name != "b":
+            return result
+        fields = list(result[:10])
+        fields[2] += 1  # st_dev
+        return os.stat_result(fields)
+
+    monkeypatch.setattr(Path, "stat", stat)
+    groups = find_duplicates(paths)
+
+    assert [[f"{path.parent.name}/{path.name}" for path in group.paths] for group in groups] == [
+        ["a/one.whl", "a/two.whl"],
+        ["b/one.whl", "b/two.whl"],
+    ]
+    assert groups[0].device != groups[1].device
+    assert sum(group.reclaimable for group in groups) == len(content) * 2
+
+
+def test_replace_duplicates_hardlinks(dist_dir: Path) -> None:
+    """Duplicates become hard links to the first file of the group."""
+    group = find_duplicates([dist_dir / "mod.so", dist_dir / "mod.cpython-312-x86_64-linux-gnu.so"])[0]
+
+    assert replace_duplicates(group) == 1
+    assert (dist_dir / "mod.so").stat().st_ino == (dist_dir / "mod.cpython-312-x86_64-linux-gnu.so").stat().st_ino
+
+
+def test_dedupe_artifacts_dry_run(dist_dir: Path) -> None:
+    """A dry run lists the groups and the space they would free without linking."""
+    runner = CliRunner()
+    result = runner.invoke(dedupe_artifacts, ["--dist-dir", str(dist_dir), "--dry-run"])
+
+    assert result.exit_code == 0
+    assert "Would link 2 duplicate(s) in 2 group(s)" in result.output
+    assert (dist_dir / "mod.so").stat().st_nlink == 1
+
+
+def test_dedupe_artifacts_links(dist_dir: Path) -> None:
+    """Duplicates matched by the patterns are linked and the reclaimed space is reported."""
+    runner = CliRunner()
+    result = runner.invoke(dedupe_artifacts, ["--dist-dir", str(dist_dir), "-j", "2"])
+
+    assert result.exit_code == 0
+    assert "Linked 2 duplicate(s) in 2 group(s), 0.1 MB reclaimed" in result.output
+    assert (dist_dir / "pkg-1.0-py3-none-any.whl").samefile(dist_dir / "pkg-1.0-cp312-cp312-linux_x86_64.whl")
+    assert (dist_dir / "pkg-1.1-py3-none-any.whl").stat().st_nlink == 1
+    assert (dist_dir / "notes.txt").stat().st_nlink == 1
@@ -0,0 +1,24 @@
+"""Tests for `python_build_utils.deletion`."""
+
+from pathlib import Path
+
+from python_build_utils.deletion import DeletionSummary, delete_files
+
+
+def test_delete_files_in_threads(tmp_path: Path) -> None:
+    """Files are deleted concurrently; missing files are counted as failed."""
+    files = [tmp_path / f"file{i}.so" for i in range(10)]
+    for file in files:
+        file.write_bytes(b"x" * 1000)
+
+    summary = delete_files([*files, tmp_path / "missing.so"], jobs=4)
+
+    assert summary == DeletionSummary(removed=10, freed=10_000, failed=1)
+    assert not list(tmp_path.iterdir())
+
+
+def test_deletion_summary_describe() -> None:
+    """The summary reads as one line, mentioning failures only when there are any."""
+    assert DeletionSummary(3, 2_500_000, 0).describe() == "Removed 3 file(s), 2.5 MB freed"
+    assert DeletionSummary(3, 2_500_000, 1).describe("wheel(s)") == "Removed 3 wheel(s), 2.5 MB freed, 1 failed"
+    assert DeletionSummary(3, 2_500_000, 0).describe(dry_run=True) == "Would remove 3 file(s), 2.5 MB"
@@ -0,0 +1,119 @@
+"""Tests for the `dir2wheel` command and helpers in `python_build_utils.dir2wheel`."""
+
+import hashlib
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from python_build_utils.constants import EXIT_INVALID_USAGE
+from python_build_utils.dir2wheel import collect_package_files, convert_dir_to_wheel, dir2wheel
+from python_build_utils.wheel_writer import CompressionPolicy, record_hash
+
+
+@pytest.fixture
+def package_dir(tmp_path: Path) -> Path:
+    """Create a build tree with compiled modules, stubs, py.typed and build leftovers."""
+    pkg = tmp_path / "build" / "mypkg"
+    (pkg / "sub" / "__pycache__").mkdir(parents=True)
+    (pkg / "__init__.pyi").write_text("")
+    (pkg / "py.typed").write_text("")
+    (pkg / "core.cp312-win_amd64.pyd").write_bytes(b"\x00core" * 5000)
+    (pkg / "core.c").write_text("/* generated */")
+    (pkg / "sub" / "fast.cpython-312-x86_64-linux-gnu.so").write_bytes(b"\x7fELF" * 5000)
+    (pkg / "sub" / "fast.pyi").write_text("def f() -> None: ...\n")
+    (pkg / "sub" / "__pycache__" / "fast.cpython-312.pyc").write_bytes(b"pyc")
+    return pkg
+
+
+def test_collect_package_files_skips_build_leftovers(package_dir: Path) -> None:
+    """Check package paths are rooted at the package name and leftovers are excluded."""
+    members = collect_package_files(package_dir)
+
+    assert [arcname for arcname, _ in members] == [
+        "mypkg/__init__.pyi",
+        "mypkg/core.cp312-win_amd64.pyd",
+        "mypkg/py.typed",
+        "mypkg/sub/fast.cpython-312-x86_64-linux-gnu.so",
+        "mypkg/sub/fast.pyi",
+    ]
+
+
+def test_convert_dir_to_wheel_records_all_members(package_dir: Path, tmp_path: Path) -> None:
+    """Check every member is in the archive with a matching RECORD entry."""
+    policy = CompressionPolicy(suffix_rules=((".so", zipfile.ZIP_STORED),))
+
+    wheel_path = convert_dir_to_wheel(
+        package_dir, "1.0.0", "cp312-cp312-win_amd64", out_dir=tmp_path / "dist", jobs=3, compression=policy
+    )
+
+    assert wheel_path == tmp_path / "dist" / "mypkg-1.0.0-cp312-cp312-win_amd64.whl"
+    with zipfile.ZipFile(wheel_path) as zf:
+        assert zf.testzip() is None
+        record = dict(
+            line.split(",", 1) for line in zf.read("mypkg-1.0.0.dist-info/RECORD").decode("utf-8").splitlines()
+        )
+        for arcname, path in collect_package_files(package_dir):
+            data = zf.read(arcname)
+            assert data == path.read_bytes()
+            assert record[arcname] == f"{record_hash(hashlib.sha256(data).digest())},{len(data)}"
+        assert zf.getinfo("mypkg/sub/fast.cpython-312-x86_64-linux-gnu.so").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("mypkg/core.cp312-win_amd64.pyd").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_convert_dir_to_wheel_is_reproducible(package_dir: Path, tmp_path: Path) -> None:
+    """Build twice with different thread counts and compare the archives."""
+    first = convert_dir_to_wheel(package_dir, "1.0.0", "cp312-cp312-win_amd64", out_dir=tmp_path / "a", jobs=1)
+    second = convert_dir_to_wheel(package_dir, "1.0.0", "cp312-cp312-win_amd64", out_dir=tmp_path / "b", jobs=4)
+
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_cli_dir2wheel(package_dir: Path, tmp_path: Path) -> None:
+    """Run the CLI with explicit tags, name and an extra exclude."""
+    runner = CliRunner()
+    result = runner.invoke(
+        dir2wheel,
+        [
+            str(package_dir),
+            "--package-version=2.0",
+            "--name=my_dist",
+            "--python-tag=cp312",
+            "--platform-tag=linux_x86_64",
+            f"--out-dir={tmp_path / 'dist'}",
+            "--exclude=*.pyi",
+            "--compression=stored",
+        ],
+    )
+
+    assert result.exit_code == 0
+    wheel_path = tmp_path / "dist" / "my_dist-2.0-cp312-cp312-linux_x86_64.whl"
+    with zipfile.ZipFile(wheel_path) as zf:
+        names = zf.namelist()
+        assert "Tag: cp312-cp312-linux_x86_64" in zf.read("my_dist-2.0.dist-info/WHEEL").decode("utf-8")
+    assert "mypkg/py.typed" in names
+    assert not any(name.endswith(".pyi") for name in names)
+
+
+@pytest.mark.parametrize("option", ["--python-tag=cp312-cp312", "--abi-tag=", "--platform-tag=linux-x86_64"])
+def test_cli_dir2wheel_rejects_malformed_tag(package_dir: Path, tmp_path: Path, option: str) -> None:
+    """A tag holding a '-' or an empty tag is a usage error, not a traceback."""
+    runner = CliRunner()
+    result = runner.invoke(dir2wheel, [str(package_dir), "--package-version=1.0", option, f"--out-dir={tmp_path}"])
+
+    assert result.exit_code == EXIT_INVALID_USAGE
+    assert "is not a single tag" in result.output
+    assert not list(tmp_path.glob("*.whl"))
+
+
+def test_convert_dir_to_wheel_normalizes_name(package_dir: Path, tmp_path: Path) -> None:
+    """A dashed distribution name gives a valid wheel file name; a malformed wheel tag is rejected."""
+    wheel_path = convert_dir_to_wheel(package_dir, "1.0", "py3-none-any", name="My-Dist.ext", out_dir=tmp_path)
+
+    assert wheel_path.name == "my_dist_ext-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(wheel_path) as zf:
+        assert "Name: My-Dist.ext" in zf.read("my_dist_ext-1.0.dist-info/METADATA").decode("utf-8")
+
+    with pytest.raises(ValueError, match="is not a wheel tag"):
+        convert_dir_to_wheel(package_dir, "1.0", "py3-none", out_dir=tmp_path)
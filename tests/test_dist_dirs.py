@@ -0,0 +1,67 @@
+"""Tests for `python_build_utils.dist_dirs`."""
+
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.dist_dirs import find_dist_dirs, resolve_dist_dirs
+
+
+@pytest.fixture
+def monorepo(tmp_path: Path) -> Path:
+    """Create a small monorepo with dist directories at several depths."""
+    for directory in (
+        "packages/alpha/dist",
+        "packages/beta/dist",
+        "packages/gamma/src",
+        "tools/nested/cli/dist",
+        "node_modules/dep/dist",
+        ".venv/lib/dist",
+        "dist",
+    ):
+        (tmp_path / directory).mkdir(parents=True)
+    (tmp_path / "packages" / "notes.txt").write_text("not a directory")
+    return tmp_path
+
+
+def test_find_dist_dirs_single_level_glob(monorepo: Path) -> None:
+    """A ``*`` component matches one directory level."""
+    assert find_dist_dirs(monorepo, "packages/*/dist") == [
+        monorepo / "packages" / "alpha" / "dist",
+        monorepo / "packages" / "beta" / "dist",
+    ]
+
+
+def test_find_dist_dirs_recursive_glob_prunes(monorepo: Path) -> None:
+    """``**`` matches any depth but skips hidden directories and node_modules."""
+    assert find_dist_dirs(monorepo, "**/dist") == [
+        monorepo / "dist",
+        monorepo / "packages" / "alpha" / "dist",
+        monorepo / "packages" / "beta" / "dist",
+        monorepo / "tools" / "nested" / "cli" / "dist",
+    ]
+
+
+def test_find_dist_dirs_recursive_glob_skips_symlink_cycle(monorepo: Path) -> None:
+    """``**`` does not follow symlinked directories, so a link back to the root cannot loop."""
+    (monorepo / "packages" / "alpha" / "loop").symlink_to(monorepo, target_is_directory=True)
+
+    assert find_dist_dirs(monorepo, "packages/**/dist") == [
+        monorepo / "packages" / "alpha" / "dist",
+        monorepo / "packages" / "beta" / "dist",
+    ]
+
+
+def test_find_dist_dirs_hidden_when_named(monorepo: Path) -> None:
+    """A hidden directory is entered when the pattern names it."""
+    assert find_dist_dirs(monorepo, ".venv/*/dist") == [monorepo / ".venv" / "lib" / "dist"]
+
+
+def test_find_dist_dirs_no_match(monorepo: Path) -> None:
+    """A pattern without matches gives an empty list."""
+    assert find_dist_dirs(monorepo, "missing/*/dist") == []
+
+
+def test_resolve_dist_dirs_without_glob(tmp_path: Path) -> None:
+    """Without a glob only --dist-dir is returned, whether or not it exists."""
+    assert resolve_dist_dirs(str(tmp_path / "dist") + "/", tmp_path, None) == [(tmp_path / "dist").resolve()]
@@ -0,0 +1,190 @@
+"""Tests for the compiled extension cache in `python_build_utils.extension_cache`."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.extension_cache import (
+    CacheSettings,
+    cache_settings_from_env,
+    cached_extension_path,
+    cython_dependencies,
+    evict_extensions,
+    extension_cache_key,
+    is_cached,
+    restore_extension,
+    store_extension,
+)
+
+
+Dependencies = pytest.importorskip("Cython.Build.Dependencies")
+
+OPTIONS = {"directives": {"language_level": "3"}, "docstrings": False}
+DAY = 86400
+NOW = 1_000 * DAY
+ENTRY_SIZE = 100
+
+
+@pytest.fixture(autouse=True)
+def fresh_dependency_tree(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Let Cython build a new dependency tree, which it otherwise keeps for the whole process."""
+    monkeypatch.setattr(Dependencies, "_dep_tree", None)
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Create a module source file."""
+    path = tmp_path / "src" / "pkg" / "mod.py"
+    path.parent.mkdir(parents=True)
+    path.write_text("def f(): return 1\n")
+    return path
+
+
+def _entry(cache_dir: Path, key: str, age_days: float) -> Path:
+    """Create a cache entry of `ENTRY_SIZE` bytes last used ``age_days`` before `NOW`."""
+    path = cached_extension_path(cache_dir, key, "mod.so")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"x" * ENTRY_SIZE)
+    used = NOW - age_days * DAY
+    os.utime(path.parent, (used, used))
+    return path.parent
+
+
+def test_key_changes_with_inputs(source: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The key covers the source, a sibling .pxd, the module name, the options and the compiler flags."""
+    key = extension_cache_key(source, "pkg.mod", OPTIONS)
+
+    assert key == extension_cache_key(source, "pkg.mod", dict(OPTIONS))
+    assert key != extension_cache_key(source, "pkg.other", OPTIONS)
+    assert key != extension_cache_key(source, "pkg.mod", {**OPTIONS, "docstrings": True})
+
+    monkeypatch.setenv("CFLAGS", "-O3")
+    assert key != extension_cache_key(source, "pkg.mod", OPTIONS)
+    monkeypatch.delenv("CFLAGS")
+
+    source.with_suffix(".pxd").write_text("cdef int f()\n")
+    monkeypatch.setattr(Dependencies, "_dep_tree", None)
+    assert key != extension_cache_key(source, "pkg.mod", OPTIONS)
+
+    source.with_suffix(".pxd").unlink()
+    monkeypatch.setattr(Dependencies, "_dep_tree", None)
+    source.write_text("def f(): return 2\n")
+    assert key != extension_cache_key(source, "pkg.mod", OPTIONS)
+
+
+def test_key_covers_cimported_and_included_files(tmp_path: Path) -> None:
+    """A .pxd cimported from another package and an included .pxi are part of the key."""
+    package = tmp_path / "src" / "pkg"
+    other = tmp_path / "src" / "other"
+    for directory in (package, other):
+        directory.mkdir(parents=True)
+        (directory / "__init__.py").touch()
+    (other / "defs.pxd").write_text("cdef int g()\n")
+    (package / "consts.pxi").write_text("DEF N = 1\n")
+    source = package / "mod.pyx"
+    source.write_text('cimport other.defs\ninclude "consts.pxi"\ndef f(): return 1\n')
+
+    assert cython_dependencies(source) == [(other / "defs.pxd").resolve(), (package / "consts.pxi").resolve()]
+
+    key = extension_cache_key(source, "pkg.mod", OPTIONS)
+    (other / "defs.pxd").write_text("cdef long g()\n")
+    assert key != extension_cache_key(source, "pkg.mod", OPTIONS)
+
+    key = extension_cache_key(source, "pkg.mod", OPTIONS)
+    (package / "consts.pxi").write_text("DEF N = 2\n")
+    assert key != extension_cache_key(source, "pkg.mod", OPTIONS)
+
+
+def test_store_and_restore(tmp_path: Path) -> None:
+    """A stored module is restored with the same content; an unknown key is a miss."""
+    cache_dir = tmp_path / "cache"
+    built = tmp_path / "build" / "mod.so"
+    built.parent.mkdir()
+    built.write_bytes(b"compiled")
+
+    store_extension(cache_dir, "ab12", built)
+    target = tmp_path / "out" / "pkg" / "mod.so"
+
+    assert is_cached(cache_dir, "ab12", "mod.so")
+    assert restore_extension(cache_dir, "ab12", target)
+    assert target.read_bytes() == b"compiled"
+    assert not restore_extension(cache_dir, "cd34", tmp_path / "out" / "other.so")
+
+
+def test_restored_module_is_independent_of_cache(tmp_path: Path) -> None:
+    """Changing a stored or restored module in place, as strip or codesign do, leaves the cache entry intact."""
+    cache_dir = tmp_path / "cache"
+    built = tmp_path / "build" / "mod.so"
+    built.parent.mkdir()
+    built.write_bytes(b"compiled")
+    store_extension(cache_dir, "ab12", built)
+    target = tmp_path / "out" / "mod.so"
+    restore_extension(cache_dir, "ab12", target)
+
+    for path in (built, target):
+        with path.open("r+b") as f:
+            f.write(b"stripped")
+
+    assert cached_extension_path(cache_dir, "ab12", "mod.so").read_bytes() == b"compiled"
+
+
+def test_evict_by_age(tmp_path: Path) -> None:
+    """Entries not used within the maximum age are removed."""
+    old = _entry(tmp_path, "aa01", age_days=40)
+    recent = _entry(tmp_path, "bb02", age_days=1)
+
+    summary = evict_extensions(tmp_path, max_age_days=30, now=NOW)
+
+    assert summary == (1, ENTRY_SIZE, 0)
+    assert not old.exists()
+    assert recent.exists()
+
+
+def test_evict_by_size_removes_least_recently_used(tmp_path: Path) -> None:
+    """The least recently used entries go first until the cache fits."""
+    oldest = _entry(tmp_path, "aa01", age_days=3)
+    middle = _entry(tmp_path, "bb02", age_days=2)
+    newest = _entry(tmp_path, "cc03", age_days=1)
+
+    summary = evict_extensions(tmp_path, max_bytes=2 * ENTRY_SIZE, now=NOW)
+
+    assert summary.removed == 1
+    assert not oldest.exists()
+    assert middle.exists()
+    assert newest.exists()
+
+
+def test_evict_without_limits_keeps_everything(tmp_path: Path) -> None:
+    """Without limits nothing is evicted, and a missing cache directory is empty."""
+    _entry(tmp_path, "aa01", age_days=400)
+
+    assert evict_extensions(tmp_path, now=NOW).removed == 0
+    assert evict_extensions(tmp_path / "missing", max_bytes=0).removed == 0
+
+
+@pytest.mark.parametrize(
+    ("size", "age", "expected"),
+    [
+        ("", "", (1024_000_000, 30)),
+        ("10", "7", (10_000_000, 7)),
+        ("0", "0", (None, None)),
+        ("big", "-1", (1024_000_000, 30)),
+    ],
+)
+def test_cache_settings_from_env(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, size: str, age: str, expected: tuple[object, object]
+) -> None:
+    """The limits come from the environment; 0 disables a limit and invalid values fall back to the defaults."""
+    monkeypatch.setenv("CYTHON_BUILD_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("CYTHON_BUILD_CACHE_MAX_SIZE", size)
+    monkeypatch.setenv("CYTHON_BUILD_CACHE_MAX_AGE", age)
+
+    assert cache_settings_from_env() == CacheSettings(tmp_path, *expected)
+
+
+def test_cache_disabled_without_directory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without CYTHON_BUILD_CACHE_DIR there is no cache."""
+    monkeypatch.delenv("CYTHON_BUILD_CACHE_DIR", raising=False)
+
+    assert cache_settings_from_env() is None
@@ -0,0 +1,49 @@
+"""Tests for `python_build_utils.hashing`."""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.hashing import FileDigest, hash_file, hash_files
+
+
+@pytest.mark.parametrize("size", [0, 1, 1024 * 1024, 3 * 1024 * 1024 + 17])
+def test_hash_file(tmp_path: Path, size: int) -> None:
+    """Digest and size match hashlib for sizes around the buffer boundary."""
+    data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+
+    assert hash_file(path) == FileDigest(hashlib.sha256(data).digest(), size)
+
+
+def test_hash_file_small_buffer(tmp_path: Path) -> None:
+    """A buffer smaller than the file still hashes every byte."""
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abcdefghij")
+
+    assert hash_file(path, "sha512", buffer_size=3) == FileDigest(hashlib.sha512(b"abcdefghij").digest(), 10)
+
+
+@pytest.mark.parametrize("jobs", [None, 1, 3])
+def test_hash_files_keeps_order(tmp_path: Path, jobs: int | None) -> None:
+    """Results are returned in the order of the input paths."""
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"file{i}.bin"
+        path.write_bytes(str(i).encode() * (i + 1))
+        paths.append(path)
+
+    assert hash_files(paths, jobs=jobs) == [hash_file(path) for path in paths]
+
+
+def test_hash_file_max_bytes(tmp_path: Path) -> None:
+    """Only the first ``max_bytes`` bytes are hashed, whatever the buffer size."""
+    path = tmp_path / "data.bin"
+    data = bytes(range(256)) * 100
+    path.write_bytes(data)
+
+    result = hash_file(path, buffer_size=1000, max_bytes=2500)
+
+    assert result == FileDigest(hashlib.sha256(data[:2500]).digest(), 2500)
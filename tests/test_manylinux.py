@@ -0,0 +1,133 @@
+"""Tests for the ELF glibc detection in `python_build_utils.manylinux`."""
+
+import struct
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.manylinux import SHT_GNU_VERNEED, detect_glibc_version, manylinux_platform_tag
+
+
+SHT_STRTAB = 3
+
+
+def _make_elf(path: Path, versions: list[str], *, is_64bit: bool = True, endian: str = "<") -> Path:
+    """Write a minimal ELF file whose version-needed section requires ``versions`` from libc.so.6."""
+    dynstr = b"\x00libc.so.6\x00"
+    name_offsets = []
+    for version in versions:
+        name_offsets.append(len(dynstr))
+        dynstr += version.encode("ascii") + b"\x00"
+
+    verneed = struct.pack(f"{endian}HHIII", 1, len(versions), 1, 16, 0)
+    for i, name_offset in enumerate(name_offsets):
+        next_offset = 16 if i < len(versions) - 1 else 0
+        verneed += struct.pack(f"{endian}IHHII", 0, 0, i + 2, name_offset, next_offset)
+
+    header_size = 64 if is_64bit else 52
+    dynstr_offset = header_size
+    verneed_offset = dynstr_offset + len(dynstr)
+    shoff = verneed_offset + len(verneed)
+
+    ident = b"\x7fELF" + bytes([2 if is_64bit else 1, 1 if endian == "<" else 2, 1]) + b"\x00" * 9
+    if is_64bit:
+        shentsize = 64
+        header = ident + struct.pack(f"{endian}HHIQQQIHHHHHH", 3, 62, 1, 0, 0, shoff, 0, 64, 0, 0, shentsize, 3, 1)
+        section = f"{endian}IIQQQQIIQQ"
+    else:
+        shentsize = 40
+        header = ident + struct.pack(f"{endian}HHIIIIIHHHHHH", 3, 3, 1, 0, 0, shoff, 0, 52, 0, 0, shentsize, 3, 1)
+        section = f"{endian}IIIIIIIIII"
+
+    sections = [
+        struct.pack(section, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0),
+        struct.pack(section, 0, SHT_STRTAB, 0, 0, dynstr_offset, len(dynstr), 0, 0, 1, 0),
+        struct.pack(section, 0, SHT_GNU_VERNEED, 0, 0, verneed_offset, len(verneed), 1, 1, 4, 0),
+    ]
+    path.write_bytes(header + dynstr + verneed + b"".join(sections))
+    return path
+
+
+@pytest.mark.parametrize(
+    ("is_64bit", "endian"),
+    [(True, "<"), (True, ">"), (False, "<")],
+)
+def test_detect_glibc_version(tmp_path: Path, *, is_64bit: bool, endian: str) -> None:
+    """Return the highest glibc version, including three-part versions such as 2.2.5."""
+    so_file = _make_elf(
+        tmp_path / "mod.so", ["GLIBC_2.2.5", "GLIBC_2.28", "GLIBC_2.17"], is_64bit=is_64bit, endian=endian
+    )
+
+    assert detect_glibc_version(so_file) == (2, 28)
+
+
+def test_detect_glibc_version_not_elf(tmp_path: Path) -> None:
+    """Return None for empty and non-ELF files."""
+    (tmp_path / "empty.so").touch()
+    (tmp_path / "text.so").write_text("not an elf file" * 10)
+
+    assert detect_glibc_version(tmp_path / "empty.so") is None
+    assert detect_glibc_version(tmp_path / "text.so") is None
+
+
+@pytest.mark.parametrize("keep", [64, 80, 100, -10])
+def test_detect_glibc_version_truncated_elf(tmp_path: Path, caplog: pytest.LogCaptureFixture, keep: int) -> None:
+    """A truncated ELF file gives no glibc version, so the module keeps the plain linux tag."""
+    data = _make_elf(tmp_path / "full.so", ["GLIBC_2.28"]).read_bytes()
+    so_file = tmp_path / "bad.cpython-312-x86_64-linux-gnu.so"
+    so_file.write_bytes(data[:keep])
+
+    assert detect_glibc_version(so_file) is None
+    assert manylinux_platform_tag(so_file, "x86_64") == "linux_x86_64"
+    assert "Cannot read the glibc version" in caplog.text
+
+
+def test_detect_glibc_version_corrupt_section_link(tmp_path: Path) -> None:
+    """A version-needed section linking to a section that does not exist gives no glibc version."""
+    so_file = _make_elf(tmp_path / "mod.so", ["GLIBC_2.28"])
+    data = bytearray(so_file.read_bytes())
+    (shoff,) = struct.unpack_from("<Q", data, 0x28)
+    struct.pack_into("<I", data, shoff + 2 * 64 + 40, 99)  # sh_link of the verneed section
+    so_file.write_bytes(bytes(data))
+
+    assert detect_glibc_version(so_file) is None
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("vna_next", 0),  # the first of three Vernaux entries points at itself
+        ("vn_cnt", 0xFFFF),  # more Verneed entries than fit in the section
+        ("sh_info", 1_000_000),
+    ],
+)
+def test_detect_glibc_version_looping_verneed_chain(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture, field: str, value: int
+) -> None:
+    """A version chain that loops or counts more entries than the section holds is reported, not walked."""
+    so_file = _make_elf(tmp_path / "mod.so", ["GLIBC_2.17", "GLIBC_2.28", "GLIBC_2.34"])
+    data = bytearray(so_file.read_bytes())
+    (shoff,) = struct.unpack_from("<Q", data, 0x28)
+    (verneed_offset,) = struct.unpack_from("<Q", data, shoff + 2 * 64 + 24)
+    offsets = {"vna_next": verneed_offset + 16 + 12, "vn_cnt": verneed_offset + 2, "sh_info": shoff + 2 * 64 + 44}
+    struct.pack_into("<H" if field == "vn_cnt" else "<I", data, offsets[field], value)
+    so_file.write_bytes(bytes(data))
+
+    assert detect_glibc_version(so_file) is None
+    assert "Cannot read the glibc version" in caplog.text
+
+
+@pytest.mark.parametrize(
+    ("versions", "arch", "expected"),
+    [
+        (["GLIBC_2.17", "GLIBC_2.34"], "x86_64", "manylinux_2_34_x86_64"),
+        (["GLIBC_2.2.5"], "x86_64", "manylinux_2_5_x86_64"),
+        (["GLIBC_2.2.5"], "aarch64", "manylinux_2_17_aarch64"),
+        (["GCC_3.0"], "x86_64", "linux_x86_64"),
+    ],
+)
+def test_manylinux_platform_tag(tmp_path: Path, versions: list[str], arch: str, expected: str) -> None:
+    """Map the required glibc version to a manylinux tag, respecting per-architecture baselines."""
+    so_file = _make_elf(tmp_path / "mod.so", versions)
+
+    assert manylinux_platform_tag(so_file, arch) == expected
@@ -0,0 +1,142 @@
+"""Tests for `python_build_utils.prune_dist`."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from python_build_utils.prune_dist import (
+    RetentionPolicy,
+    build_index,
+    prune_dist,
+    select_pruned,
+    version_key,
+)
+
+
+DAY = 24 * 60 * 60
+
+
+def _artifact(dist_dir: Path, filename: str, age_days: float = 0, size: int = 1000) -> Path:
+    """Create an artifact of ``size`` bytes last modified ``age_days`` ago."""
+    path = dist_dir / filename
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age_days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def dist_dir(tmp_path: Path) -> Path:
+    """Create a dist directory with three versions of one package and one of another."""
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    _artifact(dist, "my_pkg-1.9.0-py3-none-any.whl", age_days=60)
+    _artifact(dist, "my_pkg-1.9.0.tar.gz", age_days=60)
+    _artifact(dist, "my_pkg-1.10.0-cp312-cp312-win_amd64.whl", age_days=30)
+    _artifact(dist, "my_pkg-1.10.0-cp311-cp311-win_amd64.whl", age_days=30)
+    _artifact(dist, "my.pkg-2.0rc1.tar.gz", age_days=1)
+    _artifact(dist, "other-0.1-py3-none-any.whl", age_days=90)
+    _artifact(dist, "README.txt")
+    return dist
+
+
+def test_version_key_orders_like_pep440() -> None:
+    """Pre-, post- and dev-releases and multi-digit components sort correctly."""
+    versions = ["1.10", "1.0.post1", "1.0", "1.0a1", "1.0.dev1", "1.0rc1", "1.9", "2!0.1"]
+    assert sorted(versions, key=version_key) == [
+        "1.0.dev1",
+        "1.0a1",
+        "1.0rc1",
+        "1.0",
+        "1.0.post1",
+        "1.9",
+        "1.10",
+        "2!0.1",
+    ]
+    assert version_key("1.0") == version_key("1.0.0") == version_key("1")
+    assert version_key("1.0") != version_key("1.0.1")
+
+
+def test_build_index_groups_by_normalized_name(dist_dir: Path) -> None:
+    """Wheels and sdists are indexed under their normalized name; other files are skipped."""
+    index = build_index([dist_dir])
+
+    assert sorted(index) == ["my_pkg", "other"]
+    assert sorted(artifact.version for artifact in index["my_pkg"]) == ["1.10.0", "1.10.0", "1.9.0", "1.9.0", "2.0rc1"]
+    assert index["other"][0].tags == ("py3-none-any",)
+
+
+def test_select_pruned_keep_newest(dist_dir: Path) -> None:
+    """Only the newest versions of each package are kept."""
+    pruned = select_pruned(build_index([dist_dir]), RetentionPolicy(keep=2))
+
+    assert [artifact.path.name for artifact in pruned] == ["my_pkg-1.9.0-py3-none-any.whl", "my_pkg-1.9.0.tar.gz"]
+
+
+def test_select_pruned_equal_versions_count_once(dist_dir: Path) -> None:
+    """``2.0`` and ``2.0.0`` are one version, so --keep 1 keeps both spellings."""
+    _artifact(dist_dir, "my_pkg-2.0.0-py3-none-any.whl")
+    _artifact(dist_dir, "my_pkg-2.0.tar.gz")
+
+    pruned = select_pruned(build_index([dist_dir]), RetentionPolicy(keep=1))
+
+    assert {artifact.version for artifact in pruned} == {"1.9.0", "1.10.0", "2.0rc1"}
+
+
+def test_select_pruned_max_age_and_keep_tag(dist_dir: Path) -> None:
+    """Old artifacts are pruned unless a tag rule keeps them."""
+    policy = RetentionPolicy(max_age_days=45, keep_tags=("py3-*",))
+    pruned = select_pruned(build_index([dist_dir]), policy)
+
+    assert [artifact.path.name for artifact in pruned] == ["my_pkg-1.9.0.tar.gz"]
+
+
+def test_prune_dist_dry_run(dist_dir: Path) -> None:
+    """A dry run reports the artifacts and the space they take without deleting them."""
+    runner = CliRunner()
+    result = runner.invoke(prune_dist, ["--dist-dir", str(dist_dir), "--keep", "1", "--dry-run"])
+
+    assert result.exit_code == 0
+    assert "my_pkg-1.10.0-cp312-cp312-win_amd64.whl" in result.output
+    assert "Would delete 4 of 6 artifact(s) from 1 package(s)" in result.output
+    assert (dist_dir / "my_pkg-1.9.0.tar.gz").exists()
+
+
+def test_prune_dist_deletes(dist_dir: Path) -> None:
+    """Pruned artifacts are deleted and the bytes freed are reported."""
+    runner = CliRunner()
+    result = runner.invoke(prune_dist, ["--dist-dir", str(dist_dir), "--keep", "0", "--kind", "sdist"])
+
+    assert result.exit_code == 0
+    assert not list(dist_dir.glob("*.tar.gz"))
+    assert "Deleted 2 of 2 artifact(s) from 1 package(s), 0.0 MB freed, 0 kept" in result.output
+
+
+def test_prune_dist_reports_failed_deletions(dist_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Files that cannot be deleted are counted as failed and stay kept; the others are deleted in threads."""
+    unlink = Path.unlink
+
+    def refuse_old_sdist(path: Path, *, missing_ok: bool = False) -> None:
+        if path.name == "my_pkg-1.9.0.tar.gz":
+            raise PermissionError(path)
+        unlink(path, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", refuse_old_sdist)
+    runner = CliRunner()
+    result = runner.invoke(prune_dist, ["--dist-dir", str(dist_dir), "--keep", "0", "--kind", "sdist", "-j", "2"])
+
+    assert result.exit_code == 0
+    assert "Deleted 1 of 2 artifact(s) from 1 package(s), 0.0 MB freed, 1 kept, 1 failed" in result.output
+    assert [path.name for path in dist_dir.glob("*.tar.gz")] == ["my_pkg-1.9.0.tar.gz"]
+
+
+def test_prune_dist_requires_a_rule(dist_dir: Path) -> None:
+    """Without --keep or --max-age nothing would be kept, so the command refuses to run."""
+    runner = CliRunner()
+    result = runner.invoke(prune_dist, ["--dist-dir", str(dist_dir), "--keep-tag", "py3-*"])
+
+    assert result.exit_code != 0
+    assert "Give --keep, --max-age or both" in result.output
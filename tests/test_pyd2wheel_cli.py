@@ -1,10 +1,13 @@
 """Tests for the `pyd2wheel` CLI command from `python_build_utils.pyd2wheel`."""
 
+import io
+import zipfile
 from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
 
+from python_build_utils.constants import EXIT_INVALID_USAGE
 from python_build_utils.pyd2wheel import pyd2wheel
 
 
@@ -54,3 +57,133 @@ def test_cli_make_wheels(setup_wheel_files: callable, dummy_file_name: str) -> N
     result = runner.invoke(pyd2wheel, [pyd_file_path, "--package-version=1.2.3"])
 
     assert result.exit_code == 0
+
+
+def test_cli_batch_directory_to_out_dir(tmp_path: Path) -> None:
+    """Convert every .pyd in a directory into a separate output directory."""
+    src_dir = tmp_path / "build"
+    src_dir.mkdir()
+    for name in ("alpha-1.0-py311-win_amd64.pyd", "beta-2.0-py311-win_amd64.pyd", "gamma-3.0-py311-win_amd64.pyd"):
+        (src_dir / name).write_bytes(b"compiled")
+    out_dir = tmp_path / "wheels"
+
+    runner = CliRunner()
+    result = runner.invoke(pyd2wheel, [str(src_dir), "--out-dir", str(out_dir), "--jobs", "2"])
+
+    assert result.exit_code == 0
+    assert sorted(p.name for p in out_dir.glob("*.whl")) == [
+        "alpha-1.0-py311-none-win_amd64.whl",
+        "beta-2.0-py311-none-win_amd64.whl",
+        "gamma-3.0-py311-none-win_amd64.whl",
+    ]
+    assert not list(src_dir.glob("*.whl"))
+    assert "3 succeeded, 0 failed" in result.output
+
+
+def test_cli_batch_failure_does_not_abort(tmp_path: Path) -> None:
+    """A file that cannot be converted is reported while the others still succeed."""
+    good = tmp_path / "good-1.0-py311-win_amd64.pyd"
+    bad = tmp_path / "invalid_format.pyd"
+    good.write_bytes(b"compiled")
+    bad.write_bytes(b"compiled")
+
+    runner = CliRunner()
+    result = runner.invoke(pyd2wheel, [str(tmp_path / "*.pyd")])
+
+    assert result.exit_code == 1
+    assert (tmp_path / "good-1.0-py311-none-win_amd64.whl").exists()
+    assert "FAILED" in result.output
+    assert "1 succeeded, 1 failed" in result.output
+
+
+def test_cli_no_matching_files(tmp_path: Path) -> None:
+    """Exit with an error when the arguments match no .pyd files."""
+    runner = CliRunner()
+    result = runner.invoke(pyd2wheel, [str(tmp_path)])
+
+    assert result.exit_code == 1
+
+
+def test_cli_compression_options(setup_wheel_files: callable) -> None:
+    """Store the module uncompressed while the metadata uses the chosen default method."""
+    pyd_file_path = Path(setup_wheel_files("dummy-0.1.0-py311-win_amd64.pyd"))
+
+    runner = CliRunner()
+    result = runner.invoke(
+        pyd2wheel,
+        [str(pyd_file_path), "--compression", "lzma", "--compression-rule", ".pyd=stored"],
+    )
+
+    assert result.exit_code == 0
+    with zipfile.ZipFile(pyd_file_path.with_name("dummy-0.1.0-py311-none-win_amd64.whl")) as zf:
+        assert zf.getinfo(pyd_file_path.name).compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("dummy-0.1.0.dist-info/WHEEL").compress_type == zipfile.ZIP_LZMA
+
+
+def test_cli_invalid_compression_rule(setup_wheel_files: callable) -> None:
+    """Reject a malformed compression rule as a usage error."""
+    pyd_file_path = setup_wheel_files("dummy-0.1.0-py311-win_amd64.pyd")
+
+    runner = CliRunner()
+    result = runner.invoke(pyd2wheel, [pyd_file_path, "--compression-rule", "pyd"])
+
+    assert result.exit_code == EXIT_INVALID_USAGE
+    assert "Invalid compression rule" in result.output
+
+
+def test_cli_reports_cache_hits(setup_wheel_files: callable) -> None:
+    """Report cache hits and misses at the end of the run."""
+    pyd_file_path = setup_wheel_files("dummy-0.1.0-py311-win_amd64.pyd")
+
+    runner = CliRunner()
+    first = runner.invoke(pyd2wheel, [pyd_file_path, "--cache"])
+    second = runner.invoke(pyd2wheel, [pyd_file_path, "--cache"])
+
+    assert first.exit_code == 0
+    assert "Cache: 0 hits, 1 misses" in first.output
+    assert second.exit_code == 0
+    assert "Cache: 1 hits, 0 misses" in second.output
+
+
+def test_cli_output_to_stdout(tmp_path: Path) -> None:
+    """Stream the wheel to stdout; the summary goes to stderr and nothing is written to disk."""
+    pyd_file = tmp_path / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled")
+
+    runner = CliRunner()
+    result = runner.invoke(pyd2wheel, [str(pyd_file), "--output", "-"])
+
+    assert result.exit_code == 0
+    with zipfile.ZipFile(io.BytesIO(result.stdout_bytes)) as zf:
+        assert zf.read(pyd_file.name) == b"compiled"
+        assert zf.testzip() is None
+    assert "1 succeeded, 0 failed" in result.stderr
+    assert list(tmp_path.iterdir()) == [pyd_file]
+
+
+def test_cli_output_to_stdout_from_cache(tmp_path: Path) -> None:
+    """A wheel streamed to stdout is built in the cache once and streamed from it afterwards."""
+    pyd_file = tmp_path / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled")
+    args = [str(pyd_file), "-o", "-", "--cache-dir", str(tmp_path / "cache")]
+
+    runner = CliRunner()
+    first = runner.invoke(pyd2wheel, args)
+    second = runner.invoke(pyd2wheel, args)
+
+    assert first.exit_code == second.exit_code == 0
+    assert first.stdout_bytes == second.stdout_bytes
+    assert "Cache: 1 hits, 0 misses" in second.stderr
+    assert len(list((tmp_path / "cache").rglob("*.whl"))) == 1
+
+
+@pytest.mark.parametrize("output", ["-", "one.whl"])
+def test_cli_single_output_rejects_batches(tmp_path: Path, output: str) -> None:
+    """A file or stdout output cannot hold the wheels of several input files."""
+    for name in ("alpha-1.0-py311-win_amd64.pyd", "beta-2.0-py311-win_amd64.pyd"):
+        (tmp_path / name).write_bytes(b"compiled")
+
+    runner = CliRunner()
+    result = runner.invoke(pyd2wheel, [str(tmp_path), "--output", output])
+
+    assert result.exit_code == EXIT_INVALID_USAGE
@@ -1,15 +1,27 @@
 """Tests for functions in `python_build_utils.pyd2wheel`."""
 
+import hashlib
+import io
+import os
+import struct
+import sysconfig
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
+from python_build_utils import pyd2wheel
 from python_build_utils.pyd2wheel import (
     PydFileFormatError,
     PydFileSuffixError,
     VersionNotFoundError,
+    WheelOptions,
     _extract_pyd_file_info,
+    _extract_so_file_info,
     _get_package_version,
+    collect_pyd_files,
+    convert_pyd_files,
     convert_pyd_to_wheel,
 )
 
@@ -81,3 +93,202 @@ def test_convert_pyd_to_wheel(tmp_path: Path) -> None:
 
     assert wheel_file.exists()
     assert wheel_file.suffix == ".whl"
+
+
+def test_convert_pyd_to_wheel_contents(tmp_path: Path) -> None:
+    """Check the wheel contains the module and dist-info files, and no temp directory is left behind."""
+    pyd_file = tmp_path / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled")
+
+    wheel_file = convert_pyd_to_wheel(pyd_file, abi_tag="cp311")
+
+    assert wheel_file.name == "dummy-0.1.0-py311-cp311-win_amd64.whl"
+    assert not (tmp_path / "wheel_temp").exists()
+    with zipfile.ZipFile(wheel_file) as zf:
+        assert zf.namelist() == [
+            "dummy-0.1.0-py311-win_amd64.pyd",
+            "dummy-0.1.0.dist-info/METADATA",
+            "dummy-0.1.0.dist-info/WHEEL",
+            "dummy-0.1.0.dist-info/RECORD",
+        ]
+        assert zf.read("dummy-0.1.0-py311-win_amd64.pyd") == b"compiled"
+        assert "Tag: py311-cp311-win_amd64" in zf.read("dummy-0.1.0.dist-info/WHEEL").decode("utf-8")
+
+
+def test_collect_pyd_files_expands_sources(tmp_path: Path) -> None:
+    """Check directories and glob patterns expand to unique .pyd files."""
+    first = tmp_path / "a-1.0-py311-win_amd64.pyd"
+    second = tmp_path / "b-1.0-py311-win_amd64.pyd"
+    first.touch()
+    second.touch()
+    (tmp_path / "notes.txt").touch()
+
+    files = collect_pyd_files([str(tmp_path), str(tmp_path / "a-*.pyd"), str(first)])
+
+    assert files == [first, second]
+
+
+def test_convert_pyd_files_reports_failures(tmp_path: Path) -> None:
+    """Check a batch returns a result per file, including failures."""
+    good = tmp_path / "good-1.0-py311-win_amd64.pyd"
+    good.write_bytes(b"compiled")
+    missing_version = tmp_path / "noversion.cp311-win_amd64.pyd"
+    missing_version.write_bytes(b"compiled")
+
+    results = convert_pyd_files([good, missing_version], WheelOptions(out_dir=tmp_path / "out"), jobs=1)
+
+    assert [r.pyd_file for r in results] == [good, missing_version]
+    assert results[0].wheel_path == tmp_path / "out" / "good-1.0-py311-none-win_amd64.whl"
+    assert results[0].error is None
+    assert results[1].wheel_path is None
+    assert "No version could be extracted" in results[1].error
+
+
+def test_convert_pyd_files_unexpected_error_does_not_abort(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """An unexpected exception for one file becomes a failed result; the other files are still converted."""
+    good = tmp_path / "good-1.0-py311-win_amd64.pyd"
+    good.write_bytes(b"compiled")
+    broken = tmp_path / "broken-1.0-py311-win_amd64.pyd"
+    broken.write_bytes(b"compiled")
+    build_wheel = pyd2wheel._build_wheel
+
+    def fail_on_broken(pyd_file: Path, options: WheelOptions) -> tuple[Path, bool | None]:
+        if pyd_file == broken:
+            msg = "unpack requires a buffer of 8 bytes"
+            raise struct.error(msg)
+        return build_wheel(pyd_file, options)
+
+    monkeypatch.setattr(pyd2wheel, "_build_wheel", fail_on_broken)
+
+    results = convert_pyd_files([broken, good], WheelOptions(out_dir=tmp_path / "out"), jobs=1)
+
+    assert results[0].wheel_path is None
+    assert results[0].error == "error: unpack requires a buffer of 8 bytes"
+    assert results[1].error is None
+    assert results[1].wheel_path.exists()
+
+
+def test_convert_pyd_to_wheel_concurrently_in_same_directory(tmp_path: Path) -> None:
+    """Run many conversions in one directory at once and check the result is a valid wheel."""
+    pyd_file = tmp_path / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled" * 10000)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        wheel_files = list(executor.map(lambda _: convert_pyd_to_wheel(pyd_file), range(16)))
+
+    assert len(set(wheel_files)) == 1
+    with zipfile.ZipFile(wheel_files[0]) as zf:
+        assert zf.testzip() is None
+        assert zf.read(pyd_file.name) == pyd_file.read_bytes()
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([pyd_file.name, wheel_files[0].name])
+
+
+def test_convert_missing_pyd_leaves_no_partial_wheel(tmp_path: Path) -> None:
+    """Check a failing conversion does not publish an incomplete wheel."""
+    results = convert_pyd_files([tmp_path / "ghost-1.0-py311-win_amd64.pyd"])
+
+    assert results[0].error
+    assert not list(tmp_path.iterdir())
+
+
+def test_convert_pyd_to_wheel_is_reproducible(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Build the same module twice with different mtimes and permissions and compare wheel hashes."""
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    pyd_file = tmp_path / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled" * 1000)
+
+    os.utime(pyd_file, (1_600_000_000, 1_600_000_000))
+    first = hashlib.sha256(convert_pyd_to_wheel(pyd_file).read_bytes()).hexdigest()
+
+    os.utime(pyd_file, (1_700_000_000, 1_700_000_000))
+    pyd_file.chmod(0o755)
+    second = hashlib.sha256(convert_pyd_to_wheel(pyd_file).read_bytes()).hexdigest()
+
+    assert first == second
+
+
+def test_convert_pyd_to_wheel_uses_source_date_epoch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check member timestamps follow SOURCE_DATE_EPOCH."""
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    pyd_file = tmp_path / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled")
+
+    with zipfile.ZipFile(convert_pyd_to_wheel(pyd_file)) as zf:
+        infos = zf.infolist()
+
+    assert {info.date_time for info in infos} == {(2023, 11, 14, 22, 13, 20)}
+    assert {info.external_attr >> 16 for info in infos} == {0o100644}
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("fast.cpython-312-x86_64-linux-gnu.so", ("fast", "cp312", "cp312", "linux_x86_64")),
+        ("fast.cpython-313t-aarch64-linux-gnu.so", ("fast", "cp313", "cp313t", "linux_aarch64")),
+        ("fast.cpython-311-arm-linux-gnueabihf.so", ("fast", "cp311", "cp311", "linux_armv7l")),
+        ("fast.cp312-win_amd64.pyd", None),
+        ("fast.abi3.so", None),
+    ],
+)
+def test_extract_so_file_info(filename: str, expected: tuple[str, str, str, str] | None) -> None:
+    """Check tags are derived from CPython's Linux extension suffix."""
+    assert _extract_so_file_info(Path(filename)) == expected
+
+
+def test_convert_so_to_manylinux_wheel(tmp_path: Path) -> None:
+    """Convert a .so module; a non-ELF payload keeps the plain linux platform tag."""
+    so_file = tmp_path / "fast.cpython-312-x86_64-linux-gnu.so"
+    so_file.write_bytes(b"compiled")
+
+    wheel_file = convert_pyd_to_wheel(so_file, package_version="1.0")
+
+    assert wheel_file.name == "fast-1.0-cp312-cp312-linux_x86_64.whl"
+    with zipfile.ZipFile(wheel_file) as zf:
+        assert zf.namelist()[0] == so_file.name
+
+
+def test_convert_system_extension_to_manylinux_wheel(tmp_path: Path) -> None:
+    """Convert a real CPython extension of this interpreter into a manylinux wheel."""
+    candidates = sorted(Path(sysconfig.get_path("platstdlib"), "lib-dynload").glob("_bz2.cpython-*-linux-gnu.so"))
+    if not candidates:
+        pytest.skip("No glibc CPython extension module available")
+
+    so_file = tmp_path / candidates[0].name
+    so_file.write_bytes(candidates[0].read_bytes())
+
+    wheel_file = convert_pyd_to_wheel(so_file, package_version="1.0")
+
+    assert "-manylinux_2_" in wheel_file.name
+
+
+@pytest.mark.parametrize(
+    ("output", "expected"),
+    [
+        ("wheels", "wheels/dummy-0.1.0-py311-none-win_amd64.whl"),
+        ("store/ab/abcdef.whl", "store/ab/abcdef.whl"),
+    ],
+)
+def test_convert_pyd_to_wheel_output(tmp_path: Path, output: str, expected: str) -> None:
+    """Write to an output directory or an exact file path, never next to the input."""
+    src_dir = tmp_path / "build"
+    src_dir.mkdir()
+    pyd_file = src_dir / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled")
+
+    wheel_file = convert_pyd_to_wheel(pyd_file, output=tmp_path / output)
+
+    assert wheel_file == tmp_path / expected
+    assert zipfile.is_zipfile(wheel_file)
+    assert list(src_dir.iterdir()) == [pyd_file]
+
+
+def test_convert_pyd_to_wheel_output_stdout(tmp_path: Path, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
+    """Stream the wheel to stdout with output '-'."""
+    pyd_file = tmp_path / "dummy-0.1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled")
+
+    assert convert_pyd_to_wheel(pyd_file, output="-") == Path("-")
+
+    with zipfile.ZipFile(io.BytesIO(capsysbinary.readouterr().out)) as zf:
+        assert zf.read(pyd_file.name) == b"compiled"
+    assert list(tmp_path.iterdir()) == [pyd_file]
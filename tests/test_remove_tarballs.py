@@ -1,5 +1,6 @@
 """Tests for `remove_tarballs` function from `python_build_utils.remove_tarballs`."""
 
+import json
 import logging
 from pathlib import Path
 from typing import NoReturn
@@ -116,3 +117,40 @@ def test_remove_tarballs_oserror(
 
     assert result.exit_code == 0
     assert any("Error removing file" in r.message for r in caplog.records)
+
+
+def test_remove_tarballs_dist_glob(tmp_path: Path) -> None:
+    """Remove the tarballs of every directory matching --dist-glob and print a summary."""
+    for name in ("alpha", "beta"):
+        dist_dir = tmp_path / "packages" / name / "dist"
+        dist_dir.mkdir(parents=True)
+        (dist_dir / f"{name}-1.0.tar.gz").write_bytes(b"x" * 1000)
+        (dist_dir / f"{name}-1.0-py3-none-any.whl").write_text("keep")
+
+    runner = CliRunner()
+    result = runner.invoke(remove_tarballs, ["--root", str(tmp_path), "--dist-glob", "packages/*/dist"])
+
+    assert result.exit_code == 0
+    assert not list(tmp_path.glob("packages/*/dist/*.tar.gz"))
+    assert sorted(p.name for p in tmp_path.glob("packages/*/dist/*.whl")) == [
+        "alpha-1.0-py3-none-any.whl",
+        "beta-1.0-py3-none-any.whl",
+    ]
+    assert "Removed 2 tarball(s), 0.0 MB freed from 2 directories" in result.output
+
+
+def test_remove_tarballs_dry_run_manifest(setup_test_environment: Path, tmp_path: Path) -> None:
+    """--dry-run PATH writes the tarballs and their sizes to a JSON manifest and keeps them."""
+    manifest_path = tmp_path / "plan.json"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        remove_tarballs, ["--dist-dir", str(setup_test_environment), "--dry-run", str(manifest_path)]
+    )
+
+    assert result.exit_code == 0
+    assert list(setup_test_environment.glob("*.tar.gz"))
+    assert json.loads(manifest_path.read_text())["files"] == [
+        {"path": str(setup_test_environment / "test.tar.gz"), "size": len("dummy content")}
+    ]
+    assert "Would remove 1 tarball(s)" in result.output
@@ -11,6 +11,7 @@ from typing import NoReturn
 import pytest
 from click.testing import CliRunner
 
+from python_build_utils.constants import EXIT_FAILURE
 from python_build_utils.rename_wheel_files import rename_wheel_files
 
 
@@ -141,5 +142,5 @@ def test_file_exists_error(
     with caplog.at_level(logging.WARNING):  # <-- hier aangepast
         result = runner.invoke(rename_wheel_files, ["--dist-dir", str(tmp_path), "--wheel-tag", "custom"])
 
-    assert result.exit_code == 0
+    assert result.exit_code == EXIT_FAILURE
     assert any("File already exists" in record.message for record in caplog.records)
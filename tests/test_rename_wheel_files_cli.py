@@ -4,15 +4,18 @@ Covers scenarios like:
 - Successful renaming of wheel files
 - Handling of missing directories
 - FileExistsError and OSError handling
+- Parallel, journaled batches with rollback and dry runs
 """
 
+import json
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
 
-from python_build_utils.rename_wheel_files import rename_wheel_files
+from python_build_utils.constants import EXIT_FAILURE
+from python_build_utils.rename_wheel_files import JOURNAL_NAME, find_wheels, recover_journal, rename_wheel_files
 
 
 def test_rename_wheel_file_exists(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
@@ -26,7 +29,7 @@ def test_rename_wheel_file_exists(tmp_path: Path, caplog: pytest.LogCaptureFixtu
         with caplog.at_level("WARNING"):
             result = runner.invoke(rename_wheel_files, ["--dist-dir", str(tmp_path)])
 
-    assert result.exit_code == 0
+    assert result.exit_code == EXIT_FAILURE
     assert any("already exists" in r.message for r in caplog.records)
 
 
@@ -40,5 +43,166 @@ def test_rename_wheel_oserror(tmp_path: Path, caplog: pytest.LogCaptureFixture)
         with caplog.at_level("ERROR"):
             result = runner.invoke(rename_wheel_files, ["--dist-dir", str(tmp_path)])
 
-    assert result.exit_code == 0
+    assert result.exit_code == EXIT_FAILURE
     assert any("Unexpected error while renaming" in r.message for r in caplog.records)
+
+
+def _make_wheels(dist_dir: Path, count: int) -> list[Path]:
+    """Create ``count`` dummy py3-none-any wheels."""
+    wheels = [dist_dir / f"pkg{i}-1.0-py3-none-any.whl" for i in range(count)]
+    for wheel in wheels:
+        wheel.write_text("dummy")
+    return wheels
+
+
+def test_rename_batch_in_parallel(tmp_path: Path) -> None:
+    """Rename many wheels with worker threads and remove the journal afterwards."""
+    _make_wheels(tmp_path, 20)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        rename_wheel_files, ["--dist-dir", str(tmp_path), "--wheel-tag", "cp312-cp312-win_amd64", "-j", "4"]
+    )
+
+    assert result.exit_code == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"pkg{i}-1.0-cp312-cp312-win_amd64.whl" for i in range(20)
+    )
+
+
+def test_rename_batch_rolls_back_on_failure(tmp_path: Path) -> None:
+    """When one rename fails, the renames that succeeded are undone."""
+    wheels = _make_wheels(tmp_path, 5)
+    original_rename = Path.rename
+
+    def flaky_rename(self: Path, target: Path) -> Path:
+        if self.name.startswith("pkg3-") and target.name.endswith("win_amd64.whl"):
+            msg = "disk error"
+            raise OSError(msg)
+        return original_rename(self, target)
+
+    with patch.object(Path, "rename", flaky_rename):
+        runner = CliRunner()
+        result = runner.invoke(
+            rename_wheel_files, ["--dist-dir", str(tmp_path), "--wheel-tag", "cp312-cp312-win_amd64"]
+        )
+
+    assert result.exit_code == EXIT_FAILURE
+    assert sorted(tmp_path.iterdir()) == wheels
+
+
+def test_rename_dry_run(tmp_path: Path) -> None:
+    """A dry run prints the plan, including conflicts, and changes nothing."""
+    wheels = _make_wheels(tmp_path, 2)
+    (tmp_path / "pkg1-1.0-cp312-cp312-win_amd64.whl").touch()
+
+    runner = CliRunner()
+    result = runner.invoke(
+        rename_wheel_files, ["--dist-dir", str(tmp_path), "--wheel-tag", "cp312-cp312-win_amd64", "--dry-run"]
+    )
+
+    assert result.exit_code == 0
+    assert "rename: pkg0-1.0-py3-none-any.whl → pkg0-1.0-cp312-cp312-win_amd64.whl" in result.output
+    assert "2 step(s) for 2 wheel(s), 1 conflict(s)" in result.output
+    assert all(wheel.exists() for wheel in wheels)
+
+
+@pytest.mark.parametrize(
+    ("state", "retag", "expected"),
+    [
+        ("pending", False, "pkg0-1.0-py3-none-any.whl"),
+        ("pending", True, "pkg0-1.0-py3-none-any.whl"),
+        ("committing", True, "pkg0-1.0-cp312-cp312-win_amd64.whl"),
+    ],
+)
+def test_recover_journal(tmp_path: Path, state: str, *, retag: bool, expected: str) -> None:
+    """An interrupted batch is rolled back, or finished if it was committing."""
+    source = tmp_path / "pkg0-1.0-py3-none-any.whl"
+    target = tmp_path / "pkg0-1.0-cp312-cp312-win_amd64.whl"
+    target.write_text("dummy")
+    if retag:
+        source.write_text("dummy")
+    action = "retag" if retag else "rename"
+    journal = {"state": state, "entries": [[str(source), str(target), action, "cp312-cp312-win_amd64"]]}
+    (tmp_path / JOURNAL_NAME).write_text(json.dumps(journal))
+
+    assert recover_journal(tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == [expected]
+
+
+def test_rename_fan_out_uses_hard_links(tmp_path: Path) -> None:
+    """Without --retag, extra variants are hard links to the renamed wheel."""
+    _make_wheels(tmp_path, 1)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        rename_wheel_files,
+        ["--dist-dir", str(tmp_path), "--wheel-tag", "cp312-cp312-win_amd64", "--wheel-tag", "cp312-cp312-win32"],
+    )
+
+    assert result.exit_code == 0
+    primary = tmp_path / "pkg0-1.0-cp312-cp312-win_amd64.whl"
+    variant = tmp_path / "pkg0-1.0-cp312-cp312-win32.whl"
+    assert sorted(tmp_path.iterdir()) == [variant, primary]
+    assert primary.stat().st_ino == variant.stat().st_ino
+
+
+def test_find_wheels_from_tag(tmp_path: Path) -> None:
+    """Match wheels by a glob on their parsed tag and skip invalid wheel names."""
+    for name in ("a-1.0-cp312-cp312-linux_x86_64.whl", "b-1.0-1-cp312-cp312-linux_aarch64.whl", "c-1.0.whl"):
+        (tmp_path / name).touch()
+    (tmp_path / "d-1.0-py3-none-any.whl").touch()
+
+    assert [p.name for p in find_wheels(tmp_path, "cp312-cp312-linux_*")] == [
+        "a-1.0-cp312-cp312-linux_x86_64.whl",
+        "b-1.0-1-cp312-cp312-linux_aarch64.whl",
+    ]
+
+
+def test_rename_dist_glob(tmp_path: Path) -> None:
+    """Rename the wheels of every matching directory in one transaction journaled in --root."""
+    for name in ("alpha", "beta"):
+        dist_dir = tmp_path / "packages" / name / "dist"
+        dist_dir.mkdir(parents=True)
+        _make_wheels(dist_dir, 2)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        rename_wheel_files,
+        ["--root", str(tmp_path), "--dist-glob", "packages/*/dist", "--wheel-tag", "cp312-cp312-win_amd64"],
+    )
+
+    assert result.exit_code == 0
+    assert sorted(p.name for p in tmp_path.glob("packages/*/dist/*.whl")) == sorted(
+        f"pkg{i}-1.0-cp312-cp312-win_amd64.whl" for i in range(2) for _ in range(2)
+    )
+    assert not (tmp_path / JOURNAL_NAME).exists()
+    assert "4 wheel(s) in 2 directories, 4 step(s)" in result.output
+
+
+def test_rename_dist_glob_no_match(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Log and return when no directory matches --dist-glob."""
+    runner = CliRunner()
+    with caplog.at_level("INFO"):
+        result = runner.invoke(rename_wheel_files, ["--root", str(tmp_path), "--dist-glob", "packages/*/dist"])
+
+    assert result.exit_code == 0
+    assert any("No directories matching" in r.message for r in caplog.records)
+
+
+def test_rename_nothing_to_do(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Leave wheels that already carry the target tag alone, without writing a journal."""
+    wheel = tmp_path / "pkg-1.0-cp312-cp312-linux_x86_64.whl"
+    wheel.write_text("dummy")
+
+    runner = CliRunner()
+    with caplog.at_level("INFO"):
+        result = runner.invoke(
+            rename_wheel_files,
+            ["--dist-dir", str(tmp_path), "--from-tag", "cp312-*", "--wheel-tag", "cp312-cp312-linux_x86_64"],
+        )
+
+    assert result.exit_code == 0
+    assert any("Nothing to rename" in r.message for r in caplog.records)
+    assert [p.name for p in tmp_path.iterdir()] == [wheel.name]
+    assert not (tmp_path / JOURNAL_NAME).exists()
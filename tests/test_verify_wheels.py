@@ -0,0 +1,129 @@
+"""Tests for `verify_wheels` in `python_build_utils.verify_wheels`."""
+
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from python_build_utils.constants import EXIT_FAILURE
+from python_build_utils.pyd2wheel import convert_pyd_to_wheel
+from python_build_utils.verify_wheels import expand_wheel_tags, verify_wheel, verify_wheels
+
+
+@pytest.fixture
+def wheel_file(tmp_path: Path) -> Path:
+    """Create a valid wheel with pyd2wheel."""
+    pyd_file = tmp_path / "dummy-1.0-py311-win_amd64.pyd"
+    pyd_file.write_bytes(b"compiled" * 1000)
+    wheel_path = convert_pyd_to_wheel(pyd_file)
+    assert wheel_path is not None
+    return wheel_path
+
+
+def _rewrite_member(wheel_path: Path, arcname: str, data: bytes) -> None:
+    """Replace the content of one member, leaving RECORD untouched."""
+    with zipfile.ZipFile(wheel_path) as zf:
+        members = {name: zf.read(name) for name in zf.namelist()}
+    members[arcname] = data
+    with zipfile.ZipFile(wheel_path, "w") as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+
+
+def test_verify_valid_wheel(wheel_file: Path) -> None:
+    """A wheel built by pyd2wheel verifies without errors."""
+    assert verify_wheel(wheel_file) == []
+
+
+def test_verify_tampered_member(wheel_file: Path) -> None:
+    """Report hash and size mismatches of a modified member."""
+    _rewrite_member(wheel_file, "dummy-1.0-py311-win_amd64.pyd", b"tampered")
+
+    errors = verify_wheel(wheel_file)
+
+    assert any("sha256 mismatch" in error for error in errors)
+    assert any("does not match RECORD size" in error for error in errors)
+
+
+def test_verify_unrecorded_member(wheel_file: Path) -> None:
+    """Report members that are missing from RECORD."""
+    _rewrite_member(wheel_file, "extra.py", b"")
+
+    assert verify_wheel(wheel_file) == ["extra.py: not listed in RECORD"]
+
+
+def test_verify_renamed_wheel(wheel_file: Path) -> None:
+    """Report a file name whose tags do not match the WHEEL Tag lines."""
+    renamed = wheel_file.rename(wheel_file.with_name("dummy-1.0-cp311-cp311-win_amd64.whl"))
+
+    errors = verify_wheel(renamed)
+
+    assert len(errors) == 1
+    assert "do not match file name tags" in errors[0]
+
+
+def test_verify_not_a_zip(tmp_path: Path) -> None:
+    """Report files that are not zip archives."""
+    bad = tmp_path / "bad-1.0-py3-none-any.whl"
+    bad.write_text("not a zip")
+
+    assert verify_wheel(bad)[0].startswith("cannot read wheel")
+
+
+@pytest.mark.parametrize(
+    ("arcname", "data", "expected"),
+    [
+        ("dummy-1.0.dist-info/WHEEL", b"Tag: \xff\n", "metadata is not valid UTF-8"),
+        ("dummy-1.0.dist-info/RECORD", b"x" * 200_000 + b"\n", "malformed RECORD"),
+    ],
+)
+def test_verify_malformed_metadata(wheel_file: Path, arcname: str, data: bytes, expected: str) -> None:
+    """Undecodable or unparsable metadata is reported as an error of the wheel."""
+    _rewrite_member(wheel_file, arcname, data)
+
+    assert verify_wheel(wheel_file)[0].startswith(expected)
+
+
+def test_verify_unsupported_compression(wheel_file: Path) -> None:
+    """A member with an unknown compression method is reported, and the other members are still checked."""
+    data = bytearray(wheel_file.read_bytes())
+    central_entry = data.index(b"PK\x01\x02")  # central directory entry of the first member, the .pyd
+    data[central_entry + 10 : central_entry + 12] = (99).to_bytes(2, "little")  # compression method
+    wheel_file.write_bytes(bytes(data))
+
+    errors = verify_wheel(wheel_file)
+
+    assert len(errors) == 1
+    assert "cannot read member" in errors[0]
+
+
+def test_verify_wheels_cli_reports_malformed_wheel(tmp_path: Path, wheel_file: Path) -> None:
+    """A malformed wheel is reported in the summary without aborting the batch."""
+    other = tmp_path / "other-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(other, "w") as zf:
+        zf.writestr("other-1.0.dist-info/WHEEL", b"\xff")
+        zf.writestr("other-1.0.dist-info/RECORD", b"")
+
+    result = CliRunner().invoke(verify_wheels, [str(tmp_path), "--jobs", "2"])
+
+    assert result.exit_code == EXIT_FAILURE
+    assert "1 valid, 1 invalid" in result.output
+
+
+def test_expand_wheel_tags() -> None:
+    """Compressed tag sets expand to every combination."""
+    assert expand_wheel_tags("pkg-1.0-1-py2.py3-none-any.whl") == {"py2-none-any", "py3-none-any"}
+
+
+def test_verify_wheels_cli(tmp_path: Path, wheel_file: Path) -> None:
+    """The command verifies a directory in a process pool and fails on any invalid wheel."""
+    runner = CliRunner()
+    result = runner.invoke(verify_wheels, [str(tmp_path), "--jobs", "2"])
+    assert result.exit_code == 0
+    assert "1 valid, 0 invalid" in result.output
+
+    (tmp_path / "other-1.0-py3-none-any.whl").write_text("not a zip")
+    result = runner.invoke(verify_wheels, [str(tmp_path), "--jobs", "2"])
+    assert result.exit_code == EXIT_FAILURE
+    assert "1 valid, 1 invalid" in result.output
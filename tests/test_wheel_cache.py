@@ -0,0 +1,86 @@
+"""Tests for the pyd2wheel build cache in `python_build_utils.wheel_cache`."""
+
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.pyd2wheel import WheelOptions, convert_pyd_files
+from python_build_utils.wheel_cache import cache_key, link_or_copy
+from python_build_utils.wheel_writer import CompressionPolicy
+
+
+PYD_NAME = "dummy-0.1.0-py311-win_amd64.pyd"
+WHEEL_NAME = "dummy-0.1.0-py311-none-win_amd64.whl"
+
+
+@pytest.fixture
+def pyd_file(tmp_path: Path) -> Path:
+    """Create a dummy .pyd file in its own build directory."""
+    build = tmp_path / "build"
+    build.mkdir()
+    path = build / PYD_NAME
+    path.write_bytes(b"compiled")
+    return path
+
+
+def test_cache_key_changes_with_inputs(pyd_file: Path) -> None:
+    """Check the key covers the payload content, the wheel name and the compression policy."""
+    key = cache_key(pyd_file, pyd_file.name, WHEEL_NAME, None)
+
+    assert key == cache_key(pyd_file, pyd_file.name, WHEEL_NAME, CompressionPolicy())
+    assert key != cache_key(pyd_file, pyd_file.name, WHEEL_NAME.replace("none", "cp311"), None)
+    assert key != cache_key(pyd_file, pyd_file.name, WHEEL_NAME, CompressionPolicy(zipfile.ZIP_STORED))
+
+    pyd_file.write_bytes(b"recompiled")
+    assert key != cache_key(pyd_file, pyd_file.name, WHEEL_NAME, None)
+
+
+def test_skip_when_output_is_up_to_date(pyd_file: Path) -> None:
+    """A second run reuses the existing wheel and rebuilds once the input changes."""
+    options = WheelOptions(use_cache=True)
+
+    first = convert_pyd_files([pyd_file], options)[0]
+    second = convert_pyd_files([pyd_file], options)[0]
+    pyd_file.write_bytes(b"recompiled")
+    third = convert_pyd_files([pyd_file], options)[0]
+
+    assert (first.cache_hit, second.cache_hit, third.cache_hit) == (False, True, False)
+    with zipfile.ZipFile(third.wheel_path) as zf:
+        assert zf.read(PYD_NAME) == b"recompiled"
+
+
+def test_restore_from_cache_dir(pyd_file: Path, tmp_path: Path) -> None:
+    """A wheel built for one output directory is linked into another from the cache."""
+    cache_dir = tmp_path / "cache"
+    first = convert_pyd_files([pyd_file], WheelOptions(out_dir=tmp_path / "a", cache_dir=cache_dir))[0]
+    second = convert_pyd_files([pyd_file], WheelOptions(out_dir=tmp_path / "b", cache_dir=cache_dir))[0]
+
+    assert first.cache_hit is False
+    assert second.cache_hit is True
+    assert second.wheel_path == tmp_path / "b" / WHEEL_NAME
+    assert second.wheel_path.read_bytes() == first.wheel_path.read_bytes()
+
+
+def test_cache_disabled_by_default(pyd_file: Path) -> None:
+    """Without cache options no key is stored and no hit or miss is reported."""
+    result = convert_pyd_files([pyd_file])[0]
+
+    assert result.cache_hit is None
+    with zipfile.ZipFile(result.wheel_path) as zf:
+        assert zf.comment == b""
+
+
+def test_link_or_copy_falls_back_to_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Copy the file when hard links are not supported."""
+    src = tmp_path / "src.whl"
+    src.write_bytes(b"wheel")
+
+    def no_link(*_: object) -> None:
+        raise OSError
+
+    monkeypatch.setattr("os.link", no_link)
+    link_or_copy(src, tmp_path / "dst.whl")
+
+    assert (tmp_path / "dst.whl").read_bytes() == b"wheel"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dst.whl", "src.whl"]
@@ -0,0 +1,196 @@
+"""Tests for `python_build_utils.wheel_retag`."""
+
+import errno
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from python_build_utils.dir2wheel import convert_dir_to_wheel
+from python_build_utils.rename_wheel_files import rename_wheel_files
+from python_build_utils.verify_wheels import verify_wheel
+from python_build_utils.wheel_retag import clone_prefix, expand_tag, retag_wheel, retag_wheel_content, split_wheel_name
+from python_build_utils.wheel_writer import CompressionPolicy
+
+
+PREFIX_LENGTH = 1000
+
+
+@pytest.fixture
+def pure_wheel(tmp_path: Path) -> Path:
+    """Build a py3-none-any wheel with stored, deflated and lzma members."""
+    package = tmp_path / "src" / "example"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("VALUE = 1\n" * 100)
+    (package / "core.so").write_bytes(bytes(range(256)) * 400)
+    (package / "data.txt").write_text("data\n" * 1000)
+    policy = CompressionPolicy(suffix_rules=((".so", zipfile.ZIP_STORED), (".txt", zipfile.ZIP_LZMA)))
+    return convert_dir_to_wheel(package, "1.0.0", "py3-none-any", out_dir=tmp_path / "dist", compression=policy)
+
+
+def test_retag_wheel(pure_wheel: Path) -> None:
+    """Rewrite WHEEL and RECORD while the other members are copied byte for byte."""
+    retagged = retag_wheel(pure_wheel, "cp312-cp312-manylinux_2_17_x86_64")
+
+    assert retagged.name == "example-1.0.0-cp312-cp312-manylinux_2_17_x86_64.whl"
+    assert verify_wheel(retagged) == []
+    with zipfile.ZipFile(pure_wheel) as old, zipfile.ZipFile(retagged) as new:
+        assert "Tag: cp312-cp312-manylinux_2_17_x86_64" in new.read("example-1.0.0.dist-info/WHEEL").decode()
+        assert "py3-none-any" not in new.read("example-1.0.0.dist-info/WHEEL").decode()
+        for name in ("example/__init__.py", "example/core.so", "example/data.txt"):
+            old_info, new_info = old.getinfo(name), new.getinfo(name)
+            assert (new_info.compress_type, new_info.compress_size, new_info.CRC, new_info.date_time) == (
+                old_info.compress_type,
+                old_info.compress_size,
+                old_info.CRC,
+                old_info.date_time,
+            )
+            assert new.read(name) == old.read(name)
+        assert new.namelist()[-1] == "example-1.0.0.dist-info/RECORD"
+
+
+def test_retag_streamed_wheel_with_data_descriptors(tmp_path: Path) -> None:
+    """Members written with data descriptors to a non-seekable stream are copied correctly."""
+
+    class _Unseekable:
+        def __init__(self) -> None:
+            self.data = bytearray()
+
+        def write(self, chunk: bytes) -> int:
+            self.data += chunk
+            return len(chunk)
+
+        def flush(self) -> None:
+            pass
+
+    stream = _Unseekable()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zf:  # type: ignore[arg-type]
+        with zf.open("pkg/mod.py", "w") as f:
+            f.write(b"print('hi')\n" * 50)
+        zf.writestr("pkg-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\nTag: py3-none-any\n")
+        zf.writestr("pkg-1.0.dist-info/RECORD", "pkg/mod.py,,\npkg-1.0.dist-info/WHEEL,,\npkg-1.0.dist-info/RECORD,,\n")
+    wheel_path = tmp_path / "pkg-1.0-py3-none-any.whl"
+    wheel_path.write_bytes(stream.data)
+
+    retagged = retag_wheel(wheel_path, "py2.py3-none-any")
+
+    with zipfile.ZipFile(retagged) as zf:
+        assert zf.testzip() is None
+        assert zf.read("pkg/mod.py") == b"print('hi')\n" * 50
+        assert zf.read("pkg-1.0.dist-info/WHEEL").decode().splitlines()[1:] == [
+            "Tag: py2-none-any",
+            "Tag: py3-none-any",
+        ]
+
+
+def test_retag_wheel_content_keeps_other_lines() -> None:
+    """Only the Tag lines change, all other WHEEL fields are kept in order."""
+    content = "Wheel-Version: 1.0\nTag: py3-none-any\nTag: py2-none-any\nBuild: 1\n"
+
+    assert retag_wheel_content(content, "cp311-cp311-win_amd64") == (
+        "Wheel-Version: 1.0\nTag: cp311-cp311-win_amd64\nBuild: 1\n"
+    )
+
+
+def test_split_wheel_name_and_expand_tag() -> None:
+    """Wheel names split into prefix and tag, including an optional build tag."""
+    assert split_wheel_name("pkg-1.0-1-py2.py3-none-any.whl") == ("pkg-1.0-1", "py2.py3-none-any")
+    assert expand_tag("cp311.cp312-abi3-win_amd64") == ["cp311-abi3-win_amd64", "cp312-abi3-win_amd64"]
+    with pytest.raises(ValueError, match="not a valid wheel file name"):
+        split_wheel_name("pkg-1.0.whl")
+
+
+def test_rename_wheel_files_retag(pure_wheel: Path) -> None:
+    """The --retag flag replaces each wheel by a retagged copy."""
+    runner = CliRunner()
+    result = runner.invoke(
+        rename_wheel_files, ["--dist-dir", str(pure_wheel.parent), "--wheel-tag", "cp311-cp311-win_amd64", "--retag"]
+    )
+
+    assert result.exit_code == 0
+    assert [p.name for p in pure_wheel.parent.iterdir()] == ["example-1.0.0-cp311-cp311-win_amd64.whl"]
+    assert verify_wheel(pure_wheel.parent / "example-1.0.0-cp311-cp311-win_amd64.whl") == []
+
+
+def test_retag_wheel_without_reflink_or_copy_file_range(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The plain read/write fallback clones the prefix; members after WHEEL are copied raw."""
+    monkeypatch.setattr("python_build_utils.wheel_retag.fcntl", None)
+    monkeypatch.delattr("os.copy_file_range", raising=False)
+    wheel_path = tmp_path / "pkg-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(wheel_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("pkg/mod.py", "print('hi')\n" * 50)
+        zf.writestr("pkg-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\nTag: py3-none-any\n")
+        zf.writestr("pkg-1.0.dist-info/top_level.txt", "pkg\n")
+        zf.writestr("pkg-1.0.dist-info/RECORD", "")
+
+    retagged = retag_wheel(wheel_path, "cp312-cp312-win_amd64")
+
+    with zipfile.ZipFile(retagged) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [
+            "pkg/mod.py",
+            "pkg-1.0.dist-info/top_level.txt",
+            "pkg-1.0.dist-info/WHEEL",
+            "pkg-1.0.dist-info/RECORD",
+        ]
+        assert zf.read("pkg-1.0.dist-info/top_level.txt") == b"pkg\n"
+
+
+def test_rename_wheel_files_fan_out_with_retag(tmp_path: Path) -> None:
+    """One linux wheel becomes several manylinux variants, each with its own WHEEL and RECORD."""
+    package = tmp_path / "src" / "fast"
+    package.mkdir(parents=True)
+    (package / "core.so").write_bytes(bytes(range(256)) * 1000)
+    dist = tmp_path / "dist"
+    convert_dir_to_wheel(package, "2.0", "cp312-cp312-linux_x86_64", out_dir=dist)
+    (dist / "other-1.0-py3-none-any.whl").write_text("not matched")
+
+    runner = CliRunner()
+    result = runner.invoke(
+        rename_wheel_files,
+        [
+            "--dist-dir",
+            str(dist),
+            "--from-tag",
+            "cp312-cp312-linux_*",
+            "--wheel-tag",
+            "cp312-cp312-manylinux_2_17_x86_64",
+            "--wheel-tag",
+            "cp312-cp312-manylinux_2_28_x86_64",
+            "--retag",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert sorted(p.name for p in dist.iterdir()) == [
+        "fast-2.0-cp312-cp312-manylinux_2_17_x86_64.whl",
+        "fast-2.0-cp312-cp312-manylinux_2_28_x86_64.whl",
+        "other-1.0-py3-none-any.whl",
+    ]
+    for variant in dist.glob("fast-*.whl"):
+        assert verify_wheel(variant) == []
+
+
+def test_clone_prefix_falls_back_when_copy_file_range_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A kernel copy that fails part of the way, e.g. across filesystems, is finished with read and write."""
+    calls = []
+
+    def copy_file_range(src: int, dst: int, count: int, offset_src: int, offset_dst: int) -> int:
+        if calls:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        calls.append(count)
+        os.pwrite(dst, os.pread(src, 10, offset_src), offset_dst)
+        return 10
+
+    monkeypatch.setattr("python_build_utils.wheel_retag.fcntl", None)
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range, raising=False)
+    source = tmp_path / "source"
+    source.write_bytes(bytes(range(256)) * 4)
+
+    with source.open("rb") as src, (tmp_path / "target").open("w+b") as dst:
+        assert not clone_prefix(src, dst, PREFIX_LENGTH)
+        assert dst.tell() == PREFIX_LENGTH
+
+    assert (tmp_path / "target").read_bytes() == source.read_bytes()[:PREFIX_LENGTH]
@@ -0,0 +1,179 @@
+"""Tests for the streaming wheel builder in `python_build_utils.wheel_writer`."""
+
+import base64
+import hashlib
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from python_build_utils.wheel_writer import (
+    ZIP_EPOCH,
+    CompressionPolicy,
+    WheelWriter,
+    _parse_source_date_epoch,
+    atomic_write,
+    parse_compression_rules,
+    record_hash,
+    source_date_time,
+)
+
+
+def test_record_hash_is_urlsafe_base64_without_padding() -> None:
+    """Check RECORD hashes use the encoding required by the wheel spec."""
+    digest = hashlib.sha256(b"data").digest()
+    expected = base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+    assert record_hash(digest) == f"sha256={expected}"
+
+
+def test_wheel_writer_records_every_member(tmp_path: Path) -> None:
+    """Ensure files and in-memory members end up in the archive and in RECORD."""
+    payload = tmp_path / "module.pyd"
+    payload.write_bytes(b"\x00binary payload" * 1000)
+
+    buffer = io.BytesIO()
+    with WheelWriter(buffer, "pkg-1.0.dist-info") as writer:
+        writer.write_file("module.pyd", payload)
+        writer.write_dist_info("METADATA", "Name: pkg\n")
+
+    with zipfile.ZipFile(buffer) as zf:
+        assert zf.namelist() == ["module.pyd", "pkg-1.0.dist-info/METADATA", "pkg-1.0.dist-info/RECORD"]
+        assert zf.read("module.pyd") == payload.read_bytes()
+        record = zf.read("pkg-1.0.dist-info/RECORD").decode("utf-8").splitlines()
+
+    payload_hash = record_hash(hashlib.sha256(payload.read_bytes()).digest())
+    assert record[0] == f"module.pyd,{payload_hash},{payload.stat().st_size}"
+    assert record[-1] == "pkg-1.0.dist-info/RECORD,,"
+
+
+def test_wheel_writer_skips_record_on_error(tmp_path: Path) -> None:
+    """Ensure a failing build does not append a RECORD file."""
+    wheel_path = tmp_path / "pkg-1.0-py3-none-any.whl"
+
+    with pytest.raises(FileNotFoundError), WheelWriter(wheel_path, "pkg-1.0.dist-info") as writer:
+        writer.write_file("missing.pyd", tmp_path / "missing.pyd")
+
+    with zipfile.ZipFile(wheel_path) as zf:
+        assert "pkg-1.0.dist-info/RECORD" not in zf.namelist()
+
+
+def test_atomic_write_publishes_on_success(tmp_path: Path) -> None:
+    """Ensure the target only appears once writing has finished."""
+    target = tmp_path / "artifact.whl"
+
+    with atomic_write(target) as f:
+        f.write(b"content")
+        assert not target.exists()
+
+    assert target.read_bytes() == b"content"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_atomic_write_keeps_existing_file_on_error(tmp_path: Path) -> None:
+    """Ensure a failed write leaves neither a partial file nor a temporary file."""
+    target = tmp_path / "artifact.whl"
+    target.write_bytes(b"previous")
+
+    def write_and_fail() -> None:
+        with atomic_write(target) as f:
+            f.write(b"partial")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        write_and_fail()
+
+    assert target.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_compression_policy_applies_suffix_rules(tmp_path: Path) -> None:
+    """Ensure suffix rules override the default method per member."""
+    payload = tmp_path / "module.pyd"
+    payload.write_bytes(b"a" * 10000)
+    policy = CompressionPolicy(zipfile.ZIP_BZIP2, 9, parse_compression_rules([".PYD=stored"]))
+
+    buffer = io.BytesIO()
+    with WheelWriter(buffer, "pkg-1.0.dist-info", policy) as writer:
+        writer.write_file("module.pyd", payload)
+        writer.write_dist_info("METADATA", "Name: pkg\n")
+
+    with zipfile.ZipFile(buffer) as zf:
+        assert zf.getinfo("module.pyd").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("pkg-1.0.dist-info/METADATA").compress_type == zipfile.ZIP_BZIP2
+        assert zf.read("module.pyd") == payload.read_bytes()
+
+
+@pytest.mark.parametrize("rule", ["pyd", ".pyd=zstd", "=stored"])
+def test_parse_compression_rules_rejects_invalid(rule: str) -> None:
+    """Ensure malformed rules raise a ValueError."""
+    with pytest.raises(ValueError, match="Invalid compression rule"):
+        parse_compression_rules([rule])
+
+
+def test_parse_compression_rules_adds_leading_dot() -> None:
+    """Check suffixes are normalised to a lowercase leading-dot form."""
+    assert parse_compression_rules(["SO=lzma"]) == ((".so", zipfile.ZIP_LZMA),)
+
+
+@pytest.mark.parametrize(
+    ("epoch", "expected"),
+    [
+        (None, ZIP_EPOCH),
+        ("", ZIP_EPOCH),
+        ("0", ZIP_EPOCH),
+        ("1700000000", (2023, 11, 14, 22, 13, 20)),
+        ("abc", ZIP_EPOCH),
+        ("1.5e9", ZIP_EPOCH),
+        ("99999999999999999999", ZIP_EPOCH),
+    ],
+)
+def test_source_date_time(monkeypatch: pytest.MonkeyPatch, epoch: str | None, expected: tuple[int, ...]) -> None:
+    """Check SOURCE_DATE_EPOCH handling, including clamping to the zip epoch."""
+    if epoch is None:
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    else:
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", epoch)
+
+    assert source_date_time() == expected
+
+
+def test_invalid_source_date_epoch_warns_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """An invalid SOURCE_DATE_EPOCH is reported once and the wheel members get the zip epoch."""
+    _parse_source_date_epoch.cache_clear()
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "not-a-number")
+
+    for name in ("a", "b"):
+        with WheelWriter(tmp_path / f"{name}.whl", "pkg-1.0.dist-info") as writer:
+            writer.write_bytes("pkg/__init__.py", b"")
+        with zipfile.ZipFile(tmp_path / f"{name}.whl") as zf:
+            assert zf.infolist()[0].date_time == ZIP_EPOCH
+
+    assert caplog.text.count("Ignoring SOURCE_DATE_EPOCH='not-a-number'") == 1
+
+
+def test_wheel_writer_fails_before_creating_the_archive(tmp_path: Path) -> None:
+    """An invalid comment is rejected before the archive file is created."""
+    with pytest.raises(UnicodeEncodeError):
+        WheelWriter(tmp_path / "pkg.whl", "pkg-1.0.dist-info", comment="clé")
+
+    assert not (tmp_path / "pkg.whl").exists()
+
+
+def test_record_lines_are_sorted(tmp_path: Path) -> None:
+    """Ensure RECORD does not depend on the order members were written in."""
+    (tmp_path / "b.pyd").write_bytes(b"b")
+    (tmp_path / "a.pyd").write_bytes(b"a")
+
+    buffer = io.BytesIO()
+    with WheelWriter(buffer, "pkg-1.0.dist-info") as writer:
+        writer.write_file("b.pyd", tmp_path / "b.pyd")
+        writer.write_file("a.pyd", tmp_path / "a.pyd")
+
+    with zipfile.ZipFile(buffer) as zf:
+        record = zf.read("pkg-1.0.dist-info/RECORD").decode("utf-8").splitlines()
+
+    assert [line.split(",")[0] for line in record] == ["a.pyd", "b.pyd", "pkg-1.0.dist-info/RECORD"]